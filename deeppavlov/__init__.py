@@ -12,28 +12,56 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
 import sys
 from pathlib import Path
 
 try:
     from .configs import configs
-    # noinspection PyUnresolvedReferences
+except ImportError:
+    'Assuming that requirements are not yet installed'
+
+# heavy modules are imported on the first access to their attributes
+_LAZY_ATTRIBUTES = {
+    'build_model': '.core.commands.infer',
+    'train_evaluate_model_from_config': '.core.commands.train',
+    'deep_download': '.download',
+    'Chainer': '.core.common.chainer'
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# TODO: make better
+def train_model(config: [str, Path, dict], download: bool = False, recursive: bool = False) -> 'Chainer':
     from .core.commands.infer import build_model
-    # noinspection PyUnresolvedReferences
     from .core.commands.train import train_evaluate_model_from_config
-    from .download import deep_download
-    from .core.common.chainer import Chainer
+    train_evaluate_model_from_config(config, download=download, recursive=recursive)
+    return build_model(config, load_trained=True)
+
 
-    # TODO: make better
-    def train_model(config: [str, Path, dict], download: bool = False, recursive: bool = False) -> Chainer:
-        train_evaluate_model_from_config(config, download=download, recursive=recursive)
-        return build_model(config, load_trained=True)
+def evaluate_model(config: [str, Path, dict], download: bool = False, recursive: bool = False) -> dict:
+    from .core.commands.train import train_evaluate_model_from_config
+    return train_evaluate_model_from_config(config, to_train=False, download=download, recursive=recursive)
 
-    def evaluate_model(config: [str, Path, dict], download: bool = False, recursive: bool = False) -> dict:
-        return train_evaluate_model_from_config(config, to_train=False, download=download, recursive=recursive)
 
-except ImportError:
-    'Assuming that requirements are not yet installed'
+if sys.version_info < (3, 7):
+    # module level __getattr__ is supported since python 3.7
+    try:
+        for _name in _LAZY_ATTRIBUTES:
+            __getattr__(_name)
+    except ImportError:
+        'Assuming that requirements are not yet installed'
 
 __version__ = '0.1.5.1'
 __author__ = 'Neural Networks and Deep Learning lab, MIPT'
@@ -15,6 +15,7 @@
 from typing import List, Optional
 
 from deeppavlov.core.agent.agent import Agent
+from deeppavlov.core.agent.dialog_store import DialogStore
 from deeppavlov.core.agent.filter import Filter
 from deeppavlov.core.agent.processor import Processor
 from deeppavlov.core.skill.skill import Skill
@@ -41,6 +42,10 @@ class DefaultAgent(Agent):
         skills: List of initiated agent skills instances.
         skills_processor: Initiated agent processor.
         skills_filter: Initiated agent filter.
+        history_store: Store of dialog histories, unbounded in-memory store by default.
+        states_store: Store of skills states, unbounded in-memory store by default.
+        max_history: Maximum number of replicas kept in the history of each
+            dialog, unlimited if ``None``.
 
     Attributes:
         skills: List of initiated agent skills instances.
@@ -48,8 +53,10 @@ class DefaultAgent(Agent):
         skills_filter: Initiated agent filter.
     """
     def __init__(self, skills: List[Skill], skills_processor: Optional[Processor]=None,
-                 skills_filter: Optional[Filter]=None, *args, **kwargs) -> None:
-        super(DefaultAgent, self).__init__(skills=skills)
+                 skills_filter: Optional[Filter]=None, history_store: Optional[DialogStore]=None,
+                 states_store: Optional[DialogStore]=None, max_history: Optional[int]=None, *args, **kwargs) -> None:
+        super(DefaultAgent, self).__init__(skills=skills, history_store=history_store, states_store=states_store,
+                                           max_history=max_history)
         self.skills_filter: Filter = skills_filter or TransparentFilter(len(skills))
         self.skills_processor: Processor = skills_processor or HighestConfidenceSelector()
 
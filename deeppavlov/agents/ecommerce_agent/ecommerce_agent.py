@@ -13,10 +13,10 @@
 # limitations under the License.
 
 import argparse
-from collections import defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from deeppavlov.core.agent.agent import Agent
+from deeppavlov.core.agent.dialog_store import DialogStore
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.skill.skill import Skill
 from deeppavlov.core.commands.infer import build_model
@@ -35,8 +35,14 @@ log = get_logger(__name__)
 class EcommerceAgent(Agent):
     """DeepPavlov Ecommerce agent.
 
+    Buttons of the agent refer to search results by their positions in the dialog
+    history, so histories are never trimmed. Memory can be bounded with a
+    ``history_store`` which evicts whole dialogs instead.
+
     Args:
         skill: List of initiated agent skills instances.
+        history_store: Store of dialog histories, unbounded in-memory store by default.
+        states_store: Store of skills states, unbounded in-memory store by default.
 
     Attributes:
         skill: List of initiated agent skills instances.
@@ -46,9 +52,11 @@ class EcommerceAgent(Agent):
         states: States for each each dialog with agent indexed by dialog ID.
     """
 
-    def __init__(self, skills: List[Skill], *args, **kwargs) -> None:
-        super(EcommerceAgent, self).__init__(skills=skills)
-        self.states: dict = defaultdict(lambda: [{"start": 0, "stop": 5} for _ in self.skills])
+    def __init__(self, skills: List[Skill], history_store: Optional[DialogStore] = None,
+                 states_store: Optional[DialogStore] = None, *args, **kwargs) -> None:
+        super(EcommerceAgent, self).__init__(skills=skills, history_store=history_store,
+                                             states_store=states_store, max_history=None)
+        self.states.default_factory = lambda: [{"start": 0, "stop": 5} for _ in self.skills]
 
     def _call(self, utterances_batch: List[str], utterances_ids: List[int] = None) -> List[RichMessage]:
         """Processes batch of utterances and returns corresponding responses batch.
@@ -79,6 +87,11 @@ class EcommerceAgent(Agent):
                 command, *parts = utt.split(":")
                 log.debug(f'Actions: {parts}')
 
+                if command in ("@details", "@entropy", "@next") and int(parts[0]) >= len(self.history[id_]):
+                    # the dialog was evicted from the history store
+                    rich_message.add_control(PlainText("Search results have expired, please repeat your request."))
+                    continue
+
                 if command == "@details":
                     batch_index = int(parts[0])  # batch index in history list
                     item_index = int(parts[1])  # index in batch
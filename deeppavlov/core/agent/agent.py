@@ -13,12 +13,12 @@
 # limitations under the License.
 
 from abc import ABCMeta, abstractmethod
-from typing import List, Dict, Tuple, Optional
-from collections import defaultdict
+from typing import List, Tuple, Optional
 
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.skill.skill import Skill
 from deeppavlov.core.agent.dialog_logger import DialogLogger
+from deeppavlov.core.agent.dialog_store import DialogStore, MemoryDialogStore
 
 
 class Agent(Component, metaclass=ABCMeta):
@@ -33,6 +33,10 @@ class Agent(Component, metaclass=ABCMeta):
 
     Args:
         skills: List of initiated agent skills instances.
+        history_store: Store of dialog histories, unbounded in-memory store by default.
+        states_store: Store of skills states, unbounded in-memory store by default.
+        max_history: Maximum number of replicas kept in the history of each
+            dialog, unlimited if ``None``.
 
     Attributes:
         skills: List of initiated agent skills instances.
@@ -43,6 +47,7 @@ class Agent(Component, metaclass=ABCMeta):
             state updated automatically after each wrapped skill inference.
             So we highly recommend use this attribute only for reading and
             not to use it for your custom skills management.
+        max_history: Maximum number of replicas kept in the history of each dialog.
         wrapped_skills: Skills wrapped to SkillWrapper objects. SkillWrapper
             object gives to Skill __call__ signature of Agent __call__ and
             handles automatic state management for skill. All skills are
@@ -50,10 +55,14 @@ class Agent(Component, metaclass=ABCMeta):
             We highly recommend to use wrapped skills for skills inference.
         dialog_logger: DeepPavlov dialog logging facility.
     """
-    def __init__(self, skills: List[Skill]) -> None:
+    def __init__(self, skills: List[Skill], history_store: Optional[DialogStore] = None,
+                 states_store: Optional[DialogStore] = None, max_history: Optional[int] = None) -> None:
         self.skills: List[Skill] = skills
-        self.history: Dict = defaultdict(list)
-        self.states: Dict = defaultdict(lambda: [None] * len(self.skills))
+        self.history: DialogStore = history_store if history_store is not None else MemoryDialogStore()
+        self.history.default_factory = list
+        self.states: DialogStore = states_store if states_store is not None else MemoryDialogStore()
+        self.states.default_factory = lambda: [None] * len(self.skills)
+        self.max_history = max_history
         self.wrapped_skills: List[SkillWrapper] = \
             [SkillWrapper(skill, skill_id, self) for skill_id, skill in enumerate(self.skills)]
         self.dialog_logger: DialogLogger = DialogLogger()
@@ -75,12 +84,19 @@ class Agent(Component, metaclass=ABCMeta):
         ids = utterances_ids or list(range(batch_size))
 
         for utt_batch_idx, utt_id in enumerate(ids):
-            self.history[utt_id].append(utterances_batch[utt_batch_idx])
+            history = self.history[utt_id]
+            history.append(utterances_batch[utt_batch_idx])
             self.dialog_logger.log_in(utterances_batch[utt_batch_idx], utt_id)
 
-            self.history[utt_id].append(responses_batch[utt_batch_idx])
+            history.append(responses_batch[utt_batch_idx])
             self.dialog_logger.log_out(responses_batch[utt_batch_idx], utt_id)
 
+            if self.max_history is not None and len(history) > self.max_history:
+                del history[:len(history) - self.max_history]
+
+        self.history.flush()
+        self.states.flush()
+
         return responses_batch
 
     @abstractmethod
@@ -12,10 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import gzip
 import json
+import shutil
+import weakref
 from pathlib import Path
 from datetime import datetime
-from typing import Any, Optional, Hashable
+from queue import Queue, Full
+from threading import Thread, Lock
+from typing import Any, Optional, Hashable, List
 
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.common.paths import get_settings_path
@@ -25,15 +31,30 @@ from deeppavlov.core.agent.rich_content import RichMessage
 
 LOGGER_CONFIG_FILENAME = 'dialog_logger_config.json'
 LOG_TIMESTAMP_FORMAT = '%Y-%m-%d_%H-%M-%S_%f'
+MAX_WRITE_BATCH_SIZE = 1024
 
 log = get_logger(__name__)
 
+_async_loggers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_async_loggers() -> None:
+    """Writes queued records of all asynchronous dialog loggers at interpreter exit."""
+    for dialog_logger in list(_async_loggers):
+        dialog_logger.close()
+
 
 class DialogLogger:
     """DeepPavlov dialog logging facility.
 
     DialogLogger is an entity which provides tools for dialogs logging.
 
+    In asynchronous mode log records are put into a bounded in-memory queue and are serialized and written
+    to disk in batches by a background thread, so that disk latency does not affect response time. When the
+    queue is full, new records are either dropped or the caller waits for free space depending on the
+    ``overflow_policy`` setting.
+
     Args:
         enabled: DialogLogger on/off flag.
         agent_name: Agent name which is used for organising log files.
@@ -41,7 +62,10 @@ class DialogLogger:
     Attributes:
         agent_name: Agent name which is used for organising log files.
         log_max_size: Maximum size of log file, kb.
-        self.log_file: Current log file object.
+        log_file: Current log file object.
+        async_mode: Whether log records are written by a background thread.
+        compress: Whether to gzip log files which exceeded the maximum size.
+        dropped: Number of records dropped because of the full queue.
     """
     def __init__(self, enabled: bool = False, agent_name: Optional[str] = None) -> None:
         self.config: dict = read_json(get_settings_path() / LOGGER_CONFIG_FILENAME)
@@ -50,9 +74,25 @@ class DialogLogger:
         if self.enabled:
             self.agent_name: str = agent_name or self.config['agent_name']
             self.log_max_size: int = self.config['logfile_max_size_kb']
+            self.async_mode: bool = self.config.get('async', False)
+            self.compress: bool = self.config.get('gzip', False)
+            self.overflow_policy: str = self.config.get('overflow_policy', 'drop')
+            if self.overflow_policy not in ('drop', 'block'):
+                raise ValueError(f'Unknown dialog logger overflow policy: {self.overflow_policy}, '
+                                 f'use "drop" or "block"')
+            self.dropped = 0
+            self._lock = Lock()
+            self._closed = False
+
             self.log_file = self._get_log_file()
             self.log_file.writelines('"Agent initiated"\n')
 
+            if self.async_mode:
+                self._queue = Queue(self.config.get('queue_max_size', 10000))
+                self._writer = Thread(target=self._writer_loop, daemon=True)
+                self._writer.start()
+                _async_loggers.add(self)
+
     @staticmethod
     def _get_timestamp_utc_str() -> str:
         """Returns str converted current UTC timestamp.
@@ -72,11 +112,26 @@ class DialogLogger:
         log_dir: Path = Path(self.config['log_path']).expanduser().resolve() / self.agent_name
         log_dir.mkdir(parents=True, exist_ok=True)
         log_file_path = Path(log_dir, f'{self._get_timestamp_utc_str()}_{self.agent_name}.log')
-        log_file = open(log_file_path, 'a', buffering=1, encoding='utf8')
+        # the background writer flushes the file after every batch of records
+        buffering = -1 if self.async_mode else 1
+        log_file = open(log_file_path, 'a', buffering=buffering, encoding='utf8')
         return log_file
 
-    def _log(self, utterance: Any, direction: str, dialog_id: Optional[Hashable]=None):
-        """Logs single dialog utterance to current dialog log file.
+    def _rotate_log_file(self) -> None:
+        """Closes the current log file, optionally compresses it and opens a new one."""
+        self.log_file.close()
+        if self.compress:
+            log_file_path = Path(self.log_file.name)
+            try:
+                with log_file_path.open('rb') as f_in, gzip.open(f'{log_file_path}.gz', 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                log_file_path.unlink()
+            except IOError:
+                log.error(f'Failed to compress dialog log {log_file_path}.')
+        self.log_file = self._get_log_file()
+
+    def _make_record(self, utterance: Any, direction: str, dialog_id: Optional[Hashable] = None) -> dict:
+        """Returns log record of a single dialog utterance.
 
         Args:
             utterance: Dialog utterance.
@@ -94,20 +149,81 @@ class DialogLogger:
 
         dialog_id = str(dialog_id) if not isinstance(dialog_id, str) else dialog_id
 
-        if self.log_file.tell() >= self.log_max_size * 1024:
-            self.log_file.close()
-            self.log_file = self._get_log_file()
-        else:
-            try:
-                log_msg = {}
-                log_msg['timestamp'] = self._get_timestamp_utc_str()
-                log_msg['dialog_id'] = dialog_id
-                log_msg['direction'] = direction
-                log_msg['message'] = utterance
+        log_msg = {}
+        log_msg['timestamp'] = self._get_timestamp_utc_str()
+        log_msg['dialog_id'] = dialog_id
+        log_msg['direction'] = direction
+        log_msg['message'] = utterance
+        return log_msg
+
+    def _write_records(self, records: List[dict]) -> None:
+        """Writes log records to current dialog log file rotating it when it exceeds the maximum size.
+
+        Args:
+            records: Log records.
+        """
+        try:
+            for log_msg in records:
+                if self.log_file.tell() >= self.log_max_size * 1024:
+                    self._rotate_log_file()
                 log_str = json.dumps(log_msg, ensure_ascii=self.config['ensure_ascii'])
                 self.log_file.write(f'{log_str}\n')
-            except IOError:
-                log.error('Failed to write dialog log.')
+            self.log_file.flush()
+        except IOError:
+            log.error('Failed to write dialog log.')
+
+    def _writer_loop(self) -> None:
+        """Writes records from the queue in batches until ``None`` is received."""
+        while True:
+            records = [self._queue.get()]
+            while len(records) < MAX_WRITE_BATCH_SIZE and not self._queue.empty():
+                records.append(self._queue.get_nowait())
+            stop = None in records
+            if stop:
+                records = records[:records.index(None)]
+            self._write_records(records)
+            if stop:
+                break
+
+    def _log(self, utterance: Any, direction: str, dialog_id: Optional[Hashable]=None):
+        """Logs single dialog utterance to current dialog log file.
+
+        Args:
+            utterance: Dialog utterance.
+            direction: 'in' or 'out' utterance direction.
+            dialog_id: Dialog ID.
+        """
+        record = self._make_record(utterance, direction, dialog_id)
+
+        # records are rejected after close() so that nothing is queued after the writer stop mark
+        with self._lock:
+            if self._closed:
+                return
+            if not self.async_mode:
+                self._write_records([record])
+            elif self.overflow_policy == 'block':
+                self._queue.put(record)
+            else:
+                try:
+                    self._queue.put_nowait(record)
+                except Full:
+                    self.dropped += 1
+                    # warn on the first drop and then on every power of two drops to avoid flooding the log
+                    if self.dropped & (self.dropped - 1) == 0:
+                        log.warning(f'Dialog log queue is full, {self.dropped} records dropped so far.')
+
+    def close(self) -> None:
+        """Writes all queued records and closes current log file."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        if self.async_mode and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self.log_file.close()
 
     def log_in(self, utterance: Any, dialog_id: Optional[Hashable] = None) -> None:
         """Wraps _log method for all input utterances.
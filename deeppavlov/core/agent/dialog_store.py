@@ -0,0 +1,214 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import sqlite3
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from pathlib import Path
+from threading import RLock
+from typing import Any, Callable, Hashable, Iterator, Optional, Union
+
+from deeppavlov.core.commands.utils import expand_path
+
+
+class DialogStore(MutableMapping, metaclass=ABCMeta):
+    """Abstract storage of per-dialog values (histories or skill states) indexed by dialog ID.
+
+    Like :class:`collections.defaultdict`, the store creates a value with ``default_factory`` when a missing
+    dialog ID is accessed with ``store[dialog_id]``. Values may be modified in place, :meth:`flush` must be called
+    after every batch of modifications to persist them.
+
+    Args:
+        default_factory: callable without arguments which returns a value for a new dialog
+    """
+    def __init__(self, default_factory: Optional[Callable[[], Any]] = None) -> None:
+        self.default_factory = default_factory
+        self._lock = RLock()
+
+    @abstractmethod
+    def _get(self, key: Hashable) -> Any:
+        """Returns stored value or raises :class:`KeyError`."""
+
+    @abstractmethod
+    def _set(self, key: Hashable, value: Any) -> None:
+        pass
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            try:
+                return self._get(key)
+            except KeyError:
+                if self.default_factory is None:
+                    raise
+                value = self.default_factory()
+                self._set(key, value)
+                return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            try:
+                self._get(key)
+            except KeyError:
+                return False
+            return True
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                return self._get(key)
+            except KeyError:
+                return default
+
+    def flush(self) -> None:
+        """Persists values modified since the previous call and evicts expired dialogs."""
+
+
+class MemoryDialogStore(DialogStore):
+    """In-memory dialog store which evicts least recently used and expired dialogs.
+
+    Args:
+        max_size: maximum number of stored dialogs, unlimited if ``None``
+        ttl: time in seconds after the last access to a dialog when it is evicted, never expires if ``None``
+        default_factory: callable without arguments which returns a value for a new dialog
+    """
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None,
+                 default_factory: Optional[Callable[[], Any]] = None) -> None:
+        super().__init__(default_factory)
+        self.max_size = max_size
+        self.ttl = ttl
+        # dialog ID -> (value, last access time), ordered from the least recently used
+        self._data = OrderedDict()
+
+    def _evict(self) -> None:
+        if self.ttl is not None:
+            expired = time.monotonic() - self.ttl
+            while self._data and next(iter(self._data.values()))[1] < expired:
+                self._data.popitem(last=False)
+        if self.max_size is not None:
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def _get(self, key: Hashable) -> Any:
+        self._evict()
+        value, _ = self._data[key]
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        return value
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        self._evict()
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._data[key]
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            self._evict()
+            return iter(list(self._data))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict()
+            return len(self._data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._evict()
+
+
+class SQLiteDialogStore(DialogStore):
+    """Dialog store which keeps pickled values in an SQLite database, so that they outlive the process.
+
+    Values read or written since the last :meth:`flush` are held in memory and written to the database on flush,
+    so modifications made in place are persisted as well.
+
+    Args:
+        db_path: path to the database file
+        table: name of the table to keep values in
+        ttl: time in seconds after the last flushed modification of a dialog when it is deleted,
+            never expires if ``None``
+        default_factory: callable without arguments which returns a value for a new dialog
+    """
+    def __init__(self, db_path: Union[str, Path], table: str = 'dialogs', ttl: Optional[float] = None,
+                 default_factory: Optional[Callable[[], Any]] = None) -> None:
+        super().__init__(default_factory)
+        if str(db_path) != ':memory:':
+            db_path = expand_path(db_path)
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self.ttl = ttl
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" '
+                           f'(dialog_id BLOB PRIMARY KEY, value BLOB, updated REAL)')
+        self._conn.execute(f'CREATE INDEX IF NOT EXISTS "{table}_updated" ON "{table}" (updated)')
+        self._conn.commit()
+        self._touched = {}
+
+    @staticmethod
+    def _key(key: Hashable) -> bytes:
+        return pickle.dumps(key, protocol=4)
+
+    def _get(self, key: Hashable) -> Any:
+        if key in self._touched:
+            return self._touched[key]
+        row = self._conn.execute(f'SELECT value, updated FROM "{self.table}" WHERE dialog_id = ?',
+                                 (self._key(key),)).fetchone()
+        if row is None or (self.ttl is not None and row[1] < time.time() - self.ttl):
+            raise KeyError(key)
+        value = self._touched[key] = pickle.loads(row[0])
+        return value
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        self._touched[key] = value
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            in_memory = self._touched.pop(key, None) is not None
+            cursor = self._conn.execute(f'DELETE FROM "{self.table}" WHERE dialog_id = ?', (self._key(key),))
+            self._conn.commit()
+            if cursor.rowcount == 0 and not in_memory:
+                raise KeyError(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            self.flush()
+            keys = [pickle.loads(row[0]) for row in self._conn.execute(f'SELECT dialog_id FROM "{self.table}"')]
+        return iter(keys)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._conn.execute(f'SELECT COUNT(*) FROM "{self.table}"').fetchone()[0]
+
+    def flush(self) -> None:
+        with self._lock:
+            now = time.time()
+            self._conn.executemany(f'INSERT OR REPLACE INTO "{self.table}" (dialog_id, value, updated) '
+                                   f'VALUES (?, ?, ?)',
+                                   [(self._key(key), pickle.dumps(value, protocol=4), now)
+                                    for key, value in self._touched.items()])
+            if self.ttl is not None:
+                self._conn.execute(f'DELETE FROM "{self.table}" WHERE updated < ?', (now - self.ttl,))
+            self._conn.commit()
+            self._touched.clear()
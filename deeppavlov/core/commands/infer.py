@@ -43,7 +43,8 @@ def build_model(config: Union[str, Path, dict], mode: str = 'infer',
 
     model_config = config['chainer']
 
-    model = Chainer(model_config['in'], model_config['out'], model_config.get('in_y'))
+    model = Chainer(model_config['in'], model_config['out'], model_config.get('in_y'),
+                    n_threads=model_config.get('n_threads', 0))
 
     for component_config in model_config['pipe']:
         if load_trained and ('fit_on' in component_config or 'in_y' in component_config):
@@ -65,7 +66,8 @@ def build_model(config: Union[str, Path, dict], mode: str = 'infer',
             c_out = component_config['out']
             in_y = component_config.get('in_y', None)
             main = component_config.get('main', False)
-            model.append(component, c_in, c_out, in_y, main)
+            parallel = component_config.get('parallel', True)
+            model.append(component, c_in, c_out, in_y, main, parallel)
 
     return model
 
@@ -89,8 +91,12 @@ def interact_model(config: Union[str, Path, dict]) -> None:
         print('>>', *pred)
 
 
-def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_path: Optional[str] = None) -> None:
-    """Make a prediction with the component described in corresponding configuration file."""
+def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_path: Optional[str] = None,
+                      profile: bool = False) -> None:
+    """Make a prediction with the component described in corresponding configuration file.
+
+    If ``profile`` is set, per-component timings are logged after the whole stream is processed.
+    """
     if file_path is None or file_path == '-':
         if sys.stdin.isatty():
             raise RuntimeError('To process data from terminal please use interact mode')
@@ -99,6 +105,8 @@ def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_
         f = open(file_path, encoding='utf8')
 
     model: Chainer = build_model(config)
+    if profile:
+        model.enable_profiling()
 
     args_count = len(model.in_x)
     while True:
@@ -120,3 +128,6 @@ def predict_on_stream(config: Union[str, Path, dict], batch_size: int = 1, file_
 
     if f is not sys.stdin:
         f.close()
+
+    if profile:
+        log.info(f'Components profile: {json.dumps(model.profiler.summary())}')
@@ -24,8 +24,9 @@ from deeppavlov.core.commands.utils import expand_path, import_packages, parse_c
 from deeppavlov.core.common.chainer import Chainer
 from deeppavlov.core.common.errors import ConfigError
 from deeppavlov.core.common.log import get_logger
-from deeppavlov.core.common.metrics_registry import get_metric_by_name
+from deeppavlov.core.common.metrics_registry import get_metric_by_name, get_metric_accumulator
 from deeppavlov.core.common.params import from_params
+from deeppavlov.core.common.prefix_cache import RESTORED_KEY
 from deeppavlov.core.common.registry import get_model
 from deeppavlov.core.data.data_fitting_iterator import DataFittingIterator
 from deeppavlov.core.data.data_learning_iterator import DataLearningIterator
@@ -69,9 +70,11 @@ def prettify_metrics(metrics: List[Tuple[str, float]], precision: int = 4) -> Or
 def fit_chainer(config: dict, iterator: Union[DataLearningIterator, DataFittingIterator]) -> Chainer:
     """Fit and return the chainer described in corresponding configuration dictionary."""
     chainer_config: dict = config['chainer']
-    chainer = Chainer(chainer_config['in'], chainer_config['out'], chainer_config.get('in_y'))
+    chainer = Chainer(chainer_config['in'], chainer_config['out'], chainer_config.get('in_y'),
+                      n_threads=chainer_config.get('n_threads', 0))
     for component_config in chainer_config['pipe']:
-        component = from_params(component_config, mode='train')
+        mode = 'infer' if component_config.get(RESTORED_KEY) else 'train'
+        component = from_params(component_config, mode=mode)
         if ('fit_on' in component_config) and \
                 (not callable(getattr(component, 'partial_fit', None))):
             component: Estimator
@@ -135,7 +138,8 @@ def fit_chainer(config: dict, iterator: Union[DataLearningIterator, DataFittingI
             c_out = component_config['out']
             in_y = component_config.get('in_y', None)
             main = component_config.get('main', False)
-            chainer.append(component, c_in, c_out, in_y, main)
+            parallel = component_config.get('parallel', True)
+            chainer.append(component, c_in, c_out, in_y, main, parallel)
     return chainer
 
 
@@ -206,7 +210,8 @@ def train_evaluate_model_from_config(config: [str, Path, dict], iterator=None, *
         'metrics': ['accuracy'],
         'validate_best': to_validate,
         'test_best': True,
-        'show_examples': False
+        'show_examples': False,
+        'profile': False
     }
 
     try:
@@ -233,6 +238,8 @@ def train_evaluate_model_from_config(config: [str, Path, dict], iterator=None, *
 
     if iterator is not None and (train_config['validate_best'] or train_config['test_best']):
         model = build_model(config, load_trained=to_train)
+        if train_config['profile']:
+            model.enable_profiling()
         log.info('Testing the best saved model')
 
         if train_config['validate_best']:
@@ -274,17 +281,28 @@ def _test_model(model: Chainer, metrics_functions: List[Metric],
         log.warning(f'Could not log examples for {data_type}, assuming it\'s empty')
         return {'eval_examples_count': 0, 'metrics': None, 'time_spent': str(datetime.timedelta(seconds=0))}
 
-    outputs = {out: [] for out in expected_outputs}
+    if model.profiler is not None:
+        model.profiler.reset()
+
+    # metrics with accumulators are updated batch by batch, only inputs of the others are kept for the whole data
+    accumulators = [get_metric_accumulator(m.fn) for m in metrics_functions]
+    outputs = {out: [] for m, acc in zip(metrics_functions, accumulators) if acc is None for out in m.inputs}
     examples = 0
     for x, y_true in iterator.gen_batches(batch_size, data_type, shuffle=False):
         examples += len(x)
         y_predicted = list(model.compute(list(x), list(y_true), targets=expected_outputs))
         if len(expected_outputs) == 1:
             y_predicted = [y_predicted]
-        for out, val in zip(outputs.values(), y_predicted):
-            out += list(val)
+        batch_outputs = {out: list(val) for out, val in zip(expected_outputs, y_predicted)}
+        for m, acc in zip(metrics_functions, accumulators):
+            if acc is not None:
+                acc.update(*[batch_outputs[i] for i in m.inputs])
+        for out, val in outputs.items():
+            val += batch_outputs[out]
+        log.debug(f'{examples} {data_type} examples evaluated')
 
-    metrics = [(m.name, m.fn(*[outputs[i] for i in m.inputs])) for m in metrics_functions]
+    metrics = [(m.name, acc.result() if acc is not None else m.fn(*[outputs[i] for i in m.inputs]))
+               for m, acc in zip(metrics_functions, accumulators)]
 
     report = {
         'eval_examples_count': examples,
@@ -292,6 +310,9 @@ def _test_model(model: Chainer, metrics_functions: List[Metric],
         'time_spent': str(datetime.timedelta(seconds=round(time.time() - start_time + 0.5)))
     }
 
+    if model.profiler is not None:
+        report['profile'] = model.profiler.summary()
+
     if show_examples:
         try:
             y_predicted = zip(*[y_predicted_group
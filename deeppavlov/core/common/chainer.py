@@ -13,13 +13,18 @@
 # limitations under the License.
 
 import pickle
-from typing import Union, Tuple, List
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Union, Tuple, List, Optional
 
 from deeppavlov.core.common.errors import ConfigError
+from deeppavlov.core.common.profiler import ChainerProfiler
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.models.nn_model import NNModel
 from deeppavlov.core.models.serializable import Serializable
 
+_Plan = namedtuple('_Plan', ['initial_release', 'steps', 'deps', 'reads'])
+
 
 class Chainer(Component):
     """
@@ -35,14 +40,17 @@ class Chainer(Component):
         forward_map: list of all variables in chainer's memory after  running every component in ``self.pipe``
         train_map: list of all variables in chainer's memory after  running every component in ``train_pipe.pipe``
         main: reference to the main component
+        profiler: collector of components' timings, ``None`` unless profiling is enabled
 
     Args:
         in_x: names of inputs for pipeline inference mode
         out_params: names of pipeline inference outputs
         in_y: names of additional inputs for pipeline training and evaluation modes
+        n_threads: if positive, components that do not depend on each other's outputs are run concurrently
+            in a pool of ``n_threads`` threads
     """
     def __init__(self, in_x: Union[str, list] = None, out_params: Union[str, list] = None,
-                 in_y: Union[str, list] = None, *args, **kwargs) -> None:
+                 in_y: Union[str, list] = None, n_threads: int = 0, *args, **kwargs) -> None:
         self.pipe: List[Tuple[Tuple[List[str], List[str]], List[str], Component]] = []
         self.train_pipe = []
         if isinstance(in_x, str):
@@ -59,9 +67,13 @@ class Chainer(Component):
         self.train_map = self.forward_map.union(self.in_y)
 
         self.main = None
+        self._plans = {}
+        self._exclusive = set()
+        self._executor = ThreadPoolExecutor(n_threads) if n_threads > 0 else None
+        self.profiler: Optional[ChainerProfiler] = None
 
     def append(self, component: Component, in_x: [str, list, dict]=None, out_params: [str, list]=None,
-               in_y: [str, list, dict]=None, main=False):
+               in_y: [str, list, dict]=None, main=False, parallel=True):
         if isinstance(in_x, str):
             in_x = [in_x]
         if isinstance(in_y, str):
@@ -108,6 +120,9 @@ class Chainer(Component):
             self.process_event = component.process_event
         if main:
             self.main = component
+        if not parallel:
+            self._exclusive.add(id(component))
+        self._plans.clear()
         if self.forward_map.issuperset(in_x):
             self.pipe.append(((x_keys, in_x), out_params, component))
             self.forward_map = self.forward_map.union(out_params)
@@ -142,8 +157,110 @@ class Chainer(Component):
     def __call__(self, *args):
         return self._compute(*args, param_names=self.in_x, pipe=self.pipe, targets=self.out_params)
 
+    def _compute(self, *args, param_names, pipe, targets):
+        plan = self._get_plan(pipe, param_names, targets)
+
+        mem = dict(zip(param_names, args))
+        del args
+        for k in plan.initial_release:
+            del mem[k]
+
+        if self._executor is not None and len(plan.steps) > 1:
+            self._run_parallel(mem, plan, targets)
+        else:
+            for (in_keys, in_params), out_params, component, release in plan.steps:
+                x = [mem[k] for k in in_params]
+                res = self._call_component(component, in_keys, x)
+                del x
+                self._store(mem, out_params, res)
+                del res
+                for k in release:
+                    mem.pop(k, None)
+
+        res = [mem[k] for k in targets]
+        if len(res) == 1:
+            res = res[0]
+        return res
+
+    def _call_component(self, component, in_keys, x):
+        if self.profiler is not None:
+            with self.profiler.measure(component, x):
+                return self._call_component_unprofiled(component, in_keys, x)
+        return self._call_component_unprofiled(component, in_keys, x)
+
+    @staticmethod
+    def _call_component_unprofiled(component, in_keys, x):
+        if in_keys:
+            return component(**dict(zip(in_keys, x)))
+        return component(*x)
+
     @staticmethod
-    def _compute(*args, param_names, pipe, targets):
+    def _store(mem, out_params, res):
+        if len(out_params) == 1:
+            mem[out_params[0]] = res
+        else:
+            mem.update(zip(out_params, res))
+
+    def _run_parallel(self, mem, plan, targets):
+        """Runs plan steps in the thread pool as soon as all the steps they depend on are finished.
+
+        Components appended with ``parallel=False`` are run in the calling thread while no other component runs.
+        """
+        reads = dict(plan.reads)
+        waiting = {i: set(deps) for i, deps in enumerate(plan.deps)}
+        running = {}
+        try:
+            while waiting or running:
+                for i in sorted(i for i, deps in waiting.items() if not deps):
+                    (in_keys, in_params), out_params, component, _ = plan.steps[i]
+                    exclusive = id(component) in self._exclusive
+                    if exclusive and running:
+                        continue
+                    del waiting[i]
+
+                    x = [mem[k] for k in in_params]
+                    for k in in_params:
+                        reads[k] -= 1
+                        if reads[k] == 0 and k not in targets:
+                            mem.pop(k, None)
+
+                    if exclusive:
+                        self._finish_step(mem, plan, i, self._call_component(component, in_keys, x),
+                                          waiting, reads, targets)
+                        break
+                    running[self._executor.submit(self._call_component, component, in_keys, x)] = i
+                else:
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._finish_step(mem, plan, running.pop(future), future.result(), waiting, reads, targets)
+        finally:
+            for future in running:
+                future.cancel()
+
+    def _finish_step(self, mem, plan, i, res, waiting, reads, targets):
+        out_params = plan.steps[i][1]
+        self._store(mem, out_params, res)
+        for k in out_params:
+            if reads.get(k, 0) == 0 and k not in targets:
+                mem.pop(k, None)
+        for deps in waiting.values():
+            deps.discard(i)
+
+    def _get_plan(self, pipe, param_names, targets) -> _Plan:
+        """Returns a cached execution plan of ``pipe`` for given inputs and targets.
+
+        The plan contains only the components needed to compute ``targets`` and, for every step, the names of
+        variables that are not used by any later step, so they are released from memory right after it.
+        It also holds indexes of the steps every step depends on and the number of reads of every variable
+        for parallel execution.
+        """
+        key = (id(pipe), tuple(param_names), tuple(targets))
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
         expected = set(targets)
         final_pipe = []
         for (in_keys, in_params), out_params, component in reversed(pipe):
@@ -153,26 +270,55 @@ class Chainer(Component):
         final_pipe.reverse()
         if not expected.issubset(param_names):
             raise RuntimeError(f'{expected} are required to compute {targets} but were not found in memory or inputs')
-        pipe = final_pipe
 
-        mem = dict(zip(param_names, args))
-        del args
+        last_use = {}
+        reads = defaultdict(int)
+        for i, ((_, in_params), _, _) in enumerate(final_pipe):
+            for k in in_params:
+                last_use[k] = i
+                reads[k] += 1
 
-        for (in_keys, in_params), out_params, component in pipe:
-            x = [mem[k] for k in in_params]
-            if in_keys:
-                res = component(**dict(zip(in_keys, x)))
-            else:
-                res = component(*x)
-            if len(out_params) == 1:
-                mem[out_params[0]] = res
-            else:
-                mem.update(zip(out_params, res))
+        def is_dead(name, step):
+            return name not in targets and last_use.get(name, -1) <= step
 
-        res = [mem[k] for k in targets]
-        if len(res) == 1:
-            res = res[0]
-        return res
+        initial_release = [k for k in set(param_names) if is_dead(k, -1)]
+        steps = []
+        deps = []
+        last_writer = {}
+        readers = defaultdict(set)
+        for i, (in_x, out_params, component) in enumerate(final_pipe):
+            release = {k for k in in_x[1] if is_dead(k, i)} | {k for k in out_params if is_dead(k, i)}
+            steps.append((in_x, out_params, component, list(release)))
+
+            step_deps = {last_writer[k] for k in in_x[1] if k in last_writer}
+            for k in out_params:
+                if k in last_writer:
+                    step_deps.add(last_writer[k])
+                step_deps.update(readers[k])
+            step_deps.discard(i)
+            deps.append(step_deps)
+
+            for k in in_x[1]:
+                readers[k].add(i)
+            for k in out_params:
+                last_writer[k] = i
+                readers[k] = set()
+
+        plan = _Plan(initial_release, steps, deps, dict(reads))
+        self._plans[key] = plan
+        return plan
+
+    def enable_profiling(self, trace_memory: bool = False) -> ChainerProfiler:
+        """Starts collecting wall time, CPU time and batch sizes of every component call.
+
+        Args:
+            trace_memory: whether to also measure memory peaks of component calls with :mod:`tracemalloc`
+
+        Returns:
+            profiler with the collected stats
+        """
+        self.profiler = ChainerProfiler(trace_memory)
+        return self.profiler
 
     def get_main_component(self) -> Serializable:
         return self.main or self.pipe[-1][-1]
@@ -196,6 +342,9 @@ class Chainer(Component):
                 component.destroy()
         self.pipe.clear()
         self.train_pipe.clear()
+        self._plans.clear()
+        if self._executor is not None:
+            self._executor.shutdown()
 
     def serialize(self) -> bytes:
         data = []
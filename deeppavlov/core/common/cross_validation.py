@@ -14,6 +14,7 @@
 
 import shutil
 from collections import OrderedDict
+from copy import deepcopy
 from pathlib import Path
 
 import numpy as np
@@ -24,20 +25,21 @@ from deeppavlov.core.commands.train import train_evaluate_model_from_config, get
 from deeppavlov.core.commands.utils import expand_path, parse_config
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.common.params_search import ParamsSearch
+from deeppavlov.core.common.prefix_cache import data_fingerprint
 
 SAVE_PATH_ELEMENT_NAME = 'save_path'
 TEMP_DIR_FOR_CV = 'cv_tmp'
 log = get_logger(__name__)
 
 
-def change_savepath_for_model(config):
+def change_savepath_for_model(config, temp_dir=TEMP_DIR_FOR_CV):
     params_helper = ParamsSearch()
 
     dirs_for_saved_models = set()
     for p in params_helper.find_model_path(config, SAVE_PATH_ELEMENT_NAME):
         p.append(SAVE_PATH_ELEMENT_NAME)
         save_path = Path(params_helper.get_value_from_config(config, p))
-        new_save_path = save_path.parent / TEMP_DIR_FOR_CV / save_path.name
+        new_save_path = save_path.parent / temp_dir / save_path.name
 
         dirs_for_saved_models.add(expand_path(new_save_path.parent))
 
@@ -56,7 +58,7 @@ def create_dirs_to_save_models(dirs_for_saved_models):
         new_save_dir.mkdir(exist_ok=True, parents=True)
 
 
-def generate_train_valid(data, n_folds=5, is_loo=False):
+def generate_train_valid(data, n_folds=5, is_loo=False, random_state=None):
     all_data = data['train'] + data['valid']
 
     if is_loo:
@@ -71,7 +73,7 @@ def generate_train_valid(data, n_folds=5, is_loo=False):
             yield data_i
     else:
         # for Cross Validation
-        kf = KFold(n_splits=n_folds, shuffle=True)
+        kf = KFold(n_splits=n_folds, shuffle=True, random_state=random_state)
         for train_index, valid_index in kf.split(all_data):
             data_i = {
                 'train': [all_data[i] for i in train_index],
@@ -82,7 +84,17 @@ def generate_train_valid(data, n_folds=5, is_loo=False):
             yield data_i
 
 
-def calc_cv_score(config, data=None, n_folds=5, is_loo=False):
+def calc_cv_score(config, data=None, n_folds=5, is_loo=False, random_state=None, prefix_cache=None):
+    """Cross-validates the model and returns mean values of validation metrics.
+
+    Args:
+        config: model config or path to it
+        data: dataset, read with the config dataset reader if not given
+        n_folds: number of folds
+        is_loo: whether to use leave one out cross-validation instead of folds
+        random_state: seed of folds shuffling, configs evaluated with the same seed see the same folds
+        prefix_cache: cache of fitted pipeline components, components fitted on the same fold are reused
+    """
     config = parse_config(config)
 
     if data is None:
@@ -91,10 +103,16 @@ def calc_cv_score(config, data=None, n_folds=5, is_loo=False):
     config, dirs_for_saved_models = change_savepath_for_model(config)
 
     cv_score = OrderedDict()
-    for data_i in generate_train_valid(data, n_folds=n_folds, is_loo=is_loo):
+    for data_i in generate_train_valid(data, n_folds=n_folds, is_loo=is_loo, random_state=random_state):
         iterator = get_iterator_from_config(config, data_i)
         create_dirs_to_save_models(dirs_for_saved_models)
-        score = train_evaluate_model_from_config(config, iterator=iterator)
+        if prefix_cache is None:
+            score = train_evaluate_model_from_config(config, iterator=iterator)
+        else:
+            config_i = deepcopy(config)
+            pending = prefix_cache.restore(config_i, data_fingerprint(data_i))
+            score = train_evaluate_model_from_config(config_i, iterator=iterator)
+            prefix_cache.store(config_i, pending)
         delete_dir_for_saved_models(dirs_for_saved_models)
         for key, value in score['valid'].items():
             if key not in cv_score:
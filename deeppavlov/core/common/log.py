@@ -17,6 +17,8 @@ import logging
 import logging.config
 import sys
 from pathlib import Path
+from threading import Lock
+from typing import Optional
 
 from .paths import get_settings_path
 
@@ -27,30 +29,45 @@ root_path = Path(__file__).resolve().parents[3]
 
 logging.getLogger('matplotlib').setLevel(logging.WARNING)
 
+_logging_lock = Lock()
+_logging_configured = False
+_logging_config_error: Optional[Exception] = None
 
-def get_logger(logger_name):
-    try:
-        log_config_path = get_settings_path() / LOG_CONFIG_FILENAME
 
-        with log_config_path.open(encoding='utf8') as log_config_json:
-            log_config = json.load(log_config_json)
+def _configure_logging() -> None:
+    """Applies logging settings from the settings directory once per process."""
+    global _logging_configured, _logging_config_error
+    with _logging_lock:
+        if _logging_configured:
+            return
+        _logging_configured = True
+        try:
+            log_config_path = get_settings_path() / LOG_CONFIG_FILENAME
+
+            with log_config_path.open(encoding='utf8') as log_config_json:
+                log_config = json.load(log_config_json)
+
+            configured_loggers = [log_config.get('root', {})] + log_config.get('loggers', [])
+            used_handlers = {handler for log in configured_loggers for handler in log.get('handlers', [])}
 
-        configured_loggers = [log_config.get('root', {})] + log_config.get('loggers', [])
-        used_handlers = {handler for log in configured_loggers for handler in log.get('handlers', [])}
+            for handler_id, handler in list(log_config['handlers'].items()):
+                if handler_id not in used_handlers:
+                    del log_config['handlers'][handler_id]
+                elif 'filename' in handler.keys():
+                    filename = handler['filename']
+                    logfile_path = Path(filename).expanduser().resolve()
+                    handler['filename'] = str(logfile_path)
 
-        for handler_id, handler in list(log_config['handlers'].items()):
-            if handler_id not in used_handlers:
-                del log_config['handlers'][handler_id]
-            elif 'filename' in handler.keys():
-                filename = handler['filename']
-                logfile_path = Path(filename).expanduser().resolve()
-                handler['filename'] = str(logfile_path)
+            logging.config.dictConfig(log_config)
+        except Exception as e:
+            _logging_config_error = e
 
-        logging.config.dictConfig(log_config)
-        logger = logging.getLogger(logger_name)
 
-    except Exception:
-        logger = logging.getLogger(logger_name)
+def get_logger(logger_name):
+    _configure_logging()
+    logger = logging.getLogger(logger_name)
+
+    if _logging_config_error is not None:
         logger.setLevel(logging.WARNING)
 
         formatter = logging.Formatter(
@@ -65,6 +82,7 @@ def get_logger(logger_name):
 
         logger.error(
             'LOGGER ERROR: Can not initialise {} logger, '
-            'logging to the stderr. Error traceback:\n'.format(logger_name), exc_info=TRACEBACK_LOGGER_ERRORS)
+            'logging to the stderr. Error traceback:\n'.format(logger_name),
+            exc_info=_logging_config_error if TRACEBACK_LOGGER_ERRORS else False)
 
     return logger
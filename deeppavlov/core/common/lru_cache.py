@@ -0,0 +1,96 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+
+class LRUCache:
+    """Thread-safe dictionary of limited size which evicts least recently used items and counts cache hits.
+
+    Args:
+        max_size: maximum number of items in the cache
+
+    Attributes:
+        hits: number of successful lookups
+        misses: number of failed lookups
+    """
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get_many(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Any], List[Hashable]]:
+        """Looks up several keys at once.
+
+        Returns:
+            a dictionary of found items and a list of missing keys without duplicates
+        """
+        found = {}
+        missing = OrderedDict()
+        with self._lock:
+            for key in keys:
+                if key in found or key in missing:
+                    continue
+                try:
+                    found[key] = self._data[key]
+                except KeyError:
+                    missing[key] = None
+                    continue
+                self._data.move_to_end(key)
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, list(missing)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        found, _ = self.get_many([key])
+        return found.get(key, default)
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def update(self, items: Dict[Hashable, Any]) -> None:
+        for key, value in items.items():
+            self.put(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the cache size, numbers of hits and misses and the hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.
+            }
@@ -1,7 +1,8 @@
 import importlib
 import json
+from abc import ABCMeta, abstractmethod
 from pathlib import Path
-from typing import Callable, Any
+from typing import Callable, Any, Optional, Type
 
 from deeppavlov.core.common.errors import ConfigError
 from deeppavlov.core.common.log import get_logger
@@ -44,3 +45,32 @@ def get_metric_by_name(name: str) -> Callable[..., Any]:
     if name not in _REGISTRY:
         raise ConfigError(f'"{name}" is not registered as a metric')
     return fn_from_str(_REGISTRY[name])
+
+
+class MetricAccumulator(metaclass=ABCMeta):
+    """Computes a metric incrementally, batch by batch, keeping only aggregated statistics instead of all
+    predictions. :meth:`update` accepts the same arguments as the metric function for one batch and
+    :meth:`result` returns the same value as the metric function would for all batches seen so far."""
+
+    @abstractmethod
+    def update(self, *args) -> None:
+        """Adds a batch of metric inputs."""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Returns the metric value for all batches added so far."""
+
+
+def metric_accumulator(metric_fn: Callable[..., Any]) -> Callable[[Type[MetricAccumulator]], Type[MetricAccumulator]]:
+    """Decorator which marks a :class:`MetricAccumulator` subclass as a streaming implementation of
+    the ``metric_fn``."""
+    def decorate(cls):
+        metric_fn.accumulator = cls
+        return cls
+    return decorate
+
+
+def get_metric_accumulator(metric_fn: Callable[..., Any]) -> Optional[MetricAccumulator]:
+    """Returns a new accumulator of the metric or ``None`` if the metric can be computed only on the whole data."""
+    accumulator = getattr(metric_fn, 'accumulator', None)
+    return accumulator() if accumulator is not None else None
@@ -0,0 +1,151 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import List, Tuple, Union
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+# set in configs of components restored from the cache, which are built in the infer mode to load fitted files
+RESTORED_KEY = 'restored_from_prefix_cache'
+
+
+def data_fingerprint(data: dict) -> str:
+    """Returns a hash of the dataset, which identifies the data fitted components are trained on."""
+    return hashlib.sha1(pickle.dumps(data, protocol=4)).hexdigest()
+
+
+# suffixes which tensorflow savers append to checkpoint paths
+CHECKPOINT_SUFFIXES = ('.index', '.meta')
+CHECKPOINT_DATA_SUFFIX = '.data-'
+
+
+def _is_checkpoint_file(name: str, save_path: Path) -> bool:
+    if not name.startswith(save_path.name):
+        return False
+    suffix = name[len(save_path.name):]
+    return suffix in CHECKPOINT_SUFFIXES or suffix.startswith(CHECKPOINT_DATA_SUFFIX)
+
+
+def _saved_files(save_path: Path) -> List[Path]:
+    """Returns the file or directory at ``save_path`` and files of a tensorflow checkpoint with this path.
+
+    Other files of the directory are never included, as they may belong to other components.
+    """
+    if not save_path.parent.is_dir():
+        return []
+    return [p for p in save_path.parent.iterdir()
+            if p.name == save_path.name or _is_checkpoint_file(p.name, save_path)]
+
+
+def _copy(src: Path, dst_dir: Path) -> None:
+    dst = dst_dir / src.name
+    if src.is_dir():
+        if dst.exists():
+            shutil.rmtree(str(dst))
+        shutil.copytree(str(src), str(dst))
+    else:
+        shutil.copy2(str(src), str(dst))
+
+
+class FittedPrefixCache:
+    """Content-addressed storage of pipeline components fitted with ``fit_on``.
+
+    A fitted component is identified by configs of all pipe components up to and including it together with
+    the dataset iterator config and a fingerprint of the data, so configs which differ only in parameters of
+    subsequent components share the fitted component. Save and load paths are not a part of the key, so that
+    configs with different model directories share it as well.
+
+    Args:
+        cache_dir: directory to store files of fitted components in
+    """
+    def __init__(self, cache_dir: Union[str, Path]) -> None:
+        self.cache_dir = expand_path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _keys(config: dict, fingerprint: str) -> List[Tuple[int, str]]:
+        keys = []
+        prefix = []
+        for i, component_config in enumerate(config['chainer']['pipe']):
+            component_config = {k: v for k, v in component_config.items() if k != 'save_path'}
+            if 'fit_on' in component_config:
+                component_config.pop('load_path', None)
+            prefix.append(component_config)
+            if 'fit_on' not in component_config or 'save_path' not in config['chainer']['pipe'][i]:
+                continue
+            content = json.dumps([prefix, config.get('dataset_iterator'), config.get('train', {}).get('batch_size'),
+                                  fingerprint], sort_keys=True, default=str)
+            keys.append((i, hashlib.sha1(content.encode('utf8')).hexdigest()))
+        return keys
+
+    def restore(self, config: dict, fingerprint: str) -> List[Tuple[int, str]]:
+        """Puts cached fitted components to their save paths and makes the config load them instead of fitting.
+
+        Restored components are marked with :data:`RESTORED_KEY`, so that
+        :func:`~deeppavlov.core.commands.train.fit_chainer` builds them in the ``infer`` mode, in which all components
+        load their fitted files.
+
+        Args:
+            config: parsed model config, which is modified in place
+            fingerprint: fingerprint of the data returned by :func:`data_fingerprint`
+
+        Returns:
+            indexes of pipe components which are fitted from scratch and their cache keys, to be passed to
+            :meth:`store` after training
+        """
+        pending = []
+        for i, key in self._keys(config, fingerprint):
+            component_config = config['chainer']['pipe'][i]
+            cached = self.cache_dir / key
+            if not cached.is_dir():
+                pending.append((i, key))
+                continue
+            save_path = expand_path(component_config['save_path'])
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            for p in cached.iterdir():
+                _copy(p, save_path.parent)
+            component_config['load_path'] = component_config['save_path']
+            component_config[RESTORED_KEY] = True
+            del component_config['fit_on']
+            log.info(f'Fitted "{component_config.get("class_name", component_config.get("ref"))}" '
+                     f'is restored from the prefix cache')
+        return pending
+
+    def store(self, config: dict, pending: List[Tuple[int, str]]) -> None:
+        """Copies files of components fitted from scratch into the cache."""
+        for i, key in pending:
+            target = self.cache_dir / key
+            if target.exists():
+                continue
+            files = _saved_files(expand_path(config['chainer']['pipe'][i]['save_path']))
+            if not files:
+                continue
+            tmp = self.cache_dir / f'{key}.tmp{os.getpid()}'
+            tmp.mkdir(parents=True, exist_ok=True)
+            for p in files:
+                _copy(p, tmp)
+            try:
+                tmp.rename(target)
+            except OSError:
+                # the same component was stored by another process in the meantime
+                shutil.rmtree(str(tmp))
@@ -0,0 +1,127 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, List
+
+# thread_time is not available before python 3.7
+_cpu_time = getattr(time, 'thread_time', time.process_time)
+
+
+class ComponentStats:
+    """Accumulated measurements of a single pipeline component."""
+    def __init__(self) -> None:
+        self.calls = 0
+        self.samples = 0
+        self.wall_time = 0.
+        self.cpu_time = 0.
+        self.memory_peak = 0
+
+    def as_dict(self, precision: int = 4) -> OrderedDict:
+        calls = self.calls or 1
+        return OrderedDict([
+            ('calls', self.calls),
+            ('mean_batch_size', round(self.samples / calls, 2)),
+            ('wall_time', round(self.wall_time, precision)),
+            ('mean_wall_time', round(self.wall_time / calls, precision)),
+            ('cpu_time', round(self.cpu_time, precision)),
+            ('memory_peak_kb', self.memory_peak // 1024)
+        ])
+
+
+class ChainerProfiler:
+    """Collects wall time, CPU time, batch sizes and optionally allocated memory peaks of Chainer components.
+
+    Memory is traced with :mod:`tracemalloc`, which slows down the inference considerably, so it is disabled by default.
+    CPU time is measured for the thread which runs a component, so it does not include time spent by the component in
+    its own worker threads or processes.
+
+    Args:
+        trace_memory: whether to measure memory allocated while components are running
+
+    Attributes:
+        stats: accumulated stats by component names
+    """
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        self.stats: Dict[str, ComponentStats] = OrderedDict()
+        self._names: Dict[int, str] = {}
+        self._lock = Lock()
+
+    def _get_name(self, component: Any) -> str:
+        name = self._names.get(id(component))
+        if name is None:
+            name = base_name = type(component).__name__
+            i = 1
+            while name in self.stats:
+                i += 1
+                name = f'{base_name}_{i}'
+            self._names[id(component)] = name
+            self.stats[name] = ComponentStats()
+        return name
+
+    @contextmanager
+    def measure(self, component: Any, args: List[Any]):
+        """Context manager measuring a single call of the ``component`` with ``args``."""
+        with self._lock:
+            stats = self.stats[self._get_name(component)]
+
+        if self.trace_memory:
+            memory_start = tracemalloc.get_traced_memory()[0]
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_time()
+
+        yield
+
+        cpu_time = _cpu_time() - cpu_start
+        wall_time = time.perf_counter() - wall_start
+        memory_peak = 0
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if not hasattr(tracemalloc, 'reset_peak'):
+                peak = current
+            memory_peak = max(peak - memory_start, 0)
+
+        try:
+            batch_size = len(args[0])
+        except (IndexError, TypeError):
+            batch_size = 0
+
+        with self._lock:
+            stats.calls += 1
+            stats.samples += batch_size
+            stats.wall_time += wall_time
+            stats.cpu_time += cpu_time
+            stats.memory_peak = max(stats.memory_peak, memory_peak)
+
+    def summary(self) -> OrderedDict:
+        """Returns accumulated stats sorted by total wall time in descending order."""
+        with self._lock:
+            items = sorted(self.stats.items(), key=lambda item: item[1].wall_time, reverse=True)
+            return OrderedDict((name, stats.as_dict()) for name, stats in items)
+
+    def reset(self) -> None:
+        """Clears accumulated stats."""
+        with self._lock:
+            for name in self.stats:
+                self.stats[name] = ComponentStats()
@@ -12,15 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+import json
 from typing import Tuple, Iterator, Optional, Dict, List, Union
 from pathlib import Path
 
+from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.common.registry import register
 from deeppavlov.dataset_iterators.file_paths_iterator import FilePathsIterator
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.data.utils import chunk_generator
 from deeppavlov.models.preprocessors.str_utf8_encoder import StrUTF8Encoder
 from deeppavlov.core.data.simple_vocab import SimpleVocabulary
+from deeppavlov.dataset_iterators.elmo_shards import ELMoBatch, EncodedShard, encode_shard, generate_batches, \
+    prefetch_batches
 
 log = get_logger(__name__)
 
@@ -40,6 +45,12 @@ class ELMoFilePathsIterator(FilePathsIterator):
         max_word_length: max length of word
         bos: tag of begin of sentence
         eos: tag of end of sentence
+        encoded_shards_dir: directory to keep shards encoded to memory-mapped arrays of token ids and char ids in;
+            every shard is encoded once and batches are built from encoded shards with numpy if it is set
+        n_workers: number of processes preparing batches from encoded shards in the background,
+            batches are prepared in the main process if it is 0; preparing a batch from encoded shards is usually
+            cheaper than receiving it from another process, so workers pay off only for large batches
+        prefetch_size: maximum number of batches prepared by worker processes in advance
 
     """
 
@@ -53,11 +64,18 @@ class ELMoFilePathsIterator(FilePathsIterator):
                  max_word_length: Optional[int] = None,
                  bos: str = "<S>",
                  eos: str = "</S>",
+                 encoded_shards_dir: Optional[Union[str, Path]] = None,
+                 n_workers: int = 0,
+                 prefetch_size: int = 8,
                  *args, **kwargs) -> None:
         self.unroll_steps = unroll_steps
         self.n_gpus = n_gpus
         self.bos = bos
         self.eos = eos
+        self.max_word_length = max_word_length
+        self.encoded_shards_dir = expand_path(encoded_shards_dir) if encoded_shards_dir else None
+        self.n_workers = n_workers
+        self.prefetch_size = prefetch_size
         self.str_utf8_encoder = StrUTF8Encoder(
             max_word_length=max_word_length,
             pad_special_char_use=True,
@@ -103,6 +121,32 @@ class ELMoFilePathsIterator(FilePathsIterator):
                     self._line2ids(line)
                 yield char_ids, reversed_char_ids, token_ids, reversed_token_ids
 
+    def _encoded_shard_path(self, shard: Union[str, Path]) -> Path:
+        """Returns a directory with the encoded shard, encoding it first if it was not encoded yet."""
+        shard = Path(shard).resolve()
+        vocab_path = self.simple_vocab.load_path
+        # encoded shards are invalidated by changes of the shard, the vocabulary or encoding parameters
+        key = json.dumps([str(shard), shard.stat().st_size, shard.stat().st_mtime,
+                          str(vocab_path), vocab_path.stat().st_mtime if vocab_path.is_file() else None,
+                          self.max_word_length, self.bos, self.eos])
+        path = self.encoded_shards_dir / f'{shard.name}.{hashlib.sha1(key.encode("utf8")).hexdigest()[:16]}'
+        if not EncodedShard.exists(path):
+            log.info(f'Encoding shard {shard} to {path}')
+            self.encoded_shards_dir.mkdir(parents=True, exist_ok=True)
+            with shard.open(encoding='utf-8') as f:
+                encode_shard(f, path, self.bos, self.eos, self.simple_vocab, self.str_utf8_encoder)
+        return path
+
+    def _encoded_batch_generator(self, shards: List[Union[str, Path]], batch_size: int, unroll_steps: int,
+                                 shuffle: bool) -> Iterator[ELMoBatch]:
+        shard_paths = [self._encoded_shard_path(shard) for shard in shards]
+        if shuffle:
+            self.np_random.shuffle(shard_paths)
+        if self.n_workers > 0:
+            seeds = [self.np_random.randint(2 ** 31) if shuffle else None for _ in range(self.n_workers)]
+            return prefetch_batches(shard_paths, batch_size, unroll_steps, seeds, self.prefetch_size)
+        return generate_batches(shard_paths, batch_size, unroll_steps, self.np_random if shuffle else None)
+
     @staticmethod
     def _batch_generator(line_generator, batch_size, unroll_steps):
         batch = [[[] for i in range(4)] for i in range(batch_size)]
@@ -136,8 +180,6 @@ class ELMoFilePathsIterator(FilePathsIterator):
             shuffle = self.shuffle
 
         tgt_data = self.data[data_type]
-        shard_generator = self._shard_generator(tgt_data, shuffle=shuffle)
-        line_generator = self._line_generator(shard_generator)
 
         if data_type == 'train':
             unroll_steps = self.unroll_steps
@@ -148,7 +190,12 @@ class ELMoFilePathsIterator(FilePathsIterator):
             batch_size = 256
             n_gpus = 1
 
-        batch_generator = self._batch_generator(line_generator, batch_size * n_gpus, unroll_steps)
+        if self.encoded_shards_dir is not None:
+            batch_generator = self._encoded_batch_generator(tgt_data, batch_size * n_gpus, unroll_steps, shuffle)
+        else:
+            shard_generator = self._shard_generator(tgt_data, shuffle=shuffle)
+            line_generator = self._line_generator(shard_generator)
+            batch_generator = self._batch_generator(line_generator, batch_size * n_gpus, unroll_steps)
 
         for char_ids, reversed_char_ids, token_ids, reversed_token_ids in batch_generator:
             batch = [(char_ids, reversed_char_ids), (token_ids, reversed_token_ids)]
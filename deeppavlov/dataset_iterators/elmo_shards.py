@@ -0,0 +1,262 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import multiprocessing
+import os
+import shutil
+import traceback
+from array import array
+from collections import deque
+from itertools import chain
+from pathlib import Path
+from queue import Empty
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+TOKEN_IDS_FILENAME = 'token_ids.npy'
+WORD_IDS_FILENAME = 'word_ids.npy'
+CHARS_FILENAME = 'chars.npy'
+OFFSETS_FILENAME = 'offsets.npy'
+
+ELMoBatch = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def encode_shard(lines: Iterable[str], dst_path: Union[str, Path], bos: str, eos: str,
+                 token_ids_fn: Callable[[List[str]], List[int]],
+                 char_ids_fn: Callable[[List[str]], np.ndarray]) -> None:
+    """Encodes lines of a tokenized shard to memory-mappable arrays read by :class:`EncodedShard`.
+
+    Every distinct word of the shard is passed to ``token_ids_fn`` and ``char_ids_fn`` only once.
+
+    Args:
+        lines: lines of whitespace separated tokens
+        dst_path: directory to write arrays to, it is created atomically
+        bos: token of the beginning of a sentence
+        eos: token of the end of a sentence
+        token_ids_fn: function which returns vocabulary ids of a list of words
+        char_ids_fn: function which returns a matrix of char ids of a list of words
+    """
+    dst_path = Path(dst_path)
+    word_index = {}
+    word_ids = array('i')
+    offsets = array('q', [0])
+    for line in lines:
+        for word in chain([bos], line.split(), [eos]):
+            i = word_index.get(word)
+            if i is None:
+                i = word_index[word] = len(word_index)
+            word_ids.append(i)
+        offsets.append(len(word_ids))
+
+    words = list(word_index)
+    word_ids = np.frombuffer(word_ids, dtype=np.int32)
+    if words:
+        token_ids = np.array(token_ids_fn(words), dtype=np.int32)[word_ids]
+        # char ids are less than 261
+        chars = np.asarray(char_ids_fn(words), dtype=np.int16)
+    else:
+        # the shard has no lines, encoders are not called with an empty list of words
+        token_ids = np.zeros(0, dtype=np.int32)
+        chars = np.zeros((0, 0), dtype=np.int16)
+
+    tmp_path = dst_path.with_name(f'{dst_path.name}.tmp{os.getpid()}')
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    np.save(str(tmp_path / TOKEN_IDS_FILENAME), token_ids)
+    np.save(str(tmp_path / WORD_IDS_FILENAME), word_ids)
+    np.save(str(tmp_path / CHARS_FILENAME), chars)
+    np.save(str(tmp_path / OFFSETS_FILENAME), np.frombuffer(offsets, dtype=np.int64))
+    try:
+        tmp_path.rename(dst_path)
+    except OSError:
+        # the shard was encoded by another process in the meantime
+        shutil.rmtree(str(tmp_path))
+
+
+class EncodedShard:
+    """Memory-mapped shard encoded with :func:`encode_shard`.
+
+    Tokens of all lines, each surrounded by ``bos`` and ``eos``, are concatenated, line ``i`` occupies positions
+    from ``offsets[i]`` to ``offsets[i + 1]``.
+
+    Args:
+        path: directory with the encoded shard
+
+    Attributes:
+        token_ids: vocabulary ids of tokens
+        word_ids: indexes of tokens in the ``chars`` matrix
+        chars: char ids of distinct words of the shard
+        offsets: start positions of lines
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        self.token_ids = np.load(str(path / TOKEN_IDS_FILENAME), mmap_mode='r')
+        self.word_ids = np.load(str(path / WORD_IDS_FILENAME), mmap_mode='r')
+        self.chars = np.load(str(path / CHARS_FILENAME))
+        self.offsets = np.load(str(path / OFFSETS_FILENAME))
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        return (Path(path) / OFFSETS_FILENAME).is_file()
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+def _line_generator(shard_paths: List[Union[str, Path]],
+                    np_random: Optional[np.random.RandomState]) -> Iterator[Tuple[EncodedShard, int, int]]:
+    for path in shard_paths:
+        log.info(f'Loaded encoded shard from {path}')
+        shard = EncodedShard(path)
+        order = np_random.permutation(len(shard)) if np_random is not None else range(len(shard))
+        for i in order:
+            yield shard, int(shard.offsets[i]), int(shard.offsets[i + 1])
+
+
+def generate_batches(shard_paths: List[Union[str, Path]], batch_size: int, unroll_steps: int,
+                     np_random: Optional[np.random.RandomState] = None,
+                     chars_dtype: np.dtype = np.int32) -> Iterator[ELMoBatch]:
+    """Generates batches of char ids and token ids from encoded shards.
+
+    Every row of a batch is a continuous stream of lines, a line ``[bos, w_1, ..., w_n, eos]`` contributes char ids
+    of ``[bos, w_1, ..., w_n]`` with token ids of ``[w_1, ..., w_n, eos]`` to the forward direction and char ids of
+    ``[eos, w_n, ..., w_1]`` with token ids of ``[w_n, ..., w_1, bos]`` to the backward one.
+    An incomplete last batch is dropped.
+
+    Args:
+        shard_paths: directories with encoded shards
+        batch_size: number of rows in a batch
+        unroll_steps: number of tokens in a row
+        np_random: random state to shuffle lines of every shard with, lines are not shuffled if ``None``
+        chars_dtype: type of char ids arrays
+
+    Yields:
+        char ids, reversed char ids, token ids and reversed token ids of a batch
+    """
+    line_generator = _line_generator(shard_paths, np_random)
+    # every stream is a queue of [shard, forward position, backward position, number of remaining tokens]
+    streams = [deque() for _ in range(batch_size)]
+    stream_lengths = [0] * batch_size
+    while True:
+        # positions of forward and backward tokens of the batch are collected first and looked up at once
+        fwd_positions = array('q')
+        bwd_positions = array('q')
+        shard_runs = []
+        for row, stream in enumerate(streams):
+            while stream_lengths[row] < unroll_steps:
+                try:
+                    shard, start, end = next(line_generator)
+                except StopIteration:
+                    return
+                stream.append([shard, start, end - 1, end - 1 - start])
+                stream_lengths[row] += end - 1 - start
+
+            j = 0
+            while j < unroll_steps:
+                segment = stream[0]
+                shard, fwd, bwd, remaining = segment
+                n = min(remaining, unroll_steps - j)
+                fwd_positions.extend(range(fwd, fwd + n))
+                bwd_positions.extend(range(bwd, bwd - n, -1))
+                if shard_runs and shard_runs[-1][0] is shard:
+                    shard_runs[-1][1] += n
+                else:
+                    shard_runs.append([shard, n])
+                j += n
+                if n == remaining:
+                    stream.popleft()
+                else:
+                    segment[1:] = fwd + n, bwd - n, remaining - n
+            stream_lengths[row] -= unroll_steps
+
+        fwd_positions = np.frombuffer(fwd_positions, dtype=np.int64)
+        bwd_positions = np.frombuffer(bwd_positions, dtype=np.int64)
+        size = batch_size * unroll_steps
+        char_ids = np.empty((size, shard_runs[0][0].chars.shape[1]), dtype=chars_dtype)
+        reversed_char_ids = np.empty_like(char_ids)
+        token_ids = np.empty(size, dtype=np.int32)
+        reversed_token_ids = np.empty_like(token_ids)
+        start = 0
+        for shard, n in shard_runs:
+            fwd, bwd = fwd_positions[start:start + n], bwd_positions[start:start + n]
+            char_ids[start:start + n] = shard.chars[shard.word_ids[fwd]]
+            token_ids[start:start + n] = shard.token_ids[fwd + 1]
+            reversed_char_ids[start:start + n] = shard.chars[shard.word_ids[bwd]]
+            reversed_token_ids[start:start + n] = shard.token_ids[bwd - 1]
+            start += n
+        yield (char_ids.reshape(batch_size, unroll_steps, -1), reversed_char_ids.reshape(batch_size, unroll_steps, -1),
+               token_ids.reshape(batch_size, unroll_steps), reversed_token_ids.reshape(batch_size, unroll_steps))
+
+
+def _produce_batches(queue: multiprocessing.Queue, shard_paths: List[Union[str, Path]], batch_size: int,
+                     unroll_steps: int, seed: Optional[int]) -> None:
+    try:
+        np_random = np.random.RandomState(seed) if seed is not None else None
+        # char ids are passed between processes as int16 to halve the amount of transferred data
+        for batch in generate_batches(shard_paths, batch_size, unroll_steps, np_random, np.int16):
+            queue.put(batch)
+        queue.put(None)
+    except Exception:
+        queue.put(traceback.format_exc())
+
+
+def prefetch_batches(shard_paths: List[Union[str, Path]], batch_size: int, unroll_steps: int,
+                     seeds: List[Optional[int]], queue_size: int = 8) -> Iterator[ELMoBatch]:
+    """Generates batches with :func:`generate_batches` in worker processes ahead of their consumption.
+
+    Shards are distributed among ``len(seeds)`` workers, so the order of batches depends on the speed of workers.
+
+    Args:
+        shard_paths: directories with encoded shards
+        batch_size: number of rows in a batch
+        unroll_steps: number of tokens in a row
+        seeds: random seeds to shuffle lines with, one per worker, lines are not shuffled by workers with ``None``
+        queue_size: maximum number of prepared batches waiting for consumption
+
+    Yields:
+        char ids, reversed char ids, token ids and reversed token ids of a batch
+    """
+    n_workers = len(seeds)
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue(queue_size)
+    workers = [ctx.Process(target=_produce_batches, daemon=True,
+                           args=(queue, [str(p) for p in shard_paths[i::n_workers]], batch_size, unroll_steps, seed))
+               for i, seed in enumerate(seeds)]
+    for worker in workers:
+        worker.start()
+    try:
+        finished = 0
+        while finished < n_workers:
+            try:
+                item = queue.get(timeout=1.)
+            except Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    raise RuntimeError('ELMo batch producers exited unexpectedly')
+                continue
+            if item is None:
+                finished += 1
+            elif isinstance(item, str):
+                raise RuntimeError(f'ELMo batch producer failed:\n{item}')
+            else:
+                char_ids, reversed_char_ids, token_ids, reversed_token_ids = item
+                yield char_ids.astype(np.int32), reversed_char_ids.astype(np.int32), token_ids, reversed_token_ids
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
@@ -26,6 +26,9 @@ from deeppavlov.core.commands.utils import expand_path
 
 logger = get_logger(__name__)
 
+# default SQLITE_MAX_VARIABLE_NUMBER
+SQLITE_MAX_VARIABLES = 999
+
 
 @register('sqlite_iterator')
 class SQLiteDataIterator(DataFittingIterator):
@@ -40,6 +43,7 @@ class SQLiteDataIterator(DataFittingIterator):
         seed: random seed for data shuffling
 
     Attributes:
+        load_path: a path to local DB file
         connect: a DB connection
         db_name: a DB name
         doc_ids: DB document ids
@@ -55,8 +59,9 @@ class SQLiteDataIterator(DataFittingIterator):
 
         load_path = str(expand_path(load_path))
         logger.info("Connecting to database, path: {}".format(load_path))
+        self.load_path = load_path
         try:
-            self.connect = sqlite3.connect(load_path, check_same_thread=False)
+            self.connect = self._open_connection(load_path)
         except sqlite3.OperationalError as e:
             e.args = e.args + ("Check that DB path exists and is a valid DB file",)
             raise e
@@ -73,6 +78,18 @@ class SQLiteDataIterator(DataFittingIterator):
         self.shuffle = shuffle
         self.random = Random(seed)
 
+    def _open_connection(self, load_path: str) -> sqlite3.Connection:
+        """Open a DB connection.
+
+        Args:
+            load_path: a path to local DB file
+
+        Returns:
+            a DB connection
+
+        """
+        return sqlite3.connect(load_path, check_same_thread=False)
+
     @overrides
     def get_doc_ids(self) -> List[Any]:
         """Get document ids.
@@ -132,6 +149,29 @@ class SQLiteDataIterator(DataFittingIterator):
         cursor.close()
         return result if result is None else result[0]
 
+    def get_docs_content(self, doc_ids: List[Any]) -> List[Optional[str]]:
+        """Get contents of several documents with a few bulk queries.
+
+        Args:
+            doc_ids: document ids
+
+        Returns:
+            document contents in the order of ``doc_ids``, ``None`` for missing documents
+
+        """
+        contents = {}
+        unique_ids = list(set(doc_ids))
+        cursor = self.connect.cursor()
+        for i in range(0, len(unique_ids), SQLITE_MAX_VARIABLES):
+            chunk = unique_ids[i:i + SQLITE_MAX_VARIABLES]
+            cursor.execute(
+                "SELECT id, text FROM {} WHERE id IN ({})".format(self.db_name, ', '.join('?' * len(chunk))),
+                chunk
+            )
+            contents.update(cursor.fetchall())
+        cursor.close()
+        return [contents.get(doc_id) for doc_id in doc_ids]
+
     @overrides
     def gen_batches(self, batch_size: int, shuffle: bool = None) \
             -> Generator[Tuple[List[str], List[int]], Any, None]:
@@ -163,6 +203,6 @@ class SQLiteDataIterator(DataFittingIterator):
             # DEBUG
             # logger.info(
             #     "Processing batch # {} of {} ({} documents)".format(i, len_batches, len(doc_index)))
-            docs = [self.get_doc_content(doc_id) for doc_id in doc_ids]
+            docs = self.get_docs_content(doc_ids)
             doc_nums = [self.doc2index[doc_id] for doc_id in doc_ids]
             yield docs, zip(doc_ids, doc_nums)
@@ -12,8 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Union, Tuple, Optional
+from typing import Dict, List, Union, Tuple, Optional, Iterator
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.data.utils import download_decompress, mark_done
@@ -32,25 +33,18 @@ def get_language(filepath: str) -> str:
     """
     return filepath.split("-")[0]
 
-def read_infile(infile: Union[Path, str], from_words=False,
+def iter_infile(infile: Union[Path, str], from_words=False,
                 word_column: int = WORD_COLUMN, pos_column: int = POS_COLUMN,
-                tag_column: int = TAG_COLUMN, max_sents: int = -1,
-                read_only_words: bool = False) -> List[Tuple[List, Union[List, None]]]:
-    """Reads input file in CONLL-U format
+                tag_column: int = TAG_COLUMN, read_only_words: bool = False
+                ) -> Iterator[Tuple[List, Union[List, None]]]:
+    """Lazily reads input file in CONLL-U format sentence by sentence,
+    see ``read_infile`` for description of arguments.
 
-    Args:
-        infile: a path to a file
-        word_column: column containing words (default=1)
-        pos_column: column containing part-of-speech labels (default=3)
-        tag_column: column containing fine-grained tags (default=5)
-        max_sents: maximal number of sents to read
-        read_only_words: whether to read only words
-
-    Returns:
-        a list of sentences. Each item contains a word sequence and a tag sequence, which is ``None``
+    Yields:
+        a pair of a word sequence and a tag sequence, which is ``None``
         in case ``read_only_words = True``
     """
-    answer, curr_word_sent, curr_tag_sent = [], [], []
+    curr_word_sent, curr_tag_sent = [], []
     if from_words:
         word_column, read_only_words = 0, True
     with open(infile, "r", encoding="utf8") as fin:
@@ -62,10 +56,8 @@ def read_infile(infile: Union[Path, str], from_words=False,
                 if len(curr_word_sent) > 0:
                     if read_only_words:
                         curr_tag_sent = None
-                    answer.append((curr_word_sent, curr_tag_sent))
+                    yield curr_word_sent, curr_tag_sent
                 curr_tag_sent, curr_word_sent = [], []
-                if len(answer) == max_sents:
-                    break
                 continue
             splitted = line.split("\t")
             index = splitted[0]
@@ -79,8 +71,30 @@ def read_infile(infile: Union[Path, str], from_words=False,
         if len(curr_word_sent) > 0:
             if read_only_words:
                 curr_tag_sent = None
-            answer.append((curr_word_sent, curr_tag_sent))
-    return answer
+            yield curr_word_sent, curr_tag_sent
+
+
+def read_infile(infile: Union[Path, str], from_words=False,
+                word_column: int = WORD_COLUMN, pos_column: int = POS_COLUMN,
+                tag_column: int = TAG_COLUMN, max_sents: int = -1,
+                read_only_words: bool = False) -> List[Tuple[List, Union[List, None]]]:
+    """Reads input file in CONLL-U format
+
+    Args:
+        infile: a path to a file
+        word_column: column containing words (default=1)
+        pos_column: column containing part-of-speech labels (default=3)
+        tag_column: column containing fine-grained tags (default=5)
+        max_sents: maximal number of sents to read
+        read_only_words: whether to read only words
+
+    Returns:
+        a list of sentences. Each item contains a word sequence and a tag sequence, which is ``None``
+        in case ``read_only_words = True``
+    """
+    sents = iter_infile(infile, from_words=from_words, word_column=word_column, pos_column=pos_column,
+                        tag_column=tag_column, read_only_words=read_only_words)
+    return list(islice(sents, max_sents if max_sents > 0 else None))
 
 
 @register('morphotagger_dataset_reader')
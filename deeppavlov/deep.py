@@ -16,18 +16,8 @@ limitations under the License.
 
 import argparse
 
-from deeppavlov.core.commands.train import train_evaluate_model_from_config
-from deeppavlov.core.commands.infer import interact_model, predict_on_stream
 from deeppavlov.core.common.file import find_config
 from deeppavlov.core.common.log import get_logger
-from deeppavlov.download import deep_download
-from deeppavlov.core.common.cross_validation import calc_cv_score
-from utils.alice import start_alice_server
-from utils.telegram_utils.telegram_ui import interact_model_by_telegram
-from utils.server_utils.server import start_model_server
-from utils.ms_bot_framework_utils.server import run_ms_bf_default_agent
-from utils.alexa.server import run_alexa_default_agent
-from utils.pip_wrapper import install_from_config
 
 
 log = get_logger(__name__)
@@ -45,6 +35,7 @@ parser.add_argument("--recursive", action="store_true", help="Train nested confi
 parser.add_argument("-b", "--batch-size", dest="batch_size", default=1, help="inference batch size", type=int)
 parser.add_argument("-f", "--input-file", dest="file_path", default=None, help="Path to the input file", type=str)
 parser.add_argument("-d", "--download", action="store_true", help="download model components")
+parser.add_argument("--profile", action="store_true", help="collect per-component timings in predict and riseapi modes")
 
 parser.add_argument("--folds", help="number of folds", type=int, default=5)
 
@@ -74,6 +65,7 @@ def main():
     ssl_cert = args.cert
 
     if args.download or args.mode == 'download':
+        from deeppavlov.download import deep_download
         deep_download(pipeline_config_path)
 
     multi_instance = args.multi_instance
@@ -82,17 +74,22 @@ def main():
     start_epoch_num = args.start_epoch_num
 
     if args.mode == 'train':
+        from deeppavlov.core.commands.train import train_evaluate_model_from_config
         train_evaluate_model_from_config(pipeline_config_path, recursive=args.recursive, 
                                          start_epoch_num=start_epoch_num)
     elif args.mode == 'evaluate':
+        from deeppavlov.core.commands.train import train_evaluate_model_from_config
         train_evaluate_model_from_config(pipeline_config_path, to_train=False, to_validate=False,
                                          start_epoch_num=start_epoch_num)
     elif args.mode == 'interact':
+        from deeppavlov.core.commands.infer import interact_model
         interact_model(pipeline_config_path)
     elif args.mode == 'interactbot':
+        from utils.telegram_utils.telegram_ui import interact_model_by_telegram
         token = args.token
         interact_model_by_telegram(pipeline_config_path, token)
     elif args.mode == 'interactmsbot':
+        from utils.ms_bot_framework_utils.server import run_ms_bf_default_agent
         ms_id = args.ms_id
         ms_secret = args.ms_secret
         run_ms_bf_default_agent(model_config=pipeline_config_path,
@@ -102,6 +99,7 @@ def main():
                                 stateful=stateful,
                                 port=args.port)
     elif args.mode == 'alexa':
+        from utils.alexa.server import run_alexa_default_agent
         run_alexa_default_agent(model_config=pipeline_config_path,
                                 multi_instance=multi_instance,
                                 stateful=stateful,
@@ -112,17 +110,22 @@ def main():
     elif args.mode == 'riseapi':
         alice = args.api_mode == 'alice'
         if alice:
+            from utils.alice import start_alice_server
             start_alice_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port)
         else:
-            start_model_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port)
+            from utils.server_utils.server import start_model_server
+            start_model_server(pipeline_config_path, https, ssl_key, ssl_cert, port=args.port, profile=args.profile)
     elif args.mode == 'predict':
-        predict_on_stream(pipeline_config_path, args.batch_size, args.file_path)
+        from deeppavlov.core.commands.infer import predict_on_stream
+        predict_on_stream(pipeline_config_path, args.batch_size, args.file_path, profile=args.profile)
     elif args.mode == 'install':
+        from utils.pip_wrapper import install_from_config
         install_from_config(pipeline_config_path)
     elif args.mode == 'crossval':
         if args.folds < 2:
             log.error('Minimum number of Folds is 2')
         else:
+            from deeppavlov.core.common.cross_validation import calc_cv_score
             n_folds = args.folds
             calc_cv_score(pipeline_config_path, n_folds=n_folds, is_loo=False)
 
@@ -18,7 +18,10 @@ import argparse
 import sys
 import os
 import json
+import time
+from queue import Queue
 from subprocess import Popen
+from threading import Thread
 
 import pandas as pd
 
@@ -50,6 +53,9 @@ parser.add_argument('--path_to_population',
 parser.add_argument('--elitism_with_weights',
                     help='whether to save elite models with weights or without', action='store_true')
 parser.add_argument('--iterations', help='Number of iterations', type=int, default=-1)
+parser.add_argument('--cpu_slots', help='number of models trained simultaneously on CPU', type=int, default=1)
+parser.add_argument('--threads_per_model', help='number of threads used by each model trained on CPU, '
+                                                'all cores are divided between slots by default', type=int, default=0)
 
 
 def main():
@@ -64,6 +70,8 @@ def main():
     path_to_population = args.path_to_population
     elitism_with_weights = args.elitism_with_weights
     iterations = int(args.iterations)
+    cpu_slots = args.cpu_slots
+    threads_per_model = args.threads_per_model
 
     p_crossover = args.p_cross
     pow_crossover = args.pow_cross
@@ -120,6 +128,8 @@ def main():
         result_table_dict[el + "_test"] = []
         result_table_columns.extend([el + "_valid", el + "_test"])
 
+    result_table_dict["runtime"] = []
+    result_table_columns.append("runtime")
     result_table_dict["params"] = []
     result_table_columns.append("params")
 
@@ -148,9 +158,9 @@ def main():
 
             population.append(config)
 
-    run_population(population, evolution, gpus)
+    runtimes = run_population(population, evolution, gpus, cpu_slots, threads_per_model)
     population_scores = results_to_table(population, evolution, considered_metrics,
-                                         result_file, result_table_columns)[evolve_metric]
+                                         result_file, result_table_columns, runtimes)[evolve_metric]
     log.info("Population scores: {}".format(population_scores))
     log.info("Iteration #{} was done".format(iters))
     iters += 1
@@ -161,63 +171,92 @@ def main():
             break
         log.info("Iteration #{} starts".format(iters))
         population = evolution.next_generation(population, population_scores, iters)
-        run_population(population, evolution, gpus)
+        runtimes = run_population(population, evolution, gpus, cpu_slots, threads_per_model)
         population_scores = results_to_table(population, evolution, considered_metrics,
-                                             result_file, result_table_columns)[evolve_metric]
+                                             result_file, result_table_columns, runtimes)[evolve_metric]
         log.info("Population scores: {}".format(population_scores))
         log.info("Iteration #{} was done".format(iters))
         iters += 1
 
 
-def run_population(population, evolution, gpus):
+THREADS_ENV_VARIABLES = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS']
+
+
+def run_population(population, evolution, gpus, cpu_slots=1, threads_per_model=0):
     """
     Change save and load paths for obtained population, save config.json with model config,
     run population via current python executor (with which evolve.py already run)
-    and on given devices (-1 means CPU, other integeres - visible for evolve.py GPUs)
+    and on given devices (-1 means CPU, other integeres - visible for evolve.py GPUs).
+    Models are trained by a pool of slots: one slot per GPU or ``cpu_slots`` slots on CPU,
+    the next model starts as soon as any slot is free.
     Args:
         population: list of dictionaries - configs of current population
         evolution: ParamsEvolution
         gpus: list of given devices (list of integers)
+        cpu_slots: number of models trained simultaneously if ``gpus`` is ``[-1]``
+        threads_per_model: number of threads for numerical libraries in every model process,
+            if 0 then on CPU all available cores are divided between slots and on GPUs nothing is set
 
     Returns:
-        None
+        list of training times of population models in seconds
     """
-    population_size = len(population)
-    for k in range(population_size // len(gpus) + 1):
-        procs = []
-        for j in range(len(gpus)):
-            i = k * len(gpus) + j
-            if i < population_size:
-                save_path = expand_path(
-                    evolution.get_value_from_config(parse_config(population[i]),
-                                                    evolution.path_to_models_save_path))
-
-                save_path.mkdir(parents=True, exist_ok=True)
-                f_name = save_path / "config.json"
-                save_json(population[i], f_name)
-
-                with save_path.joinpath('out.txt').open('w', encoding='utf8') as outlog,\
-                        save_path.joinpath('err.txt').open('w', encoding='utf8') as errlog:
-                    env = dict(os.environ)
-                    if len(gpus) > 1 or gpus[0] != -1:
-                        env['CUDA_VISIBLE_DEVICES'] = str(gpus[j])
-
-                    procs.append(Popen("{} -m deeppavlov train {}".format(sys.executable, str(f_name)),
-                                       shell=True, stdout=outlog, stderr=errlog, env=env))
-        for j, proc in enumerate(procs):
-            i = k * len(gpus) + j
-            log.info(f'Waiting on {i}th proc')
-            if proc.wait() != 0:
-                save_path = expand_path(
-                    evolution.get_value_from_config(parse_config(population[i]),
-                                                    evolution.path_to_models_save_path))
-                with save_path.joinpath('err.txt').open(encoding='utf8') as errlog:
-                    log.warning(f'Population {i} returned an error code {proc.returncode} and an error log:\n' +
-                                errlog.read())
-    return None
-
-
-def results_to_table(population, evolution, considered_metrics, result_file, result_table_columns):
+    on_cpu = gpus == [-1]
+    devices = [-1] * max(cpu_slots, 1) if on_cpu else gpus
+    if not threads_per_model and on_cpu and len(devices) > 1:
+        threads_per_model = max((os.cpu_count() or 1) // len(devices), 1)
+
+    free_devices = Queue()
+    for device in devices:
+        free_devices.put(device)
+
+    runtimes = [None] * len(population)
+    waiters = []
+    for i, config in enumerate(population):
+        save_path = expand_path(
+            evolution.get_value_from_config(parse_config(config),
+                                            evolution.path_to_models_save_path))
+
+        save_path.mkdir(parents=True, exist_ok=True)
+        f_name = save_path / "config.json"
+        save_json(config, f_name)
+
+        env = dict(os.environ)
+        if threads_per_model:
+            for var in THREADS_ENV_VARIABLES:
+                env[var] = str(threads_per_model)
+
+        device = free_devices.get()
+        if not on_cpu:
+            env['CUDA_VISIBLE_DEVICES'] = str(device)
+
+        with save_path.joinpath('out.txt').open('w', encoding='utf8') as outlog,\
+                save_path.joinpath('err.txt').open('w', encoding='utf8') as errlog:
+            log.info(f'Starting {i}th proc')
+            start_time = time.time()
+            proc = Popen("{} -m deeppavlov train {}".format(sys.executable, str(f_name)),
+                         shell=True, stdout=outlog, stderr=errlog, env=env)
+
+        waiter = Thread(target=_wait_model, args=(proc, i, start_time, save_path, device, free_devices, runtimes))
+        waiter.start()
+        waiters.append(waiter)
+
+    for waiter in waiters:
+        waiter.join()
+    return runtimes
+
+
+def _wait_model(proc, i, start_time, save_path, device, free_devices, runtimes):
+    returncode = proc.wait()
+    runtimes[i] = round(time.time() - start_time, 2)
+    free_devices.put(device)
+    log.info(f'{i}th proc finished in {runtimes[i]} seconds')
+    if returncode != 0:
+        with save_path.joinpath('err.txt').open(encoding='utf8') as errlog:
+            log.warning(f'Population {i} returned an error code {returncode} and an error log:\n' +
+                        errlog.read())
+
+
+def results_to_table(population, evolution, considered_metrics, result_file, result_table_columns, runtimes=None):
     population_size = len(population)
     validate_best = evolution.get_value_from_config(evolution.basic_config,
                                                     list(evolution.find_model_path(
@@ -284,6 +323,7 @@ def results_to_table(population, evolution, considered_metrics, result_file, res
             elif test_best:
                 population_metrics[m].append(test_results[m])
 
+        result_table_dict["runtime"] = [runtimes[i] if runtimes else None]
         result_table_dict[result_table_columns[-1]] = [json.dumps(population[i])]
         result_table = pd.DataFrame(result_table_dict)
         result_table.loc[:, result_table_columns].to_csv(result_file, index=False, sep='\t', mode='a', header=None)
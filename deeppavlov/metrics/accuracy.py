@@ -17,7 +17,32 @@ import itertools
 from typing import List, Tuple
 import numpy as np
 
-from deeppavlov.core.common.metrics_registry import register_metric
+from deeppavlov.core.common.metrics_registry import register_metric, MetricAccumulator, metric_accumulator
+
+
+def _ratio(correct: int, examples_len: int) -> float:
+    return correct / examples_len if examples_len else 0
+
+
+class _AccuracyAccumulator(MetricAccumulator):
+    """Sums numbers of correct and all examples returned by ``counts`` over batches."""
+    counts = None
+
+    def __init__(self) -> None:
+        self.correct = 0
+        self.examples_len = 0
+
+    def update(self, y_true, y_predicted) -> None:
+        correct, examples_len = type(self).counts(y_true, y_predicted)
+        self.correct += correct
+        self.examples_len += examples_len
+
+    def result(self) -> float:
+        return _ratio(self.correct, self.examples_len)
+
+
+def _accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
+    return sum([y1 == y2 for y1, y2 in zip(y_true, y_predicted)]), len(y_true)
 
 
 @register_metric('accuracy')
@@ -32,9 +57,16 @@ def accuracy(y_true: [list, np.ndarray], y_predicted: [list, np.ndarray]) -> flo
     Returns:
         portion of absolutely coincidental samples
     """
-    examples_len = len(y_true)
-    correct = sum([y1 == y2 for y1, y2 in zip(y_true, y_predicted)])
-    return correct / examples_len if examples_len else 0
+    return _ratio(*_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(accuracy)
+class AccuracyAccumulator(_AccuracyAccumulator):
+    counts = _accuracy_counts
+
+
+def _sets_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
+    return sum([set(y1) == set(y2) for y1, y2 in zip(y_true, y_predicted)]), len(y_true)
 
 
 @register_metric('sets_accuracy')
@@ -49,45 +81,83 @@ def sets_accuracy(y_true: [list, np.ndarray], y_predicted: [list, np.ndarray]) -
     Returns:
         portion of samples with absolutely coincidental sets of predicted values
     """
-    examples_len = len(y_true)
-    correct = sum([set(y1) == set(y2) for y1, y2 in zip(y_true, y_predicted)])
-    return correct / examples_len if examples_len else 0
+    return _ratio(*_sets_accuracy_counts(y_true, y_predicted))
 
 
-@register_metric('slots_accuracy')
-def slots_accuracy(y_true, y_predicted):
+@metric_accumulator(sets_accuracy)
+class SetsAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _sets_accuracy_counts
+
+
+def _slots_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
     y_true = [{tag.split('-')[-1] for tag in s if tag != 'O'} for s in y_true]
     y_predicted = [set(s.keys()) for s in y_predicted]
-    return accuracy(y_true, y_predicted)
+    return _accuracy_counts(y_true, y_predicted)
 
 
-@register_metric('per_item_accuracy')
-def per_item_accuracy(y_true, y_predicted):
+@register_metric('slots_accuracy')
+def slots_accuracy(y_true, y_predicted):
+    return _ratio(*_slots_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(slots_accuracy)
+class SlotsAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _slots_accuracy_counts
+
+
+def _per_item_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
     if isinstance(y_true[0], (tuple, list)):
         y_true = (y[0] for y in y_true)
     y_true = list(itertools.chain(*y_true))
     y_predicted = itertools.chain(*y_predicted)
-    examples_len = len(y_true)
-    correct = sum([y1 == y2 for y1, y2 in zip(y_true, y_predicted)])
-    return correct / examples_len if examples_len else 0
+    return _accuracy_counts(y_true, y_predicted)
+
+
+@register_metric('per_item_accuracy')
+def per_item_accuracy(y_true, y_predicted):
+    return _ratio(*_per_item_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(per_item_accuracy)
+class PerItemAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _per_item_accuracy_counts
+
+
+def _per_token_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
+    y_true = list(itertools.chain(*y_true))
+    y_predicted = itertools.chain(*y_predicted)
+    return _accuracy_counts(y_true, y_predicted)
 
 
 @register_metric('per_token_accuracy')
 def per_token_accuracy(y_true, y_predicted):
-    y_true = list(itertools.chain(*y_true))
+    return _ratio(*_per_token_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(per_token_accuracy)
+class PerTokenAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _per_token_accuracy_counts
+
+
+def _per_item_dialog_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
+    y_true = [y['text'] for dialog in y_true for y in dialog]
     y_predicted = itertools.chain(*y_predicted)
-    examples_len = len(y_true)
-    correct = sum([y1 == y2 for y1, y2 in zip(y_true, y_predicted)])
-    return correct / examples_len if examples_len else 0
+    return sum([y1.strip().lower() == y2.strip().lower() for y1, y2 in zip(y_true, y_predicted)]), len(y_true)
 
 
 @register_metric('per_item_dialog_accuracy')
 def per_item_dialog_accuracy(y_true, y_predicted):
-    y_true = [y['text'] for dialog in y_true for y in dialog]
-    y_predicted = itertools.chain(*y_predicted)
-    examples_len = len(y_true)
-    correct = sum([y1.strip().lower() == y2.strip().lower() for y1, y2 in zip(y_true, y_predicted)])
-    return correct / examples_len if examples_len else 0
+    return _ratio(*_per_item_dialog_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(per_item_dialog_accuracy)
+class PerItemDialogAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _per_item_dialog_accuracy_counts
+
+
+def _round_accuracy_counts(y_true, y_predicted) -> Tuple[int, int]:
+    predictions = [round(x) for x in y_predicted]
+    return _accuracy_counts(y_true, predictions)
 
 
 @register_metric('acc')
@@ -102,7 +172,9 @@ def round_accuracy(y_true, y_predicted):
     Returns:
         portion of absolutely coincidental samples
     """
-    predictions = [round(x) for x in y_predicted]
-    examples_len = len(y_true)
-    correct = sum([y1 == y2 for y1, y2 in zip(y_true, predictions)])
-    return correct / examples_len if examples_len else 0
+    return _ratio(*_round_accuracy_counts(y_true, y_predicted))
+
+
+@metric_accumulator(round_accuracy)
+class RoundAccuracyAccumulator(_AccuracyAccumulator):
+    counts = _round_accuracy_counts
@@ -13,15 +13,56 @@
 # limitations under the License.
 
 import itertools
-from typing import List, Tuple, Any
+import math
+from collections import Counter
+from fractions import Fraction
+from typing import List, Tuple, Any, Iterable
 
-from nltk.translate.bleu_score import corpus_bleu, sentence_bleu, SmoothingFunction, brevity_penalty, closest_ref_length
+from nltk.translate.bleu_score import corpus_bleu, sentence_bleu, SmoothingFunction, brevity_penalty, \
+    closest_ref_length, modified_precision
 
-from deeppavlov.core.common.metrics_registry import register_metric
-from deeppavlov.metrics.google_bleu import compute_bleu
+from deeppavlov.core.common.metrics_registry import register_metric, MetricAccumulator, metric_accumulator
+from deeppavlov.metrics.google_bleu import compute_bleu, compute_bleu_statistics, bleu_from_statistics
 
 SMOOTH = SmoothingFunction()
 
+CorpusBleuStatistics = Tuple[Counter, Counter, int, int]
+
+
+def _corpus_bleu_statistics(list_of_references: Iterable[List[List[str]]], hypotheses: Iterable[List[str]],
+                            max_order: int = 4) -> CorpusBleuStatistics:
+    """Sums n-gram matches and lengths of hypotheses the same way as :func:`nltk.translate.bleu_score.corpus_bleu`.
+
+    Returns:
+        numerators and denominators of modified precisions by n-gram order, total length of hypotheses and
+        total length of their closest references
+    """
+    p_numerators = Counter()
+    p_denominators = Counter()
+    hyp_lengths, ref_lengths = 0, 0
+    for references, hypothesis in zip(list_of_references, hypotheses):
+        for i in range(1, max_order + 1):
+            p_i = modified_precision(references, hypothesis, i)
+            p_numerators[i] += p_i.numerator
+            p_denominators[i] += p_i.denominator
+        hyp_len = len(hypothesis)
+        hyp_lengths += hyp_len
+        ref_lengths += closest_ref_length(references, hyp_len)
+    return p_numerators, p_denominators, hyp_lengths, ref_lengths
+
+
+def _corpus_bleu_from_statistics(p_numerators: Counter, p_denominators: Counter, hyp_lengths: int, ref_lengths: int,
+                                 weights: Tuple = (0.25, 0.25, 0.25, 0.25)) -> float:
+    """Computes corpus BLEU without smoothing from statistics returned by :func:`_corpus_bleu_statistics`
+    the same way as :func:`nltk.translate.bleu_score.corpus_bleu`."""
+    if p_numerators[1] == 0:
+        return 0
+    bp = brevity_penalty(ref_lengths, hyp_lengths)
+    p_n = [Fraction(p_numerators[i], p_denominators[i]) for i in range(1, len(weights) + 1)]
+    # without smoothing precisions are cut at the first n-gram order with no matches
+    p_n = SMOOTH.method0(p_n, emulate_multibleu=False)
+    return bp * math.exp(math.fsum(w * math.log(p_i) for w, p_i in zip(weights, p_n)))
+
 
 @register_metric('bleu_advanced')
 def bleu_advanced(y_true: List[Any], y_predicted: List[Any],
@@ -78,4 +119,62 @@ def per_item_bleu(y_true, y_predicted):
 def per_item_dialog_bleu(y_true, y_predicted):
     y_true = (y['text'] for dialog in y_true for y in dialog)
     return corpus_bleu([[y_t.lower().split()] for y_t in y_true],
-                       [y_p.lower().split() for y_p in y_predicted])
\ No newline at end of file
+                       [y_p.lower().split() for y_p in y_predicted])
+
+
+class _CorpusBleuAccumulator(MetricAccumulator):
+    """Sums statistics of corpus BLEU with default weights and without smoothing over batches."""
+    def __init__(self) -> None:
+        self.statistics = Counter(), Counter(), 0, 0
+
+    @staticmethod
+    def pairs(y_true, y_predicted) -> Tuple[List[List[List[str]]], List[List[str]]]:
+        """Returns references and hypotheses of examples."""
+        return [[y_t.lower().split()] for y_t in y_true], [y_p.lower().split() for y_p in y_predicted]
+
+    def update(self, y_true, y_predicted) -> None:
+        statistics = _corpus_bleu_statistics(*self.pairs(y_true, y_predicted))
+        self.statistics = tuple(total + value for total, value in zip(self.statistics, statistics))
+
+    def result(self) -> float:
+        return _corpus_bleu_from_statistics(*self.statistics)
+
+
+@metric_accumulator(bleu)
+class BleuAccumulator(_CorpusBleuAccumulator):
+    pass
+
+
+@metric_accumulator(per_item_bleu)
+class PerItemBleuAccumulator(_CorpusBleuAccumulator):
+    @staticmethod
+    def pairs(y_true, y_predicted):
+        return _CorpusBleuAccumulator.pairs(y_true, itertools.chain(*y_predicted))
+
+
+@metric_accumulator(per_item_dialog_bleu)
+class PerItemDialogBleuAccumulator(_CorpusBleuAccumulator):
+    @staticmethod
+    def pairs(y_true, y_predicted):
+        return _CorpusBleuAccumulator.pairs((y['text'] for dialog in y_true for y in dialog), y_predicted)
+
+
+@metric_accumulator(google_bleu)
+class GoogleBleuAccumulator(MetricAccumulator):
+    """Sums statistics of :func:`~deeppavlov.metrics.google_bleu.compute_bleu` over batches."""
+    def __init__(self) -> None:
+        self.statistics = None
+
+    def update(self, y_true, y_predicted) -> None:
+        statistics = compute_bleu_statistics(([y_t.lower().split()] for y_t in y_true),
+                                             (y_p.lower().split() for y_p in y_predicted))
+        if self.statistics is None:
+            self.statistics = statistics
+        else:
+            matches, possible_matches, reference_length, translation_length = self.statistics
+            self.statistics = ([a + b for a, b in zip(matches, statistics[0])],
+                               [a + b for a, b in zip(possible_matches, statistics[1])],
+                               reference_length + statistics[2], translation_length + statistics[3])
+
+    def result(self) -> float:
+        return bleu_from_statistics(*self.statistics)[0]
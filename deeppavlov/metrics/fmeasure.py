@@ -14,12 +14,12 @@
 
 from itertools import chain
 import itertools
-from collections import OrderedDict
+from collections import OrderedDict, Counter
 
 import numpy as np
 from sklearn.metrics import f1_score
 
-from deeppavlov.core.common.metrics_registry import register_metric
+from deeppavlov.core.common.metrics_registry import register_metric, MetricAccumulator, metric_accumulator
 from deeppavlov.core.common.log import get_logger
 
 log = get_logger(__name__)
@@ -96,6 +96,50 @@ def round_f1_weighted(y_true, y_predicted):
     return f1_score(np.array(y_true), np.array(predictions), average="weighted")
 
 
+def _hashable(value):
+    if isinstance(value, np.ndarray):
+        return tuple(value.tolist())
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+class _F1Accumulator(MetricAccumulator):
+    """Counts pairs of true and rounded predicted values, F1 measure is calculated on distinct pairs weighted
+    by their counts, which is equal to calculating it on all pairs."""
+    average = 'binary'
+
+    def __init__(self) -> None:
+        self.pairs = Counter()
+
+    def update(self, y_true, y_predicted) -> None:
+        try:
+            predictions = [np.round(x) for x in y_predicted]
+        except TypeError:
+            predictions = y_predicted
+        self.pairs.update(zip(map(_hashable, y_true), map(_hashable, predictions)))
+
+    def result(self) -> float:
+        pairs = list(self.pairs)
+        return f1_score(np.array([y_t for y_t, _ in pairs]), np.array([y_p for _, y_p in pairs]),
+                        average=self.average, sample_weight=[self.pairs[pair] for pair in pairs])
+
+
+@metric_accumulator(round_f1)
+class F1Accumulator(_F1Accumulator):
+    average = 'binary'
+
+
+@metric_accumulator(round_f1_macro)
+class F1MacroAccumulator(_F1Accumulator):
+    average = 'macro'
+
+
+@metric_accumulator(round_f1_weighted)
+class F1WeightedAccumulator(_F1Accumulator):
+    average = 'weighted'
+
+
 def chunk_finder(current_token, previous_token, tag):
     current_tag = current_token.split('-', 1)[-1]
     previous_tag = previous_token.split('-', 1)[-1]
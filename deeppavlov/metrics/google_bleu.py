@@ -45,9 +45,8 @@ def _get_ngrams(segment, max_order):
   return ngram_counts
 
 
-def compute_bleu(reference_corpus, translation_corpus, max_order=4,
-                 smooth=False):
-  """Computes BLEU score of translated segments against one or more references.
+def compute_bleu_statistics(reference_corpus, translation_corpus, max_order=4):
+  """Counts n-gram matches and lengths of translated segments, which are summed over the corpus.
 
   Args:
     reference_corpus: list of lists of references for each translation. Each
@@ -55,11 +54,10 @@ def compute_bleu(reference_corpus, translation_corpus, max_order=4,
     translation_corpus: list of translations to score. Each translation
         should be tokenized into a list of tokens.
     max_order: Maximum n-gram order to use when computing BLEU score.
-    smooth: Whether or not to apply Lin et al. 2004 smoothing.
 
   Returns:
-    3-Tuple with the BLEU score, n-gram precisions, geometric mean of n-gram
-    precisions and brevity penalty.
+    4-Tuple with numbers of matched n-grams by order, numbers of n-grams in
+    translations by order, reference length and translation length.
   """
   matches_by_order = [0] * max_order
   possible_matches_by_order = [0] * max_order
@@ -82,6 +80,26 @@ def compute_bleu(reference_corpus, translation_corpus, max_order=4,
       if possible_matches > 0:
         possible_matches_by_order[order-1] += possible_matches
 
+  return (matches_by_order, possible_matches_by_order, reference_length,
+          translation_length)
+
+
+def bleu_from_statistics(matches_by_order, possible_matches_by_order,
+                         reference_length, translation_length, smooth=False):
+  """Computes BLEU score from statistics returned by compute_bleu_statistics.
+
+  Args:
+    matches_by_order: numbers of matched n-grams by order.
+    possible_matches_by_order: numbers of n-grams in translations by order.
+    reference_length: total length of references.
+    translation_length: total length of translations.
+    smooth: Whether or not to apply Lin et al. 2004 smoothing.
+
+  Returns:
+    3-Tuple with the BLEU score, n-gram precisions, geometric mean of n-gram
+    precisions and brevity penalty.
+  """
+  max_order = len(matches_by_order)
   precisions = [0] * max_order
   for i in range(0, max_order):
     if smooth:
@@ -110,3 +128,24 @@ def compute_bleu(reference_corpus, translation_corpus, max_order=4,
   bleu = geo_mean * bp
 
   return (bleu, precisions, bp, ratio, translation_length, reference_length)
+
+
+def compute_bleu(reference_corpus, translation_corpus, max_order=4,
+                 smooth=False):
+  """Computes BLEU score of translated segments against one or more references.
+
+  Args:
+    reference_corpus: list of lists of references for each translation. Each
+        reference should be tokenized into a list of tokens.
+    translation_corpus: list of translations to score. Each translation
+        should be tokenized into a list of tokens.
+    max_order: Maximum n-gram order to use when computing BLEU score.
+    smooth: Whether or not to apply Lin et al. 2004 smoothing.
+
+  Returns:
+    3-Tuple with the BLEU score, n-gram precisions, geometric mean of n-gram
+    precisions and brevity penalty.
+  """
+  statistics = compute_bleu_statistics(reference_corpus, translation_corpus,
+                                       max_order)
+  return bleu_from_statistics(*statistics, smooth=smooth)
@@ -17,7 +17,18 @@ from typing import List
 
 import numpy as np
 
-from deeppavlov.core.common.metrics_registry import register_metric
+from deeppavlov.core.common.metrics_registry import register_metric, MetricAccumulator, metric_accumulator
+
+
+def _recall_at_k_correct(y_pred: List[List[np.ndarray]], k: int) -> int:
+    predictions = np.array(y_pred)
+    predictions = np.flip(np.argsort(predictions, -1), -1)[:, :k]
+    num_correct = 0
+    for el in predictions:
+        if 0 in el:
+            num_correct += 1
+    return num_correct
+
 
 def recall_at_k(y_true: List[int], y_pred: List[List[np.ndarray]], k: int):
     """
@@ -33,13 +44,24 @@ def recall_at_k(y_true: List[int], y_pred: List[List[np.ndarray]], k: int):
         Recall at k
     """
     num_examples = float(len(y_pred))
-    predictions = np.array(y_pred)
-    predictions = np.flip(np.argsort(predictions, -1), -1)[:, :k]
-    num_correct = 0
-    for el in predictions:
-        if 0 in el:
-            num_correct += 1
-    return float(num_correct) / num_examples
+    return float(_recall_at_k_correct(y_pred, k)) / num_examples
+
+
+class RecallAtKAccumulator(MetricAccumulator):
+    """Streaming version of :func:`recall_at_k`."""
+    k = None
+
+    def __init__(self) -> None:
+        self.num_correct = 0
+        self.num_examples = 0
+
+    def update(self, y_true, y_pred) -> None:
+        self.num_correct += _recall_at_k_correct(y_pred, self.k)
+        self.num_examples += len(y_pred)
+
+    def result(self) -> float:
+        return float(self.num_correct) / float(self.num_examples)
+
 
 @register_metric('r@1')
 def r_at_1(y_true, y_pred):
@@ -55,6 +77,27 @@ def r_at_2(y_true, y_pred):
 def r_at_5(labels, predictions):
     return recall_at_k(labels, predictions, k=5)
 
+
 @register_metric('r@10')
 def r_at_10(labels, predictions):
     return recall_at_k(labels, predictions, k=10)
+
+
+@metric_accumulator(r_at_1)
+class RAt1Accumulator(RecallAtKAccumulator):
+    k = 1
+
+
+@metric_accumulator(r_at_2)
+class RAt2Accumulator(RecallAtKAccumulator):
+    k = 2
+
+
+@metric_accumulator(r_at_5)
+class RAt5Accumulator(RecallAtKAccumulator):
+    k = 5
+
+
+@metric_accumulator(r_at_10)
+class RAt10Accumulator(RecallAtKAccumulator):
+    k = 10
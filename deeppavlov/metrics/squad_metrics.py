@@ -17,7 +17,7 @@ import string
 from collections import Counter
 from typing import List
 
-from deeppavlov.core.common.metrics_registry import register_metric
+from deeppavlov.core.common.metrics_registry import register_metric, MetricAccumulator, metric_accumulator
 
 
 @register_metric('exact_match')
@@ -35,9 +35,7 @@ def exact_match(y_true: List[List[str]], y_predicted: List[str]) -> float:
     Returns:
         exact match score : float
     """
-    EM_total = sum(normalize_answer(prediction) in map(normalize_answer, ground_truth)
-                   for ground_truth, prediction in zip(y_true, y_predicted))
-    return 100 * EM_total / len(y_true) if len(y_true) > 0 else 0
+    return _percent(_exact_match_total(y_true, y_predicted), len(y_true))
 
 
 @register_metric('squad_f1')
@@ -54,6 +52,35 @@ def squad_f1(y_true: List[List[str]], y_predicted: List[str]) -> float:
     Returns:
         F-1 score : float
     """
+    return _percent(_squad_f1_total(y_true, y_predicted), len(y_true))
+
+
+class _SquadAccumulator(MetricAccumulator):
+    """Sums per example scores returned by ``total`` over batches."""
+    total = None
+
+    def __init__(self) -> None:
+        self.score_total = 0
+        self.examples_len = 0
+
+    def update(self, y_true: List[List[str]], y_predicted: List[str]) -> None:
+        self.score_total += type(self).total(y_true, y_predicted)
+        self.examples_len += len(y_true)
+
+    def result(self) -> float:
+        return _percent(self.score_total, self.examples_len)
+
+
+def _percent(total: float, examples_len: int) -> float:
+    return 100 * total / examples_len if examples_len > 0 else 0
+
+
+def _exact_match_total(y_true: List[List[str]], y_predicted: List[str]) -> int:
+    return sum(normalize_answer(prediction) in map(normalize_answer, ground_truth)
+               for ground_truth, prediction in zip(y_true, y_predicted))
+
+
+def _squad_f1_total(y_true: List[List[str]], y_predicted: List[str]) -> float:
     f1_total = 0.0
     for ground_truth, prediction in zip(y_true, y_predicted):
         prediction_tokens = normalize_answer(prediction).split()
@@ -73,7 +100,17 @@ def squad_f1(y_true: List[List[str]], y_predicted: List[str]) -> float:
             f1 = (2 * precision * recall) / (precision + recall)
             f1s.append(f1)
         f1_total += max(f1s)
-    return 100 * f1_total / len(y_true) if len(y_true) > 0 else 0
+    return f1_total
+
+
+@metric_accumulator(exact_match)
+class ExactMatchAccumulator(_SquadAccumulator):
+    total = _exact_match_total
+
+
+@metric_accumulator(squad_f1)
+class SquadF1Accumulator(_SquadAccumulator):
+    total = _squad_f1_total
 
 
 def normalize_answer(s: str) -> str:
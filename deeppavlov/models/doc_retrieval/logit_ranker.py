@@ -25,13 +25,16 @@ logger = get_logger(__name__)
 
 @register("logit_ranker")
 class LogitRanker(Component):
-    """Select best answer using squad model logits. Make several batches for a single batch, send each batch
-     to the squad model separately and get a single best answer for each batch.
+    """Select best answer using squad model logits. (context, question) pairs of all the questions in a batch
+     are packed into full batches of :attr:`batch_size`, sent to the squad model and the results are gathered
+     back to get a single best answer for each question.
 
      Args:
         squad_model: a loaded squad model
         batch_size: batch size to use with squad model
         sort_noans: whether to downgrade noans tokens in the most possible answers
+        sort_by_length: whether to pack contexts of similar lengths into the same squad model batches,
+         so less padding is processed
 
      Attributes:
         squad_model: a loaded squad model
@@ -40,10 +43,11 @@ class LogitRanker(Component):
     """
 
     def __init__(self, squad_model: Union[Chainer, Component], batch_size: int = 50,
-                 sort_noans: bool = False, **kwargs):
+                 sort_noans: bool = False, sort_by_length: bool = False, **kwargs):
         self.squad_model = squad_model
         self.batch_size = batch_size
         self.sort_noans = sort_noans
+        self.sort_by_length = sort_by_length
 
     def __call__(self, contexts_batch: List[List[str]], questions_batch: List[List[str]]) -> List[str]:
         """
@@ -58,14 +62,20 @@ class LogitRanker(Component):
 
         """
 
+        pairs = [(i, j) for i, contexts in enumerate(contexts_batch) for j in range(len(contexts))]
+        if self.sort_by_length:
+            pairs.sort(key=lambda pair: len(contexts_batch[pair[0]][pair[1]]))
+
+        batch_results = [[None] * len(contexts) for contexts in contexts_batch]
+        for k in range(0, len(pairs), self.batch_size):
+            chunk = pairs[k: k + self.batch_size]
+            c_batch = [contexts_batch[i][j] for i, j in chunk]
+            q_batch = [questions_batch[i][j] for i, j in chunk]
+            for (i, j), result in zip(chunk, zip(*self.squad_model(c_batch, q_batch))):
+                batch_results[i][j] = result
+
         batch_best_answers = []
-        for contexts, questions in zip(contexts_batch, questions_batch):
-            results = []
-            for i in range(0, len(contexts), self.batch_size):
-                c_batch = contexts[i: i + self.batch_size]
-                q_batch = questions[i: i + self.batch_size]
-                batch_predict = zip(*self.squad_model(c_batch, q_batch))
-                results += batch_predict
+        for results in batch_results:
             if self.sort_noans:
                 results = sorted(results, key=lambda x: (x[0] != '', x[2]), reverse=True)
             else:
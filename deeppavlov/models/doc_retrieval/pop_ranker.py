@@ -13,7 +13,6 @@
 # limitations under the License.
 
 from typing import List, Any, Tuple
-from operator import itemgetter
 
 import numpy as np
 from sklearn.externals import joblib
@@ -79,25 +78,33 @@ class PopRanker(Component):
             top doc ids of pop ranker and their corresponding scores
 
         """
+        lengths = [len(instance_ids) for instance_ids in input_doc_ids]
+        if not sum(lengths):
+            return [[] for _ in lengths], [[] for _ in lengths]
+
+        scores = np.fromiter((score for instance_scores in input_doc_scores for score in instance_scores),
+                             dtype=float, count=sum(lengths))
+        pops = np.fromiter((self.pop_dict.get(idx, self.mean_pop) for instance_ids in input_doc_ids
+                            for idx in instance_ids), dtype=float, count=sum(lengths))
+        features = np.stack([scores, pops, scores * pops], axis=1)
+        probas = self.clf.predict_proba(features)[:, 1]
+
+        # pad instances to a matrix to sort all of them at once
+        max_len = max(lengths)
+        padded = np.full((len(lengths), max_len), -np.inf)
+        mask = np.arange(max_len) < np.array(lengths)[:, None]
+        padded[mask] = probas
+        order = np.argsort(-padded, axis=1, kind='mergesort')
+        if self.active:
+            order = order[:, :self.top_n]
+        sorted_probas = padded[np.arange(len(lengths))[:, None], order]
+
         batch_ids = []
         batch_scores = []
-        for instance_ids, instance_scores in zip(input_doc_ids, input_doc_scores):
-            instance_probas = []
-            for idx, score in zip(instance_ids, instance_scores):
-                pop = self.pop_dict.get(idx, self.mean_pop)
-                features = [score, pop, score * pop]
-                prob = self.clf.predict_proba([features])
-                instance_probas.append(prob[0][1])
-
-            sort = sorted(enumerate(instance_probas), key=itemgetter(1), reverse=True)
-            sorted_probas = [item[1] for item in sort]
-            sorted_ids = [instance_ids[item[0]] for item in sort]
-
-            if self.active:
-                sorted_ids = sorted_ids[:self.top_n]
-                sorted_probas = sorted_probas[:self.top_n]
-
-            batch_ids.append(sorted_ids)
-            batch_scores.append(sorted_probas)
+        for instance_ids, instance_order, instance_probas, length in zip(input_doc_ids, order, sorted_probas,
+                                                                          lengths):
+            n = min(length, len(instance_order))
+            batch_ids.append([instance_ids[i] for i in instance_order[:n]])
+            batch_scores.append(instance_probas[:n].tolist())
 
         return batch_ids, batch_scores
@@ -59,25 +59,53 @@ class TfidfRanker(Component):
             a tuple of selected doc ids and their scores
         """
 
+        q_tfidfs = self.vectorizer(questions)
+
+        if not self.active:
+            return self._rank_all(q_tfidfs)
+
         batch_doc_ids, batch_docs_scores = [], []
 
-        q_tfidfs = self.vectorizer(questions)
+        # a single sparse product for the whole batch, only documents sharing terms with a query get nonzero scores
+        scores = q_tfidfs * self.vectorizer.tfidf_matrix
+        scores.sort_indices()
+        n_docs = self.vectorizer.n_docs
+        thresh = min(self.top_n, n_docs)
+
+        for i in range(scores.shape[0]):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            row_docs = scores.indices[start:end]
+            row_scores = scores.data[start:end] + 0.0001  # add a small value to eliminate zero scores
+
+            if len(row_scores) > thresh:
+                o = np.argpartition(-row_scores, thresh)[0:thresh]
+            else:
+                o = np.arange(len(row_scores))
+            o_sort = o[np.argsort(-row_scores[o])]
+            doc_nums = row_docs[o_sort]
+            doc_scores = row_scores[o_sort]
+
+            if len(doc_nums) < thresh:
+                # pad results with zero score documents as a dense ranking would do
+                padding = np.setdiff1d(np.arange(thresh), doc_nums)[:thresh - len(doc_nums)]
+                doc_nums = np.concatenate([doc_nums, padding])
+                doc_scores = np.concatenate([doc_scores, np.full(len(padding), 0.0001)])
+
+            batch_doc_ids.append([self.vectorizer.index2doc[j] for j in doc_nums])
+            batch_docs_scores.append(doc_scores)
+
+        return batch_doc_ids, batch_docs_scores
+
+    def _rank_all(self, q_tfidfs) -> Tuple[List[Any], List[float]]:
+        """Sort all the documents by their scores for every query."""
+        batch_doc_ids, batch_docs_scores = [], []
 
         for q_tfidf in q_tfidfs:
             scores = q_tfidf * self.vectorizer.tfidf_matrix
             scores = np.squeeze(
                 scores.toarray() + 0.0001)  # add a small value to eliminate zero scores
 
-            if self.active:
-                thresh = self.top_n
-            else:
-                thresh = len(self.vectorizer.doc_index)
-
-            if thresh >= len(scores):
-                o = np.argpartition(-scores, len(scores) - 1)[0:thresh]
-            else:
-                o = np.argpartition(-scores, thresh)[0:thresh]
-            o_sort = o[np.argsort(-scores[o])]
+            o_sort = np.argsort(-scores)
 
             doc_scores = scores[o_sort]
             doc_ids = [self.vectorizer.index2doc[i] for i in o_sort]
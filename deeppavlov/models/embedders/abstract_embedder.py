@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from itertools import chain
 from overrides import overrides
 from typing import List, Union, Iterator
 from pathlib import Path
@@ -21,8 +22,9 @@ import numpy as np
 
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.common.log import get_logger
+from deeppavlov.core.common.lru_cache import LRUCache
 from deeppavlov.core.models.serializable import Serializable
-from deeppavlov.core.data.utils import zero_pad
+from deeppavlov.models.embedders.embeddings_store import EmbeddingsStore
 
 log = get_logger(__name__)
 
@@ -34,27 +36,44 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        mmap: whether to memory-map embeddings converted with
+            :func:`~deeppavlov.models.embedders.embeddings_store.convert` from ``load_path`` directory
+        cache_size: maximum number of embedded tokens to keep in the cache
 
     Attributes:
         model: model instance
-        tok2emb: dictionary with already embedded tokens
+        tok2emb: LRU cache of already embedded tokens, its hit statistics are returned by ``tok2emb.stats()``
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         mean: whether to return one mean embedding vector per sample
+        mmap: whether embeddings are memory-mapped
         load_path: path with pre-trained fastText binary model
     """
-    def __init__(self, load_path: Union[str, Path], pad_zero: bool = False, mean: bool = False, **kwargs) -> None:
+    def __init__(self, load_path: Union[str, Path], pad_zero: bool = False, mean: bool = False, mmap: bool = False,
+                 cache_size: int = 100000, **kwargs) -> None:
         """
         Initialize embedder with given parameters
         """
         super().__init__(save_path=None, load_path=load_path)
-        self.tok2emb = {}
+        self.tok2emb = LRUCache(cache_size)
         self.pad_zero = pad_zero
         self.mean = mean
+        self.mmap = mmap
         self.dim = None
         self.model = None
         self.load()
 
+    def _load_store(self) -> None:
+        """
+        Memory-map embeddings converted to :class:`~deeppavlov.models.embedders.embeddings_store.EmbeddingsStore`
+        format from ``self.load_path``
+        """
+        if not EmbeddingsStore.exists(self.load_path):
+            raise FileNotFoundError(f'{self.load_path} is not a directory with converted embeddings, convert them '
+                                    f'with `python -m deeppavlov.models.embedders.embeddings_store`')
+        self.model = EmbeddingsStore(self.load_path)
+        self.dim = self.model.dim
+
     def destroy(self):
         del self.model
 
@@ -77,10 +96,7 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
         Returns:
             embedded batch
         """
-        batch = [self._encode(sample, mean) for sample in batch]
-        if self.pad_zero:
-            batch = zero_pad(batch)
-        return batch
+        return self._encode_batch(batch, mean, self.pad_zero)
 
     @abstractmethod
     def __iter__(self) -> Iterator[str]:
@@ -103,36 +119,92 @@ class Embedder(Component, Serializable, metaclass=ABCMeta):
             embedding vector
         """
 
-    def _encode(self, tokens: List[str], mean: bool) -> Union[List[np.ndarray], np.ndarray]:
+    def _get_word_vectors(self, tokens: List[str]) -> np.ndarray:
         """
-        Embed one text sample
+        Embed several words at once, words missing from ``self.model`` are embedded with zeros
 
         Args:
-            tokens: tokenized text sample
-            mean: whether to return mean embedding of tokens per sample
+            tokens: list of words
 
         Returns:
-            list of embedded tokens or array of mean values
+            matrix of embedding vectors
         """
-        embedded_tokens = []
-        for t in tokens:
+        if self.mmap:
+            return self.model.get_vectors(tokens)[0]
+        vectors = np.zeros((len(tokens), self.dim), dtype=np.float32)
+        for i, t in enumerate(tokens):
             try:
-                emb = self.tok2emb[t]
+                vectors[i] = self._get_word_vector(t)
             except KeyError:
-                try:
-                    emb = self._get_word_vector(t)
-                except KeyError:
-                    emb = np.zeros(self.dim, dtype=np.float32)
-                self.tok2emb[t] = emb
-            embedded_tokens.append(emb)
+                pass
+        return vectors
+
+    def _embed_batch(self, batch: List[List[str]]) -> np.ndarray:
+        """
+        Embed tokens of the batch looking up every distinct token not found in ``self.tok2emb`` only once
 
+        Args:
+            batch: list of tokenized text samples
+
+        Returns:
+            array of embedded tokens of shape ``[batch_size, max_len, dim]`` padded with zeros
+        """
+        lengths = np.array([len(sample) for sample in batch], dtype=np.int64)
+        embedded = np.zeros((len(batch), lengths.max() if len(batch) else 0, self.dim), dtype=np.float32)
+        if not lengths.sum():
+            return embedded
+
+        found, missing = self.tok2emb.get_many(chain.from_iterable(batch))
+        if missing:
+            new = dict(zip(missing, self._get_word_vectors(missing).copy()))
+            self.tok2emb.update(new)
+            found.update(new)
+
+        index = {t: i for i, t in enumerate(found)}
+        vectors = np.stack(list(found.values()))
+        token_indices = np.array([index[t] for t in chain.from_iterable(batch)], dtype=np.int64)
+        sample_indices = np.repeat(np.arange(len(batch)), lengths)
+        positions = np.arange(len(token_indices)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        embedded[sample_indices, positions] = vectors[token_indices]
+        return embedded
+
+    def _encode_batch(self, batch: List[List[str]], mean: bool = None,
+                      pad_zero: bool = False) -> Union[List[Union[list, np.ndarray]], np.ndarray]:
+        """
+        Embed text samples of the batch
+
+        Args:
+            batch: list of tokenized text samples
+            mean: whether to return mean embedding of tokens per sample
+            pad_zero: whether to return one array padded with zeros instead of a list of samples
+
+        Returns:
+            embedded batch
+        """
         if mean is None:
             mean = self.mean
 
+        embedded = self._embed_batch(batch)
+
         if mean:
-            filtered = [et for et in embedded_tokens if np.any(et)]
-            if filtered:
-                return np.mean(filtered, axis=0)
-            return np.zeros(self.dim, dtype=np.float32)
+            # tokens without embeddings are not averaged, padding is zero as well
+            counts = embedded.any(axis=2).sum(axis=1, keepdims=True)
+            means = embedded.sum(axis=1) / np.maximum(counts, 1)
+            return means if pad_zero else list(means)
+
+        if pad_zero:
+            return embedded
+        return [list(sample[:len(tokens)]) for sample, tokens in zip(embedded, batch)]
+
+    def _encode(self, tokens: List[str], mean: bool) -> Union[List[np.ndarray], np.ndarray]:
+        """
+        Embed one text sample
 
-        return embedded_tokens
+        Args:
+            tokens: tokenized text sample
+            mean: whether to return mean embedding of tokens per sample
+
+        Returns:
+            list of embedded tokens or array of mean values
+        """
+        return self._encode_batch([tokens], mean)[0]
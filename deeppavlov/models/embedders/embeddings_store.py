@@ -0,0 +1,225 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import zlib
+from pathlib import Path
+from typing import Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from deeppavlov.core.commands.utils import expand_path
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+VECTORS_FILENAME = 'vectors.npy'
+TOKENS_FILENAME = 'tokens.bin'
+OFFSETS_FILENAME = 'offsets.npy'
+TABLE_FILENAME = 'table.npy'
+META_FILENAME = 'meta.json'
+
+
+def _hash(token: bytes) -> int:
+    return zlib.crc32(token)
+
+
+class EmbeddingsStore:
+    """Read-only embeddings matrix and token index memory-mapped from a directory created by :func:`convert`.
+
+    The directory contains the embeddings matrix, UTF-8 encoded tokens with their offsets and an open addressing
+    hash table of row numbers. All of them are memory-mapped, so opening the store takes milliseconds and
+    processes which open the same store share one physical copy of it.
+
+    Args:
+        path: directory with the converted embeddings
+
+    Attributes:
+        vectors: memory-mapped matrix of embeddings, one row per token
+        dim: dimension of embeddings
+    """
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = expand_path(path)
+        self.vectors = np.load(str(self.path / VECTORS_FILENAME), mmap_mode='r')
+        self._offsets = np.load(str(self.path / OFFSETS_FILENAME), mmap_mode='r')
+        self._table = np.load(str(self.path / TABLE_FILENAME), mmap_mode='r')
+        self._tokens = np.memmap(str(self.path / TOKENS_FILENAME), dtype=np.uint8, mode='r') \
+            if self._offsets[-1] > 0 else np.zeros(0, dtype=np.uint8)
+        self._mask = len(self._table) - 1
+        self.dim = self.vectors.shape[1]
+
+    @staticmethod
+    def exists(path: Union[str, Path]) -> bool:
+        """Checks whether the ``path`` is a directory with converted embeddings."""
+        return (expand_path(path) / META_FILENAME).is_file()
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def __getstate__(self) -> dict:
+        return {'path': self.path}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state['path'])
+
+    def _token(self, row: int) -> bytes:
+        return self._tokens[self._offsets[row]:self._offsets[row + 1]].tobytes()
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(len(self)):
+            yield self._token(row).decode('utf8')
+
+    def row(self, token: str) -> int:
+        """Returns the row of the ``token`` embedding or -1 if the token is missing."""
+        token = token.encode('utf8')
+        i = _hash(token) & self._mask
+        while True:
+            row = int(self._table[i])
+            if row < 0 or self._token(row) == token:
+                return row
+            i = (i + 1) & self._mask
+
+    def rows(self, tokens: Iterable[str]) -> np.ndarray:
+        """Returns rows of the tokens embeddings, -1 for missing tokens."""
+        return np.array([self.row(token) for token in tokens], dtype=np.int64)
+
+    def __contains__(self, token: str) -> bool:
+        return self.row(token) >= 0
+
+    def __getitem__(self, token: str) -> np.ndarray:
+        row = self.row(token)
+        if row < 0:
+            raise KeyError(token)
+        return np.array(self.vectors[row], dtype=np.float32)
+
+    def get_vectors(self, tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Looks up several tokens at once.
+
+        Returns:
+            float32 matrix of embeddings with zero rows for missing tokens and a boolean mask of found tokens
+        """
+        rows = self.rows(tokens)
+        found = rows >= 0
+        result = np.zeros((len(rows), self.dim), dtype=np.float32)
+        if found.any():
+            # reading memory-mapped rows in ascending order is faster
+            order = np.argsort(rows[found], kind='mergesort')
+            result[np.flatnonzero(found)[order]] = self.vectors[rows[found][order]]
+        return result, found
+
+
+def _read_word2vec_text(path: Path) -> Iterator[Tuple[str, np.ndarray]]:
+    with path.open(encoding='utf8', errors='replace') as f:
+        for i, line in enumerate(f):
+            parts = line.rstrip().split(' ')
+            if i == 0 and len(parts) == 2:
+                # header with the number of words and the dimension
+                continue
+            if len(parts) < 2:
+                continue
+            yield parts[0], np.asarray(parts[1:], dtype=np.float32)
+
+
+def _read_fasttext_binary(path: Path) -> Iterator[Tuple[str, np.ndarray]]:
+    import fastText
+    model = fastText.load_model(str(path))
+    for word in model.get_words():
+        yield word, model.get_word_vector(word)
+
+
+def convert(src_path: Union[str, Path], dst_path: Union[str, Path], input_format: str = 'word2vec',
+            dtype: str = 'float32') -> None:
+    """Converts embeddings to the format memory-mapped by :class:`EmbeddingsStore`.
+
+    Args:
+        src_path: word2vec (GloVe) text file with an optional header or fastText binary model
+        dst_path: directory to write converted embeddings to
+        input_format: ``'word2vec'`` or ``'fasttext'``, only vocabulary words are converted from fastText models
+        dtype: ``'float32'`` or ``'float16'`` type of the stored embeddings
+    """
+    readers = {'word2vec': _read_word2vec_text, 'fasttext': _read_fasttext_binary}
+    if input_format not in readers:
+        raise ValueError(f'Unknown embeddings format {input_format}, use one of {list(readers)}')
+    if dtype not in ('float32', 'float16'):
+        raise ValueError(f'Unsupported embeddings type {dtype}, use float32 or float16')
+
+    src_path, dst_path = expand_path(src_path), expand_path(dst_path)
+    dst_path.mkdir(parents=True, exist_ok=True)
+    log.info(f'[converting embeddings from `{src_path}` to `{dst_path}`]')
+
+    # vectors are written to a raw file first, so that the whole matrix is never kept in memory
+    raw_path = dst_path / f'{VECTORS_FILENAME}.tmp'
+    tokens, seen, dim = [], set(), None
+    with raw_path.open('wb') as f:
+        for token, vector in readers[input_format](src_path):
+            token = token.encode('utf8')
+            if token in seen:
+                continue
+            if dim is None:
+                dim = len(vector)
+            elif len(vector) != dim:
+                log.warning(f'Skipping embedding of {token} of dimension {len(vector)} instead of {dim}')
+                continue
+            seen.add(token)
+            tokens.append(token)
+            vector.astype(dtype).tofile(f)
+    del seen
+    if not tokens:
+        raw_path.unlink()
+        raise ValueError(f'No embeddings found in {src_path}')
+
+    raw = np.memmap(str(raw_path), dtype=dtype, mode='r', shape=(len(tokens), dim))
+    matrix = np.lib.format.open_memmap(str(dst_path / VECTORS_FILENAME), mode='w+', dtype=dtype,
+                                       shape=(len(tokens), dim))
+    chunk_size = 100000
+    for start in range(0, len(tokens), chunk_size):
+        matrix[start:start + chunk_size] = raw[start:start + chunk_size]
+    matrix.flush()
+    del matrix, raw
+    raw_path.unlink()
+
+    offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(token) for token in tokens])
+    np.save(str(dst_path / OFFSETS_FILENAME), offsets)
+    with (dst_path / TOKENS_FILENAME).open('wb') as f:
+        for token in tokens:
+            f.write(token)
+
+    # load factor is kept not greater than 0.5 to make probe sequences short
+    table_size = 1 << max(2 * len(tokens) - 1, 1).bit_length()
+    table = np.full(table_size, -1, dtype=np.int64)
+    mask = table_size - 1
+    for row, token in enumerate(tokens):
+        i = _hash(token) & mask
+        while table[i] >= 0:
+            i = (i + 1) & mask
+        table[i] = row
+    np.save(str(dst_path / TABLE_FILENAME), table)
+
+    with (dst_path / META_FILENAME).open('w') as f:
+        json.dump({'n_tokens': len(tokens), 'dtype': dtype, 'source': str(src_path)}, f)
+    log.info(f'[converted {len(tokens)} embeddings]')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert embeddings to the memory-mapped format')
+    parser.add_argument('src_path', help='word2vec text file or fastText binary model')
+    parser.add_argument('dst_path', help='directory to write converted embeddings to')
+    parser.add_argument('-f', '--format', default='word2vec', choices=['word2vec', 'fasttext'],
+                        help='input embeddings format')
+    parser.add_argument('-t', '--dtype', default='float32', choices=['float32', 'float16'],
+                        help='type of stored embeddings')
+    args = parser.parse_args()
+    convert(args.src_path, args.dst_path, args.format, args.dtype)
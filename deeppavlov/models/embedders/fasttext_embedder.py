@@ -33,16 +33,21 @@ class FasttextEmbedder(Embedder):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        mmap: whether to memory-map embeddings converted with
+            :func:`~deeppavlov.models.embedders.embeddings_store.convert` from ``load_path`` directory
+            instead of loading the fastText model, out-of-vocabulary words are embedded with zeros then
 
     Attributes:
-        model: fastText model instance
-        tok2emb: dictionary with already embedded tokens
+        model: fastText model instance or memory-mapped embeddings
+        tok2emb: LRU cache of already embedded tokens
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         load_path: path with pre-trained fastText binary model
     """
 
     def _get_word_vector(self, w: str) -> np.ndarray:
+        if self.mmap:
+            return self.model[w]
         return self.model.get_word_vector(w)
 
     def load(self) -> None:
@@ -50,6 +55,9 @@ class FasttextEmbedder(Embedder):
         Load fastText binary model from self.load_path
         """
         log.info(f"[loading fastText embeddings from `{self.load_path}`]")
+        if self.mmap:
+            self._load_store()
+            return
         self.model = fastText.load_model(str(self.load_path))
         self.dim = self.model.get_dimension()
 
@@ -61,4 +69,7 @@ class FasttextEmbedder(Embedder):
         Returns:
             iterator
         """
-        yield from self.model.get_words()
+        if self.mmap:
+            yield from self.model
+        else:
+            yield from self.model.get_words()
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pickle
-from typing import Iterator
+from typing import Iterator, List
 
 import numpy as np
 from gensim.models import KeyedVectors
@@ -33,10 +33,13 @@ class GloVeEmbedder(Embedder):
     Args:
         load_path: path where to load pre-trained embedding model from
         pad_zero: whether to pad samples or not
+        mmap: whether to memory-map embeddings converted with
+            :func:`~deeppavlov.models.embedders.embeddings_store.convert` from ``load_path`` directory
+            instead of reading the GloVe file
 
     Attributes:
-        model: GloVe model instance
-        tok2emb: dictionary with already embedded tokens
+        model: GloVe model instance or memory-mapped embeddings
+        tok2emb: LRU cache of already embedded tokens
         dim: dimension of embeddings
         pad_zero: whether to pad sequence of tokens with zeros or not
         load_path: path with pre-trained GloVe model
@@ -45,6 +48,15 @@ class GloVeEmbedder(Embedder):
     def _get_word_vector(self, w: str) -> np.ndarray:
         return self.model[w]
 
+    def _get_word_vectors(self, tokens: List[str]) -> np.ndarray:
+        if self.mmap:
+            return super()._get_word_vectors(tokens)
+        rows = np.array([getattr(self.model.vocab.get(t), 'index', -1) for t in tokens], dtype=np.int64)
+        found = rows >= 0
+        vectors = np.zeros((len(tokens), self.dim), dtype=np.float32)
+        vectors[found] = self.model.syn0[rows[found]]
+        return vectors
+
     def load(self) -> None:
         """
         Load dict of embeddings from given file
@@ -53,6 +65,9 @@ class GloVeEmbedder(Embedder):
         if not self.load_path.exists():
             log.warning(f'{self.load_path} does not exist, cannot load embeddings from it!')
             return
+        if self.mmap:
+            self._load_store()
+            return
         self.model = KeyedVectors.load_word2vec_format(str(self.load_path))
         self.dim = self.model.vector_size
 
@@ -64,11 +79,14 @@ class GloVeEmbedder(Embedder):
         Returns:
             iterator
         """
-        yield from self.model.vocab
+        if self.mmap:
+            yield from self.model
+        else:
+            yield from self.model.vocab
 
     def serialize(self) -> bytes:
         return pickle.dumps(self.model)
 
     def deserialize(self, data: bytes) -> None:
         self.model = pickle.loads(data)
-        self.dim = self.model.vector_size
+        self.dim = self.model.dim if self.mmap else self.model.vector_size
@@ -13,8 +13,9 @@
 # limitations under the License.
 
 import re
+import copy
 import collections
-from typing import Dict, Any
+from typing import Dict, Any, List, Hashable, Optional, Tuple
 import json
 import numpy as np
 import tensorflow as tf
@@ -28,6 +29,7 @@ from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.lr_scheduled_tf_model import LRScheduledTFModel
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.common.log import get_logger
+from deeppavlov.core.agent.dialog_store import MemoryDialogStore
 from deeppavlov.models.go_bot.tracker import Tracker
 import deeppavlov.models.go_bot.templates as templ
 
@@ -35,6 +37,33 @@ import deeppavlov.models.go_bot.templates as templ
 log = get_logger(__name__)
 
 
+class DialogState:
+    """
+    State of a single dialogue with :class:`GoalOrientedBot`: everything the bot
+    changes while advancing the dialogue. One bot instance can serve several
+    dialogues by switching between their states, instances can be pickled to save
+    and restore dialogues.
+
+    Parameters:
+        tracker: dialogue state tracker owned by the dialogue.
+        db_result: last database api call result.
+        prev_action: one-hot encoding of the previous bot action.
+        state_c: rnn cell state of shape ``[1, hidden_size]``.
+        state_h: rnn hidden state of shape ``[1, hidden_size]``.
+    """
+    def __init__(self,
+                 tracker: Tracker,
+                 db_result: Optional[dict],
+                 prev_action: np.ndarray,
+                 state_c: np.ndarray,
+                 state_h: np.ndarray) -> None:
+        self.tracker = tracker
+        self.db_result = db_result
+        self.prev_action = prev_action
+        self.state_c = state_c
+        self.state_h = state_h
+
+
 @register("go_bot")
 class GoalOrientedBot(LRScheduledTFModel):
     """
@@ -105,6 +134,16 @@ class GoalOrientedBot(LRScheduledTFModel):
         use_action_mask: if ``True``, network output will be applied with a mask
             over allowed actions.
         debug: whether to display debug output.
+        max_dialog_states: maximum number of kept dialogue states of users, states of
+            least recently active users are dropped first; unlimited if ``None``.
+        dialog_state_ttl: time in seconds after the last utterance of a user when
+            the state of the user's dialogue is dropped; never expires if ``None``.
+
+    If ``user_ids`` are passed to :meth:`__call__` together with a batch of utterances,
+    every utterance advances the dialogue of its user, dialogues of different users
+    are inferred in a single network call. States of such dialogues are kept in
+    ``dialog_states`` until :meth:`reset` is called for the user or they are evicted,
+    :meth:`reset_all` drops states of all users.
     """
 
     GRAPH_PARAMS = ["hidden_size", "action_size", "dense_size", "obs_size",
@@ -135,6 +174,8 @@ class GoalOrientedBot(LRScheduledTFModel):
                  api_call_action: str = None,  # TODO: make it unrequired
                  use_action_mask: bool = False,
                  debug: bool = False,
+                 max_dialog_states: Optional[int] = 10000,
+                 dialog_state_ttl: Optional[float] = None,
                  **kwargs):
         if any(p in network_parameters for p in self.DEPRECATED):
             log.warning(f"parameters {self.DEPRECATED} are deprecated,"
@@ -185,6 +226,8 @@ class GoalOrientedBot(LRScheduledTFModel):
         new_network_parameters.update(network_parameters)
         self._init_network(**new_network_parameters)
 
+        self.dialog_states = MemoryDialogStore(max_size=max_dialog_states, ttl=dialog_state_ttl,
+                                               default_factory=self.new_dialog_state)
         self.reset()
 
     def _init_network(self, hidden_size, action_size, obs_size, dropout_rate,
@@ -475,8 +518,10 @@ class GoalOrientedBot(LRScheduledTFModel):
             db_results = [r for r in db_results if r != self.db_result]
         return db_results[0] if db_results else {}
 
-    def __call__(self, batch):
+    def __call__(self, batch, user_ids=None):
         if isinstance(batch[0], str):
+            if user_ids is not None:
+                return self._infer_users(batch, user_ids)
             res = []
             for x in batch:
                 pred = self._infer(x)
@@ -490,7 +535,113 @@ class GoalOrientedBot(LRScheduledTFModel):
             return res
         return [self._infer_dialog(x) for x in batch]
 
-    def reset(self):
+    def new_dialog_state(self) -> DialogState:
+        """Returns state of a new dialogue."""
+        tracker = copy.deepcopy(self.tracker)
+        tracker.reset_state()
+        return DialogState(tracker=tracker,
+                           db_result=None,
+                           prev_action=np.zeros(self.n_actions, dtype=np.float32),
+                           state_c=np.zeros([1, self.hidden_size], dtype=np.float32),
+                           state_h=np.zeros([1, self.hidden_size], dtype=np.float32))
+
+    def get_dialog_state(self) -> DialogState:
+        """Returns state of the current dialogue."""
+        return DialogState(self.tracker, self.db_result, self.prev_action,
+                           self.state_c, self.state_h)
+
+    def set_dialog_state(self, state: DialogState) -> None:
+        """Makes dialogue with the ``state`` the current one."""
+        self.tracker = state.tracker
+        self.db_result = state.db_result
+        self.prev_action = state.prev_action
+        self.state_c = state.state_c
+        self.state_h = state.state_h
+
+    def _store_dialog_state(self, state: DialogState) -> None:
+        state.__dict__.update(self.get_dialog_state().__dict__)
+
+    def infer_sessions(self, contexts: List[str], states: List[DialogState]) -> List[str]:
+        """
+        Advances several dialogues by one user utterance each, the network is
+        called once for all of them.
+
+        Parameters:
+            contexts: user utterances, one per dialogue.
+            states: states of dialogues, they are updated in place.
+
+        Returns:
+            bot responses, one per dialogue.
+        """
+        current = self.get_dialog_state()
+        try:
+            responses = self._infer_sessions(contexts, states, [None] * len(states))
+            # if made api_call, then respond with next prediction
+            api_calls = [i for i, state in enumerate(states)
+                         if np.argmax(state.prev_action) == self.api_call_id]
+            if api_calls:
+                db_results = []
+                for i in api_calls:
+                    self.set_dialog_state(states[i])
+                    db_results.append(self.make_api_call(self.tracker.get_state()))
+                api_responses = self._infer_sessions([contexts[i] for i in api_calls],
+                                                     [states[i] for i in api_calls],
+                                                     db_results)
+                for i, resp in zip(api_calls, api_responses):
+                    responses[i] = resp
+        finally:
+            self.set_dialog_state(current)
+        return responses
+
+    def _infer_sessions(self, contexts, states, db_results):
+        features, emb_contexts, keys, action_masks = [], [], [], []
+        for context, state, db_result in zip(contexts, states, db_results):
+            self.set_dialog_state(state)
+            if db_result is not None:
+                self.db_result = db_result
+            f, emb_context, key = self._encode_context(context, db_result)
+            features.append([f])
+            emb_contexts.append([emb_context])
+            keys.append([key])
+            action_masks.append([self.calc_action_mask(self.prev_action)])
+            self._store_dialog_state(state)
+
+        probs, state_c, state_h = \
+            self.network_batch_call(features, emb_contexts, keys, action_masks,
+                                    np.vstack([s.state_c for s in states]),
+                                    np.vstack([s.state_h for s in states]))
+
+        responses = []
+        for i, state in enumerate(states):
+            self.set_dialog_state(state)
+            self.state_c, self.state_h = state_c[i:i+1], state_h[i:i+1]
+            pred_id = np.argmax(probs[i])
+            self.prev_action = np.zeros(self.n_actions, dtype=np.float32)
+            self.prev_action[pred_id] = 1
+            responses.append(self._decode_response(pred_id))
+            self._store_dialog_state(state)
+        return responses
+
+    def _infer_users(self, batch: List[str], user_ids: List[Hashable]) -> List[str]:
+        res = [None] * len(batch)
+        pending = list(range(len(batch)))
+        # several utterances of the same user are inferred one after another
+        while pending:
+            step, rest, seen = [], [], set()
+            for i in pending:
+                (rest if user_ids[i] in seen else step).append(i)
+                seen.add(user_ids[i])
+            states = [self.dialog_states[user_ids[i]] for i in step]
+            for i, resp in zip(step, self.infer_sessions([batch[i] for i in step], states)):
+                res[i] = resp
+            pending = rest
+        return res
+
+    def reset(self, user_id: Hashable = None):
+        if user_id is not None:
+            if user_id in self.dialog_states:
+                del self.dialog_states[user_id]
+            return
         self.tracker.reset_state()
         self.db_result = None
         self.prev_action = np.zeros(self.n_actions, dtype=np.float32)
@@ -498,6 +649,11 @@ class GoalOrientedBot(LRScheduledTFModel):
         if self.debug:
             log.debug("Bot reset.")
 
+    def reset_all(self):
+        """Drops dialogue states of all users and resets the current dialogue."""
+        self.dialog_states.clear()
+        self.reset()
+
     def destroy(self):
         if callable(getattr(self.slot_filler, 'destroy', None)):
             self.slot_filler.destroy()
@@ -508,25 +664,45 @@ class GoalOrientedBot(LRScheduledTFModel):
         super().destroy()
 
     def network_call(self, features, emb_context, key, action_mask, prob=False):
+        probs, self.state_c, self.state_h = \
+            self.network_batch_call(features, emb_context, key, action_mask,
+                                    self.state_c, self.state_h)
+        if prob:
+            return np.squeeze(probs)
+        return np.squeeze(np.argmax(probs, axis=-1))
+
+    def network_batch_call(self, features, emb_context, key, action_mask,
+                           state_c, state_h) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Makes one step of several dialogues at once.
+
+        Parameters:
+            features: utterance features of shape ``[batch_size, 1, obs_size]``.
+            emb_context: token embeddings for attention of shape
+                ``[batch_size, 1, max_num_tokens, token_size]``.
+            key: attention keys of shape ``[batch_size, 1, key_size]``.
+            action_mask: masks of allowed actions of shape ``[batch_size, 1, action_size]``.
+            state_c: rnn cell states of shape ``[batch_size, hidden_size]``.
+            state_h: rnn hidden states of shape ``[batch_size, hidden_size]``.
+
+        Returns:
+            action probabilities of shape ``[batch_size, action_size]``
+            and new rnn cell and hidden states.
+        """
         feed_dict = {
             self._features: features,
             self._dropout_keep_prob: 1.,
-            self._utterance_mask: [[1.]],
-            self._initial_state: (self.state_c, self.state_h),
+            self._utterance_mask: np.ones([len(features), 1], dtype=np.float32),
+            self._initial_state: (state_c, state_h),
             self._action_mask: action_mask
         }
         if self.attn:
             feed_dict[self._emb_context] = emb_context
             feed_dict[self._key] = key
 
-        probs, prediction, state =\
-            self.sess.run([self._probs, self._prediction, self._state],
-                          feed_dict=feed_dict)
-
-        self.state_c, self._state_h = state
-        if prob:
-            return probs
-        return prediction
+        probs, (state_c, state_h) = \
+            self.sess.run([self._probs, self._state], feed_dict=feed_dict)
+        return np.reshape(probs, (len(features), -1)), state_c, state_h
 
     def network_train_on_batch(self, features, emb_context, key, utter_mask,
                                action_mask, action):
@@ -1,16 +1,30 @@
 import argparse
 
 from deeppavlov.core.common.file import find_config
-from deeppavlov.models.morpho_tagger.common import predict_with_model
+from deeppavlov.models.morpho_tagger.common import predict_with_model, predict_stream
 from deeppavlov.download import deep_download
 
 parser = argparse.ArgumentParser()
 parser.add_argument("config_path", help="path to file with prediction configuration")
 parser.add_argument("-d", "--download", action="store_true", help="download model components")
+parser.add_argument("-s", "--stream", action="store_true",
+                    help="read and tag the input file incrementally instead of loading it at once")
+parser.add_argument("-i", "--infile", default=None, help="file to tag in streaming mode")
+parser.add_argument("-o", "--outfile", default=None, help="file to write answers to in streaming mode")
+parser.add_argument("-f", "--format", default="conllu", choices=["conllu", "words", "text"],
+                    help="input file format in streaming mode")
+parser.add_argument("-w", "--window-size", default=10000, type=int,
+                    help="number of sentences read at once and sorted by length in streaming mode")
+parser.add_argument("-n", "--n-workers", default=1, type=int, help="number of worker processes in streaming mode")
 
 if __name__ == "__main__":
     args = parser.parse_args()
     config_path = find_config(args.config_path)
     if args.download:
         deep_download(config_path)
-    predict_with_model(config_path)
+    if args.stream:
+        for _ in predict_stream(config_path, infile=args.infile, outfile=args.outfile, input_format=args.format,
+                                window_size=args.window_size, n_workers=args.n_workers):
+            pass
+    else:
+        predict_with_model(config_path)
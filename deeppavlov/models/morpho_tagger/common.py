@@ -1,14 +1,19 @@
+import multiprocessing as mp
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Union, Optional
+from typing import List, Dict, Union, Optional, Iterator, Iterable
 
 from deeppavlov.core.commands.infer import build_model
 from deeppavlov.core.commands.utils import expand_path, parse_config
+from deeppavlov.core.common.chainer import Chainer
 from deeppavlov.core.common.file import read_json
 from deeppavlov.core.common.params import from_params
 from deeppavlov.core.common.registry import get_model
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.models.component import Component
 from deeppavlov.dataset_iterators.morphotagger_iterator import MorphoTaggerDatasetIterator
+from deeppavlov.dataset_readers.morphotagging_dataset_reader import iter_infile
 from deeppavlov.models.morpho_tagger.common_tagger import make_pos_and_tag
 
 
@@ -53,6 +58,134 @@ def predict_with_model(config_path: [Path, str]) -> List[Optional[List[str]]]:
     return answers
 
 
+def _tag_window(model: Chainer, sents: List[List[str]], batch_size: int) -> List[str]:
+    """Tags sentences in batches of similar length and returns answers in the original order."""
+    answers = [None] * len(sents)
+    indexes = sorted(range(len(sents)), key=lambda i: len(sents[i]))
+    for start in range(0, len(indexes), batch_size):
+        batch_indexes = indexes[start:start+batch_size]
+        for i, elem in zip(batch_indexes, model([sents[i] for i in batch_indexes])):
+            answers[i] = elem
+    return answers
+
+
+_worker_model = None
+
+
+def _init_tagging_worker(config: dict) -> None:
+    global _worker_model
+    _worker_model = build_model(config, load_trained=True)
+
+
+def _tag_window_in_worker(sents: List[List[str]], batch_size: int) -> List[str]:
+    return _tag_window(_worker_model, sents, batch_size)
+
+
+def _read_sents(infile: Path, input_format: str, read_params: Dict) -> Iterator[List[str]]:
+    if input_format == "text":
+        with open(infile, "r", encoding="utf8") as fin:
+            for line in fin:
+                words = line.split()
+                if words:
+                    yield words
+        return
+    if input_format == "words":
+        read_params = dict(read_params, from_words=True)
+    elif input_format != "conllu":
+        raise ValueError("Unknown input format: {}, only conllu, words and text "
+                         "formats are allowed".format(input_format))
+    read_params = {k: v for k, v in read_params.items()
+                   if k in ["from_words", "word_column", "pos_column", "tag_column"]}
+    for words, _ in iter_infile(infile, read_only_words=True, **read_params):
+        yield words
+
+
+def _gen_windows(sents: Iterable[List[str]], window_size: int) -> Iterator[List[List[str]]]:
+    sents = iter(sents)
+    window = list(islice(sents, window_size))
+    while window:
+        yield window
+        window = list(islice(sents, window_size))
+
+
+def predict_stream(config_path: Union[Path, str, Dict], infile: Union[Path, str] = None,
+                   outfile: Union[Path, str] = None, input_format: str = "conllu",
+                   window_size: int = 10000, n_workers: int = 1) -> Iterator[str]:
+    """Lazily tags a large file with morphotagging model given in config :config_path:.
+
+    Sentences are read incrementally by windows of ``window_size`` sentences,
+    in each window they are sorted by length and tagged in batches
+    of ``config['predict']['batch_size']`` sentences. Answers are yielded
+    and written to the ``outfile`` window by window in the order of input sentences,
+    so memory consumption does not depend on the size of the input file.
+
+    Args:
+        config_path: a path to config or config dictionary
+        infile: a file to tag, the ``test`` file of the dataset reader from config by default
+        outfile: a file to write answers to, ``config['predict']['outfile']`` by default
+        input_format: ``conllu`` for CONLL-U, ``words`` for a file with a word per line
+            and sentences separated by empty lines, ``text`` for a tokenized text
+            with a sentence per line
+        window_size: maximal number of sentences read into memory at once by each worker
+        n_workers: number of worker processes each holding its own copy of the model,
+            the model is run in the main process if ``n_workers <= 1``
+
+    Yields:
+        morphological analyses of input sentences
+    """
+    config = parse_config(config_path)
+    reader_config = config['dataset_reader']
+    read_params = {k: v for k, v in reader_config.items() if k not in ['class_name', 'data_path']}
+    if infile is None:
+        infile = expand_path(reader_config.get('data_path', ''))
+        if infile.is_dir():
+            infile = infile / "{}-ud-test.conllu".format(reader_config['language'])
+    batch_size = config['predict'].get("batch_size", -1)
+    if batch_size < 0:
+        batch_size = window_size
+    outfile = outfile or config['predict'].get("outfile")
+
+    windows = _gen_windows(_read_sents(expand_path(infile), input_format, read_params), window_size)
+    if n_workers > 1:
+        pool = mp.get_context('spawn').Pool(n_workers, initializer=_init_tagging_worker, initargs=(config,))
+        # at most two windows per worker are kept in memory
+        pending = deque(pool.apply_async(_tag_window_in_worker, (window, batch_size))
+                        for window in islice(windows, 2 * n_workers))
+        results = _gen_async_results(pool, pending, windows, batch_size)
+    else:
+        model = build_model(config, load_trained=True)
+        results = (_tag_window(model, window, batch_size) for window in windows)
+
+    fout = None
+    if outfile is not None:
+        outfile = expand_path(outfile)
+        outfile.parent.mkdir(parents=True, exist_ok=True)
+        fout = open(outfile, "w", encoding="utf8")
+    try:
+        for answers in results:
+            for elem in answers:
+                if fout is not None:
+                    fout.write(elem + "\n")
+                yield elem
+            if fout is not None:
+                fout.flush()
+    finally:
+        if fout is not None:
+            fout.close()
+
+
+def _gen_async_results(pool, pending: deque, windows: Iterator[List[List[str]]],
+                       batch_size: int) -> Iterator[List[str]]:
+    try:
+        while pending:
+            answers = pending.popleft().get()
+            for window in islice(windows, 1):
+                pending.append(pool.apply_async(_tag_window_in_worker, (window, batch_size)))
+            yield answers
+    finally:
+        pool.terminate()
+
+
 @register('tag_output_prettifier')
 class TagOutputPrettifier(Component):
     """Class which prettifies morphological tagger output to 4-column
@@ -17,7 +17,7 @@ import pickle
 import unicodedata
 from collections import Counter
 from pathlib import Path
-from typing import Tuple, List, Union
+from typing import Tuple, List, Union, Set, Dict
 
 import numpy as np
 from nltk import word_tokenize
@@ -237,6 +237,9 @@ class SquadVocabEmbedder(Estimator):
     def __call__(self, contexts: List[List[str]], questions: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
         """ Transforms tokens/chars to indices.
 
+        Arrays are trimmed to the maximum number of tokens in the batch instead of ``context_limit`` and
+        ``question_limit``, the model slices its inputs to the actual length anyway.
+
         Args:
             contexts: batch of list of tokens in context
             questions: batch of list of tokens in question
@@ -245,31 +248,47 @@ class SquadVocabEmbedder(Estimator):
             transformed contexts and questions
         """
         if self.level == 'token':
-            c_idxs = np.zeros([len(contexts), self.context_limit], dtype=np.int32)
-            q_idxs = np.zeros([len(questions), self.question_limit], dtype=np.int32)
-            for i, context in enumerate(contexts):
-                for j, token in enumerate(context):
-                    c_idxs[i, j] = self._get_idx(token)
-
-            for i, question in enumerate(questions):
-                for j, token in enumerate(question):
-                    q_idxs[i, j] = self._get_idx(token)
-
+            c_idxs = self._tokens_to_idxs(contexts, self.context_limit)
+            q_idxs = self._tokens_to_idxs(questions, self.question_limit)
         elif self.level == 'char':
-            c_idxs = np.zeros([len(contexts), self.context_limit, self.char_limit], dtype=np.int32)
-            q_idxs = np.zeros([len(questions), self.question_limit, self.char_limit], dtype=np.int32)
-            for i, context in enumerate(contexts):
-                for j, token in enumerate(context):
-                    for k, char in enumerate(token):
-                        c_idxs[i, j, k] = self._get_idx(char)
-
-            for i, question in enumerate(questions):
-                for j, token in enumerate(question):
-                    for k, char in enumerate(token):
-                        q_idxs[i, j, k] = self._get_idx(char)
+            c_idxs = self._chars_to_idxs(contexts, self.context_limit)
+            q_idxs = self._chars_to_idxs(questions, self.question_limit)
+        else:
+            raise RuntimeError("SquadVocabEmbedder::__call__: Unknown level: {}".format(self.level))
 
         return c_idxs, q_idxs
 
+    def _get_idxs(self, elements: Set[str]) -> Dict[str, int]:
+        """ Looks up every distinct token/char of a batch only once."""
+        return {el: self._get_idx(el) for el in elements}
+
+    def _tokens_to_idxs(self, batch: List[List[str]], limit: int) -> np.ndarray:
+        batch = [line[:limit] for line in batch]
+        lengths = np.array([len(line) for line in batch], dtype=np.int32)
+        max_len = max(lengths.max() if len(lengths) else 0, 1)
+        idxs = np.zeros([len(batch), max_len], dtype=np.int32)
+
+        el2idx = self._get_idxs({token for line in batch for token in line})
+        mask = np.arange(max_len) < lengths[:, None]
+        idxs[mask] = np.fromiter((el2idx[token] for line in batch for token in line), dtype=np.int32,
+                                 count=lengths.sum())
+        return idxs
+
+    def _chars_to_idxs(self, batch: List[List[str]], limit: int) -> np.ndarray:
+        batch = [[token[:self.char_limit] for token in line[:limit]] for line in batch]
+        lengths = np.array([len(line) for line in batch], dtype=np.int32)
+        max_len = max(lengths.max() if len(lengths) else 0, 1)
+        idxs = np.zeros([len(batch), max_len, self.char_limit], dtype=np.int32)
+
+        token_lengths = np.zeros([len(batch), max_len], dtype=np.int32)
+        token_lengths[np.arange(max_len) < lengths[:, None]] = [len(token) for line in batch for token in line]
+
+        el2idx = self._get_idxs({char for line in batch for token in line for char in token})
+        mask = np.arange(self.char_limit) < token_lengths[:, :, None]
+        idxs[mask] = np.fromiter((el2idx[char] for line in batch for token in line for char in token),
+                                 dtype=np.int32, count=token_lengths.sum())
+        return idxs
+
     def fit(self, contexts: Tuple[List[str], ...], questions: Tuple[List[str]], *args, **kwargs):
         self.vocab = Counter()
         self.embedding_dict = dict()
@@ -12,12 +12,17 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
+from pathlib import Path
+from typing import List, Iterable, Callable, Union, Optional
+
 import numpy as np
-from typing import List, Iterable, Callable, Union
 
+from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.models.component import Component
 from deeppavlov.models.ranking.keras_siamese_model import SiameseModel
+from deeppavlov.models.ranking.vector_index import VectorIndex, build_index, top_k
 from deeppavlov.core.data.simple_vocab import SimpleVocabulary
 from deeppavlov.core.common.registry import register
 
@@ -45,6 +50,14 @@ class SiamesePredictor(Component):
             :class:`~deeppavlov.models.preprocessors.siamese_preprocessor.SiamesePreprocessor`.
         interact_pred_num: The number of the most relevant ``responses`` which will be returned.
             Will be used if the ``ranking`` is set to ``True``.
+        index_type: A type of the index of ``responses`` vectors, ``'exact'`` for the exact search
+            or ``'ivf'`` for the approximate search over clusters of vectors.
+            Will be used if the ``attention`` is set to ``False``.
+        index_params: Parameters of the index, see
+            :class:`~deeppavlov.models.ranking.vector_index.ExactIndex` and
+            :class:`~deeppavlov.models.ranking.vector_index.IVFIndex`.
+        index_path: A directory to save the built index to and to load it from on the next start.
+            The saved index is rebuilt if the number of ``responses`` or the model weights file change.
         **kwargs: Other parameters.
     """
 
@@ -57,6 +70,9 @@ class SiamesePredictor(Component):
                  responses: SimpleVocabulary = None,
                  preproc_func: Callable = None,
                  interact_pred_num: int = 3,
+                 index_type: str = 'exact',
+                 index_params: Optional[dict] = None,
+                 index_path: Optional[str] = None,
                  *args, **kwargs) -> None:
 
         super().__init__()
@@ -66,55 +82,56 @@ class SiamesePredictor(Component):
         self.ranking = ranking
         self.attention = attention
         self.preproc_responses = []
-        self.response_embeddings = None
+        self.index: Optional[VectorIndex] = None
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.index_path = expand_path(index_path) if index_path else None
         self.preproc_func = preproc_func
         self.interact_pred_num = interact_pred_num
         self.model = model
         if self.ranking:
             self.responses = {el[1]: el[0] for el in responses.items()}
-            self._build_preproc_responses()
-            if not self.attention:
-                self._build_response_embeddings()
-
-    def __call__(self, batch: Iterable[List[np.ndarray]]) -> List[Union[List[str],str]]:
-        context = next(batch)
-        try:
-            next(batch)
-            log.error("It is not intended to use the `%s` with the batch size greater then 1." % self.__class__)
-        except StopIteration:
-            pass
-
+            if self.attention:
+                self._build_preproc_responses()
+            elif not self._load_index():
+                self._build_index()
 
+    def __call__(self, batch: Iterable[List[np.ndarray]]) -> List[Union[List[str], str]]:
+        contexts = list(batch)
         if self.ranking:
-            if len(context) == self.num_context_turns:
-                scores = []
-                if self.attention:
-                    for i in range(len(self.preproc_responses) // self.batch_size + 1):
-                        responses = self.preproc_responses[i*self.batch_size: (i+1)*self.batch_size]
-                        b = [context + el for el in responses]
-                        b = self.model._make_batch(b)
-                        sc = self.model._predict_on_batch(b)
-                        scores += list(sc)
-                else:
-                    b = self.model._make_batch([context])
-                    context_emb = self.model._predict_context_on_batch(b)
-                    context_emb = np.squeeze(context_emb, axis=0)
-                    scores = context_emb @ self.response_embeddings.T
-                ids = np.flip(np.argsort(scores), -1)
-                return [[self.responses[el] for el in ids[:self.interact_pred_num]]]
-            else:
-                return ["Please, provide contexts separated by '&' in the number equal to that used while training."]
-
+            n_turns = self.num_context_turns
+            error = "Please, provide contexts separated by '&' in the number equal to that used while training."
+        else:
+            n_turns = 2
+            error = "Please, provide two sentences separated by '&'."
+
+        valid = [i for i, context in enumerate(contexts) if len(context) == n_turns]
+        results = [error] * len(contexts)
+        if not valid:
+            return results
+
+        if not self.ranking:
+            scores = self._predict_in_batches(self.model._predict_on_batch, [contexts[i] for i in valid])
+            for i, sc in zip(valid, scores):
+                results[i] = "This is a paraphrase." if sc > 0.5 else "This is not a paraphrase."
+        elif self.attention:
+            for i in valid:
+                scores = self._predict_in_batches(self.model._predict_on_batch,
+                                                  [contexts[i] + el for el in self.preproc_responses])
+                ids = top_k(np.asarray(scores).reshape(1, -1), self.interact_pred_num)[0]
+                results[i] = [self.responses[el] for el in ids]
         else:
-            if len(context) == 2:
-                b = self.model._make_batch([context])
-                sc = self.model._predict_on_batch(b)[0]
-                if sc > 0.5:
-                    return ["This is a paraphrase."]
-                else:
-                    return ["This is not a paraphrase."]
-            else:
-                return ["Please, provide two sentences separated by '&'."]
+            context_embs = self._predict_in_batches(self.model._predict_context_on_batch,
+                                                    [contexts[i] for i in valid])
+            ids, scores = self.index.search(context_embs, self.interact_pred_num)
+            for i, row_ids, row_scores in zip(valid, ids, scores):
+                results[i] = [self.responses[el] for el, sc in zip(row_ids, row_scores) if sc > -np.inf]
+        return results
+
+    def _predict_in_batches(self, predict: Callable, samples: List[List[np.ndarray]]) -> np.ndarray:
+        preds = [predict(self.model._make_batch(samples[i:i + self.batch_size]))
+                 for i in range(0, len(samples), self.batch_size)]
+        return np.concatenate(preds) if preds else np.array([])
 
     def reset(self) -> None:
         pass
@@ -122,19 +139,38 @@ class SiamesePredictor(Component):
     def process_event(self) -> None:
         pass
 
-    def _build_response_embeddings(self) -> None:
-        resp_vecs = []
-        for i in range(len(self.preproc_responses) // self.batch_size + 1):
-            resp_preproc = self.preproc_responses[i*self.batch_size: (i+1)*self.batch_size]
-            resp_preproc = self.model._make_batch(resp_preproc)
-            resp_preproc = resp_preproc
-            resp_vecs.append(self.model._predict_response_on_batch(resp_preproc))
-        self.response_embeddings = np.vstack(resp_vecs)
+    def _index_meta(self) -> dict:
+        load_path = getattr(self.model, 'load_path', None)
+        model_mtime = load_path.stat().st_mtime if load_path is not None and load_path.exists() else None
+        # a hash of texts makes the index outdated when responses change but their number does not
+        responses_hash = hashlib.sha1('\n'.join(map(str, self.responses.values())).encode('utf8')).hexdigest()
+        return {'n_responses': len(self.responses), 'responses_sha1': responses_hash, 'model_mtime': model_mtime}
+
+    def _load_index(self) -> bool:
+        if self.index_path is None or not (self.index_path / 'meta.json').exists():
+            return False
+        index = VectorIndex.load(self.index_path, **self.index_params)
+        if index.index_type != self.index_type or index.meta != self._index_meta():
+            log.info(f'responses index at {self.index_path} is outdated and will be rebuilt')
+            return False
+        log.info(f'loaded responses index from {self.index_path}')
+        self.index = index
+        return True
+
+    def _build_index(self) -> None:
+        if not self.preproc_responses:
+            self._build_preproc_responses()
+        response_embeddings = self._predict_in_batches(self.model._predict_response_on_batch, self.preproc_responses)
+        self.index = build_index(self.index_type, response_embeddings, **self.index_params)
+        self.index.meta = self._index_meta()
+        if self.index_path is not None:
+            log.info(f'saving responses index to {self.index_path}')
+            self.index.save(self.index_path)
 
     def _build_preproc_responses(self) -> None:
         responses = list(self.responses.values())
-        for i in range(len(responses) // self.batch_size + 1):
-            el = self.preproc_func(responses[i*self.batch_size: (i+1)*self.batch_size])
+        for i in range(0, len(responses), self.batch_size):
+            el = self.preproc_func(responses[i: i + self.batch_size])
             self.preproc_responses += list(el)
 
     def rebuild_responses(self, candidates) -> None:
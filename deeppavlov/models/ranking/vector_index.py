@@ -0,0 +1,225 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Returns indices of ``k`` highest scores in every row of ``scores`` sorted by score in descending order."""
+    k = min(k, scores.shape[-1])
+    if k <= 0:
+        return np.zeros(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < scores.shape[-1]:
+        ids = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        ids = np.broadcast_to(np.arange(scores.shape[-1]), scores.shape)
+    rows = np.arange(scores.shape[0])[:, None]
+    order = np.argsort(-scores[rows, ids], axis=-1, kind='mergesort')
+    return ids[rows, order]
+
+
+class VectorIndex:
+    """Base class of inner product search indexes over a fixed set of vectors.
+
+    Args:
+        vectors: matrix of indexed vectors, one per row
+
+    Attributes:
+        vectors: matrix of indexed vectors
+        meta: arbitrary json-serializable information saved together with the index
+    """
+    index_type = None
+
+    def __init__(self, vectors: np.ndarray) -> None:
+        self.vectors = vectors
+        self.meta: Dict = {}
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Finds ``k`` vectors with the highest inner product for every query.
+
+        Args:
+            queries: matrix of query vectors, one per row
+            k: number of vectors to return for every query
+
+        Returns:
+            matrices of found vector ids and their scores of shape ``[len(queries), min(k, len(self))]``,
+            approximate indexes pad missing results with ``-inf`` scores
+        """
+        raise NotImplementedError
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {'vectors': self.vectors}
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Saves the index into the ``path`` directory as .npy files, which can be memory-mapped on load."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name, array in self._arrays().items():
+            np.save(str(path / f'{name}.npy'), array)
+        with (path / 'meta.json').open('w') as f:
+            json.dump({'index_type': self.index_type, 'meta': self.meta}, f)
+
+    @classmethod
+    def _from_arrays(cls, arrays: Dict[str, np.ndarray], **kwargs) -> 'VectorIndex':
+        return cls(arrays['vectors'], **kwargs)
+
+    @staticmethod
+    def load(path: Union[str, Path], **kwargs) -> 'VectorIndex':
+        """Loads an index saved with :meth:`save`, index arrays are memory-mapped.
+
+        Args:
+            path: directory with the saved index
+            **kwargs: search parameters of the index, parameters used only for building it are ignored
+        """
+        path = Path(path)
+        with (path / 'meta.json').open() as f:
+            info = json.load(f)
+        cls = _INDEX_TYPES[info['index_type']]
+        arrays = {p.stem: np.load(str(p), mmap_mode='r') for p in path.glob('*.npy')}
+        index = cls._from_arrays(arrays, **kwargs)
+        index.meta = info['meta']
+        return index
+
+
+class ExactIndex(VectorIndex):
+    """Brute force index which scores every vector and selects top ``k`` with :func:`numpy.argpartition`.
+
+    Args:
+        vectors: matrix of indexed vectors, one per row
+        chunk_size: number of vectors scored at once, bounds the memory used by a batch of queries
+    """
+    index_type = 'exact'
+
+    def __init__(self, vectors: np.ndarray, chunk_size: int = 100000) -> None:
+        super().__init__(vectors)
+        self.chunk_size = chunk_size
+
+    @classmethod
+    def _from_arrays(cls, arrays: Dict[str, np.ndarray], chunk_size: int = 100000, **kwargs) -> 'ExactIndex':
+        return cls(arrays['vectors'], chunk_size)
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        queries = np.atleast_2d(queries)
+        best_ids = np.zeros((len(queries), 0), dtype=np.int64)
+        best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+        for start in range(0, len(self.vectors), self.chunk_size):
+            scores = queries @ np.asarray(self.vectors[start:start + self.chunk_size]).T
+            ids = top_k(scores, k)
+            rows = np.arange(len(queries))[:, None]
+            best_scores = np.hstack([best_scores, scores[rows, ids]])
+            best_ids = np.hstack([best_ids, ids + start])
+            order = top_k(best_scores, k)
+            best_scores, best_ids = best_scores[rows, order], best_ids[rows, order]
+        return best_ids, best_scores
+
+
+class IVFIndex(VectorIndex):
+    """Approximate inverted file index.
+
+    Vectors are clustered with k-means, a query is scored only against vectors of ``n_probe`` clusters whose
+    centroids have the highest inner product with it.
+
+    Args:
+        vectors: matrix of indexed vectors, one per row
+        n_lists: number of clusters, square root of the number of vectors by default
+        n_probe: number of clusters to search in
+        n_iter: number of k-means iterations
+        sample_size: maximum number of vectors used to fit centroids
+        seed: random seed for k-means initialization
+    """
+    index_type = 'ivf'
+
+    def __init__(self, vectors: np.ndarray, n_lists: Optional[int] = None, n_probe: int = 8, n_iter: int = 10,
+                 sample_size: int = 100000, seed: Optional[int] = None) -> None:
+        super().__init__(vectors)
+        self.n_probe = n_probe
+        if vectors is None:
+            return
+
+        n_lists = n_lists or max(int(np.sqrt(len(vectors))), 1)
+        n_lists = min(n_lists, len(vectors))
+        self.centroids = self._fit_centroids(np.asarray(vectors), n_lists, n_iter, sample_size, seed)
+
+        assignment = self._assign(np.asarray(vectors))
+        self.ids = np.argsort(assignment, kind='mergesort')
+        self.offsets = np.zeros(n_lists + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum(np.bincount(assignment, minlength=n_lists))
+        # vectors are stored grouped by clusters, so that every cluster is a contiguous slice
+        self.vectors = np.asarray(vectors)[self.ids]
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 10000) -> np.ndarray:
+        return np.concatenate([np.argmax(vectors[i:i + chunk_size] @ self.centroids.T, axis=1)
+                               for i in range(0, len(vectors), chunk_size)])
+
+    def _fit_centroids(self, vectors: np.ndarray, n_lists: int, n_iter: int, sample_size: int,
+                       seed: Optional[int]) -> np.ndarray:
+        rs = np.random.RandomState(seed)
+        if len(vectors) > sample_size:
+            vectors = vectors[rs.choice(len(vectors), sample_size, replace=False)]
+        self.centroids = vectors[rs.choice(len(vectors), n_lists, replace=False)].astype(np.float32)
+        for _ in range(n_iter):
+            assignment = self._assign(vectors)
+            counts = np.bincount(assignment, minlength=n_lists)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignment, vectors)
+            non_empty = counts > 0
+            self.centroids[non_empty] = sums[non_empty] / counts[non_empty, None]
+        return self.centroids
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        queries = np.atleast_2d(queries)
+        lists = top_k(queries @ self.centroids.T, self.n_probe)
+        k = min(k, len(self))
+        ids = np.zeros((len(queries), k), dtype=np.int64)
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        for i, (query, query_lists) in enumerate(zip(queries, lists)):
+            candidates = np.concatenate([np.arange(self.offsets[j], self.offsets[j + 1]) for j in query_lists])
+            candidate_scores = np.asarray(self.vectors[candidates]) @ query
+            best = top_k(candidate_scores[None, :], k)[0]
+            ids[i, :len(best)] = self.ids[candidates[best]]
+            scores[i, :len(best)] = candidate_scores[best]
+        return ids, scores
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {'vectors': self.vectors, 'centroids': self.centroids, 'ids': self.ids, 'offsets': self.offsets}
+
+    @classmethod
+    def _from_arrays(cls, arrays: Dict[str, np.ndarray], n_probe: int = 8, **kwargs) -> 'IVFIndex':
+        index = cls(None, n_probe=n_probe)
+        index.vectors = arrays['vectors']
+        index.centroids = np.asarray(arrays['centroids'])
+        index.ids = np.asarray(arrays['ids'])
+        index.offsets = np.asarray(arrays['offsets'])
+        return index
+
+
+_INDEX_TYPES = {cls.index_type: cls for cls in (ExactIndex, IVFIndex)}
+
+
+def build_index(index_type: str, vectors: np.ndarray, **kwargs) -> VectorIndex:
+    """Creates an index of the given type (``'exact'`` or ``'ivf'``) over ``vectors``."""
+    if index_type not in _INDEX_TYPES:
+        raise ValueError(f'unknown vector index type "{index_type}", use one of {list(_INDEX_TYPES)}')
+    return _INDEX_TYPES[index_type](vectors, **kwargs)
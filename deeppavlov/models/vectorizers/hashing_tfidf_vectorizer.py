@@ -12,14 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from collections import Counter
-from typing import List, Any, Generator, Tuple, KeysView, ValuesView, Dict, Optional
+import hashlib
+import json
+from collections import Counter, deque
+from multiprocessing.pool import Pool, AsyncResult
+from collections.abc import Sequence
+from pathlib import Path
+from typing import List, Any, Tuple, Dict, Optional, Union
 
 import scipy as sp
 from scipy import sparse
 import numpy as np
 from sklearn.utils import murmurhash3_32
 
+from deeppavlov.core.commands.utils import expand_path
 from deeppavlov.core.models.component import Component
 from deeppavlov.core.models.estimator import Estimator
 from deeppavlov.core.common.log import get_logger
@@ -43,6 +49,128 @@ def hash_(token: str, hash_size: int) -> int:
     return murmurhash3_32(token, positive=True) % hash_size
 
 
+def count_hashes(tokenizer: Component, hash_size: int, docs: List[str], doc_nums: List[int]) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count hashed ngrams of documents.
+
+    Args:
+        tokenizer: a tokenizer producing ngrams
+        hash_size: a hash size
+        docs: a list of input documents
+        doc_nums: a list of document integer ids corresponding to input documents
+
+    Returns:
+        a tuple of term hashes, document integer ids and counts as compact int32 arrays
+
+    """
+    rows, cols, data = [], [], []
+    for ngrams, doc_num in zip(tokenizer(docs), doc_nums):
+        counts = Counter([hash_(gram, hash_size) for gram in ngrams])
+        rows.append(np.fromiter(counts.keys(), dtype=np.int32, count=len(counts)))
+        data.append(np.fromiter(counts.values(), dtype=np.int32, count=len(counts)))
+        cols.append(np.full(len(counts), doc_num, dtype=np.int32))
+    if not rows:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, empty
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(data)
+
+
+# tokenizer attributes which do not change produced ngrams
+_TOKENIZER_RUNTIME_ATTRS = {'batch_size', 'n_threads'}
+
+
+def counting_params_fingerprint(tokenizer: Component, hash_size: int) -> str:
+    """Get a digest of parameters which affect hashed ngram counts.
+
+    Args:
+        tokenizer: a tokenizer producing ngrams
+        hash_size: a hash size
+
+    Returns:
+        a hex digest of the hash size, the tokenizer class and its scalar and collection attributes
+
+    """
+    tokenizer_params = {}
+    for name, value in sorted(vars(tokenizer).items()):
+        if name in _TOKENIZER_RUNTIME_ATTRS:
+            continue
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        if value is None or isinstance(value, (bool, int, float, str, list, tuple)):
+            tokenizer_params[name] = value
+    params = {'hash_size': hash_size,
+              'tokenizer': f'{type(tokenizer).__module__}.{type(tokenizer).__qualname__}',
+              'tokenizer_params': tokenizer_params}
+    return hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode('utf8')).hexdigest()
+
+
+def batch_fingerprint(params_fingerprint: str, docs: List[str], doc_nums: List[int]) -> str:
+    """Get a digest identifying counts of a batch of documents.
+
+    Args:
+        params_fingerprint: a digest returned by :func:`counting_params_fingerprint`
+        docs: a list of input documents
+        doc_nums: a list of document integer ids corresponding to input documents
+
+    Returns:
+        a hex digest of counting parameters, document ids and document contents
+
+    """
+    digest = hashlib.sha1(params_fingerprint.encode('utf8'))
+    digest.update(np.asarray(doc_nums, dtype=np.int64).tobytes())
+    for doc in docs:
+        digest.update(str(doc).encode('utf8', 'surrogatepass'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+_worker_tokenizer = None
+_worker_hash_size = None
+
+
+def _init_counting_worker(tokenizer: Component, hash_size: int) -> None:
+    global _worker_tokenizer, _worker_hash_size
+    _worker_tokenizer = tokenizer
+    _worker_hash_size = hash_size
+
+
+def _count_hashes_in_worker(docs: List[str], doc_nums: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return count_hashes(_worker_tokenizer, _worker_hash_size, docs, doc_nums)
+
+
+class DocIds(Sequence):
+    """Read-only sequence of document ids stored as concatenated utf-8 strings and their offsets.
+
+    Both arrays can be memory-mapped, so the ids of millions of documents are shared between processes
+    instead of being unpickled into a dict by each of them.
+
+    Args:
+        data: concatenated utf-8 encoded ids
+        offsets: an array of ``len(ids) + 1`` offsets of the ids in ``data``
+
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray) -> None:
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_list(cls, ids: List[str]) -> 'DocIds':
+        encoded = [str(i).encode('utf8') for i in ids]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(i) for i in encoded], out=offsets[1:])
+        data = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(data, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if i < 0:
+            i += len(self)
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf8')
+
+
 @register('hashing_tfidf_vectorizer')
 class HashingTfIdfVectorizer(Estimator):
     """Create a tfidf matrix from collection of documents of size [n_documents X n_features(hash_size)].
@@ -51,22 +179,32 @@ class HashingTfIdfVectorizer(Estimator):
         tokenizer: a tokenizer class
         hash_size: a hash size, power of two
         doc_index: a dictionary of document ids and their titles
-        save_path: a path to **.npz** file where tfidf matrix is saved
-        load_path: a path to **.npz** file where tfidf matrix is loaded from
+        save_path: a path to **.npz** file where tfidf matrix is saved, or a path to a directory to save
+         the matrix as memory-mappable **.npy** files
+        load_path: a path to **.npz** file or a directory with **.npy** files where tfidf matrix
+         is loaded from; **.npy** files are memory-mapped read-only, so processes loading the same
+         matrix share one copy of it
+        n_jobs: a number of processes tokenizing and hashing documents during fitting, documents are
+         processed in the fitting process itself if ``n_jobs`` is less than 2
+        shards_path: a path to a directory where term counts of every fitted batch are saved; batches
+         with saved counts are not processed again, so interrupted fitting can be resumed; saved counts
+         are reused only if the hash size, the tokenizer settings and the batch documents are the same
 
     Attributes:
         hash_size: a hash size
         tokenizer: instance of a tokenizer class
         term_freqs: a dictionary with tfidf terms and their frequences
         doc_index: provided by a user ids or generated automatically ids
-        rows: tfidf matrix rows corresponding to terms
-        cols: tfidf matrix cols corresponding to docs
-        data: tfidf matrix data corresponding to tfidf values
+        index2doc: a sequence of document ids by their column number in tfidf matrix
+        rows: per batch arrays of tfidf matrix rows corresponding to terms
+        cols: per batch arrays of tfidf matrix cols corresponding to docs
+        data: per batch arrays of tfidf matrix data corresponding to term counts
 
     """
 
     def __init__(self, tokenizer: Component, hash_size=2 ** 24, doc_index: Optional[dict] = None,
-                 save_path: Optional[str] = None, load_path: Optional[str] = None, **kwargs):
+                 save_path: Optional[str] = None, load_path: Optional[str] = None, n_jobs: int = 1,
+                 shards_path: Optional[str] = None, **kwargs):
 
         super().__init__(save_path=save_path, load_path=load_path, mode=kwargs.get('mode', 'infer'))
 
@@ -76,17 +214,48 @@ class HashingTfIdfVectorizer(Estimator):
         self.cols = []
         self.data = []
 
+        self.n_jobs = n_jobs
+        self.shards_path = expand_path(shards_path) if shards_path else None
+        self._pool: Optional[Pool] = None
+        self._pending = deque()
+        self._params_fingerprint: Optional[str] = None
+
+        self._doc_index = None
+        self.index2doc = None
+
         if kwargs.get('mode', 'infer') == 'infer':
             self.tfidf_matrix, opts = self.load()
             self.ngram_range = opts['ngram_range']
             self.hash_size = opts['hash_size']
             self.term_freqs = opts['term_freqs'].squeeze()
-            self.doc_index = opts['doc_index']
-            self.index2doc = self.get_index2doc()
+            if 'doc_ids' in opts:
+                self.index2doc = opts['doc_ids']
+            else:
+                self.doc_index = opts['doc_index']
+                self.index2doc = self.get_index2doc()
         else:
             self.term_freqs = None
             self.doc_index = doc_index or {}
 
+    @property
+    def doc_index(self) -> Dict[Any, int]:
+        """A dictionary of document ids and their column numbers in tfidf matrix.
+
+        For memory-mapped matrices it is built from :attr:`index2doc` on first access.
+        """
+        if self._doc_index is None and self.index2doc is not None:
+            self._doc_index = {doc_id: i for i, doc_id in enumerate(self.index2doc)}
+        return self._doc_index
+
+    @doc_index.setter
+    def doc_index(self, value: Dict[Any, int]) -> None:
+        self._doc_index = value
+
+    @property
+    def n_docs(self) -> int:
+        """Number of documents in tfidf matrix."""
+        return self.tfidf_matrix.shape[1]
+
     def __call__(self, questions: List[str]) -> Sparse:
         """Transform input list of documents to tfidf vectors.
 
@@ -98,33 +267,26 @@ class HashingTfIdfVectorizer(Estimator):
 
         """
 
-        sp_tfidfs = []
-
-        for question in questions:
-            ngrams = list(self.tokenizer([question]))
-            hashes = [hash_(ngram, self.hash_size) for ngram in ngrams[0]]
+        data, indices, indptr = [], [], [0]
+        size = self.n_docs
 
+        for ngrams in self.tokenizer(questions):
+            hashes = [hash_(ngram, self.hash_size) for ngram in ngrams]
             hashes_unique, q_hashes = np.unique(hashes, return_counts=True)
-            tfs = np.log1p(q_hashes)
-
-            # TODO revise policy if len(q_hashes) == 0
 
-            if len(q_hashes) == 0:
-                return Sparse((1, self.hash_size))
+            if len(q_hashes) > 0:
+                tfs = np.log1p(q_hashes)
+                Ns = self.term_freqs[hashes_unique]
+                idfs = np.log((size - Ns + 0.5) / (Ns + 0.5))
+                idfs[idfs < 0] = 0
 
-            size = len(self.doc_index)
-            Ns = self.term_freqs[hashes_unique]
-            idfs = np.log((size - Ns + 0.5) / (Ns + 0.5))
-            idfs[idfs < 0] = 0
+                data.append(np.multiply(tfs, idfs))
+                indices.append(hashes_unique)
+            indptr.append(indptr[-1] + len(hashes_unique))
 
-            tfidf = np.multiply(tfs, idfs)
-
-            indptr = np.array([0, len(hashes_unique)])
-            sp_tfidf = Sparse((tfidf, hashes_unique, indptr), shape=(1, self.hash_size)
-                              )
-            sp_tfidfs.append(sp_tfidf)
-
-        transformed = sp.sparse.vstack(sp_tfidfs)
+        data = np.concatenate(data) if data else np.zeros(0)
+        indices = np.concatenate(indices) if indices else np.zeros(0, dtype=np.int32)
+        transformed = Sparse((data, indices, indptr), shape=(len(indptr) - 1, self.hash_size))
         return transformed
 
     def get_index2doc(self) -> Dict[Any, int]:
@@ -136,36 +298,6 @@ class HashingTfIdfVectorizer(Estimator):
         """
         return dict(zip(self.doc_index.values(), self.doc_index.keys()))
 
-    def get_counts(self, docs: List[str], doc_ids: List[Any]) \
-            -> Generator[Tuple[KeysView, ValuesView, List[int]], Any, None]:
-        """Get term counts for a list of documents.
-
-        Args:
-            docs: a list of input documents
-            doc_ids: a list of document ids corresponding to input documents
-
-        Yields:
-            a tuple of term hashes, count values and column ids
-
-        Returns:
-            None
-
-        """
-        logger.info("Tokenizing batch...")
-        batch_ngrams = list(self.tokenizer(docs))
-        logger.info("Counting hash...")
-        doc_id = iter(doc_ids)
-        for ngrams in batch_ngrams:
-            counts = Counter([hash_(gram, self.hash_size) for gram in ngrams])
-            hashes = counts.keys()
-            values = counts.values()
-            _id = self.doc_index[next(doc_id)]
-            if values:
-                col_id = [_id] * len(values)
-            else:
-                col_id = []
-            yield hashes, values, col_id
-
     def get_count_matrix(self, row: List[int], col: List[int], data: List[int], size: int) \
             -> Sparse:
         """Get count matrix.
@@ -206,15 +338,24 @@ class HashingTfIdfVectorizer(Estimator):
         return tfidfs, term_freqs
 
     def save(self) -> None:
-        """Save tfidf matrix into **.npz** format.
+        """Save tfidf matrix into **.npz** format or as a directory of **.npy** files.
 
         Returns:
             None
 
         """
+        self._wait_pending()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
         logger.info("Saving tfidf matrix to {}".format(self.save_path))
-        count_matrix = self.get_count_matrix(self.rows, self.cols, self.data,
-                                             size=len(self.doc_index))
+        rows, cols, data = (np.concatenate(arrays) if arrays else np.zeros(0, dtype=np.int32)
+                            for arrays in (self.rows, self.cols, self.data))
+        self.reset()
+        count_matrix = self.get_count_matrix(rows, cols, data, size=len(self.doc_index))
+        del rows, cols, data
         tfidf_matrix, term_freqs = self.get_tfidf_matrix(count_matrix)
         self.term_freqs = term_freqs
 
@@ -223,14 +364,7 @@ class HashingTfIdfVectorizer(Estimator):
                 'doc_index': self.doc_index,
                 'term_freqs': self.term_freqs}
 
-        data = {
-            'data': tfidf_matrix.data,
-            'indices': tfidf_matrix.indices,
-            'indptr': tfidf_matrix.indptr,
-            'shape': tfidf_matrix.shape,
-            'opts': opts
-        }
-        np.savez(self.save_path, **data)
+        save_tfidf_matrix(self.save_path, tfidf_matrix, opts)
 
         # release memory
         self.reset()
@@ -263,10 +397,7 @@ class HashingTfIdfVectorizer(Estimator):
             raise FileNotFoundError("HashingTfIdfVectorizer path doesn't exist!")
 
         logger.info("Loading tfidf matrix from {}".format(self.load_path))
-        loader = np.load(self.load_path)
-        matrix = Sparse((loader['data'], loader['indices'],
-                         loader['indptr']), shape=loader['shape'])
-        return matrix, loader['opts'].item(0)
+        return load_tfidf_matrix(self.load_path)
 
     def partial_fit(self, docs: List[str], doc_ids: List[Any], doc_nums: List[int]) -> None:
         """Partially fit on one batch.
@@ -283,10 +414,58 @@ class HashingTfIdfVectorizer(Estimator):
         for doc_id, i in zip(doc_ids, doc_nums):
             self.doc_index[doc_id] = i
 
-        for batch_rows, batch_data, batch_cols in self.get_counts(docs, doc_ids):
-            self.rows.extend(batch_rows)
-            self.cols.extend(batch_cols)
-            self.data.extend(batch_data)
+        shard_path, fingerprint = None, None
+        if self.shards_path is not None:
+            if self._params_fingerprint is None:
+                self._params_fingerprint = counting_params_fingerprint(self.tokenizer, self.hash_size)
+            fingerprint = batch_fingerprint(self._params_fingerprint, docs, doc_nums)
+            shard_path = self.shards_path / f'{doc_nums[0]}_{len(doc_nums)}.npz'
+            if shard_path.exists():
+                shard = np.load(shard_path)
+                if 'fingerprint' in shard.files and str(shard['fingerprint']) == fingerprint:
+                    self._add_counts(shard['rows'], shard['cols'], shard['data'])
+                    return
+                logger.warning(f'Ignoring term counts in {shard_path} saved for other documents or '
+                               f'vectorizer parameters.')
+
+        if self.n_jobs > 1:
+            if self._pool is None:
+                self._pool = Pool(self.n_jobs, initializer=_init_counting_worker,
+                                  initargs=(self.tokenizer, self.hash_size))
+            # bound the number of batches held in memory while waiting for workers
+            while len(self._pending) >= 2 * self.n_jobs:
+                self._collect_pending(*self._pending.popleft())
+            result = self._pool.apply_async(_count_hashes_in_worker, (docs, list(doc_nums)))
+            self._pending.append((result, shard_path, fingerprint))
+        else:
+            counts = count_hashes(self.tokenizer, self.hash_size, docs, doc_nums)
+            self._save_shard(shard_path, fingerprint, counts)
+            self._add_counts(*counts)
+
+    def _add_counts(self, rows: np.ndarray, cols: np.ndarray, data: np.ndarray) -> None:
+        self.rows.append(rows)
+        self.cols.append(cols)
+        self.data.append(data)
+
+    def _collect_pending(self, result: AsyncResult, shard_path: Optional[Path], fingerprint: Optional[str]) -> None:
+        counts = result.get()
+        self._save_shard(shard_path, fingerprint, counts)
+        self._add_counts(*counts)
+
+    def _wait_pending(self) -> None:
+        while self._pending:
+            self._collect_pending(*self._pending.popleft())
+
+    @staticmethod
+    def _save_shard(shard_path: Optional[Path], fingerprint: Optional[str],
+                    counts: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> None:
+        if shard_path is None:
+            return
+        shard_path.parent.mkdir(parents=True, exist_ok=True)
+        rows, cols, data = counts
+        tmp_path = shard_path.with_name(shard_path.stem + '.tmp.npz')
+        np.savez(tmp_path, rows=rows, cols=cols, data=data, fingerprint=np.array(fingerprint))
+        tmp_path.rename(shard_path)
 
     def fit(self, docs: List[str], doc_ids: List[Any], doc_nums: List[int]) -> None:
         """Fit the vectorizer.
@@ -301,7 +480,94 @@ class HashingTfIdfVectorizer(Estimator):
 
         """
         self.doc_index = {}
-        self.rows = []
-        self.cols = []
-        self.data = []
+        self._wait_pending()
+        self.reset()
         return self.partial_fit(docs, doc_ids, doc_nums)
+
+
+def save_tfidf_matrix(path: Union[str, Path], tfidf_matrix: Sparse, opts: Dict[str, Any]) -> None:
+    """Save tfidf matrix and its options.
+
+    If ``path`` has the **.npz** suffix, everything is saved into a single **.npz** file. Otherwise ``path`` is
+    a directory where CSR arrays, term frequencies and document ids are saved as **.npy** files which can be
+    memory-mapped on load.
+
+    Args:
+        path: a path to **.npz** file or to a directory
+        tfidf_matrix: tfidf matrix of size [hash_size X n_documents]
+        opts: a dictionary with ``hash_size``, ``ngram_range``, ``doc_index`` and ``term_freqs``
+
+    Returns:
+        None
+
+    """
+    path = Path(path)
+    if path.suffix == '.npz':
+        np.savez(path, data=tfidf_matrix.data, indices=tfidf_matrix.indices, indptr=tfidf_matrix.indptr,
+                 shape=tfidf_matrix.shape, opts=opts)
+        return
+
+    path.mkdir(parents=True, exist_ok=True)
+    index2doc = dict(zip(opts['doc_index'].values(), opts['doc_index'].keys()))
+    doc_ids = DocIds.from_list([index2doc[i] for i in range(tfidf_matrix.shape[1])])
+
+    np.save(path / 'data.npy', tfidf_matrix.data)
+    np.save(path / 'indices.npy', tfidf_matrix.indices)
+    np.save(path / 'indptr.npy', tfidf_matrix.indptr)
+    np.save(path / 'term_freqs.npy', opts['term_freqs'])
+    np.save(path / 'doc_ids_data.npy', doc_ids.data)
+    np.save(path / 'doc_ids_offsets.npy', doc_ids.offsets)
+    with (path / 'meta.json').open('w', encoding='utf8') as f:
+        json.dump({'shape': list(tfidf_matrix.shape),
+                   'hash_size': opts['hash_size'],
+                   'ngram_range': list(opts['ngram_range'])}, f)
+
+
+def load_tfidf_matrix(path: Union[str, Path]) -> Tuple[Sparse, Dict[str, Any]]:
+    """Load tfidf matrix and its options saved with :func:`save_tfidf_matrix`.
+
+    Arrays saved as **.npy** files are memory-mapped read-only, options loaded from them contain
+    ``doc_ids`` sequence instead of ``doc_index`` dictionary.
+
+    Args:
+        path: a path to **.npz** file or to a directory
+
+    Returns:
+        a tuple of tfidf matrix and its options
+
+    """
+    path = Path(path)
+    if path.suffix == '.npz':
+        loader = np.load(path)
+        matrix = Sparse((loader['data'], loader['indices'],
+                         loader['indptr']), shape=loader['shape'])
+        return matrix, loader['opts'].item(0)
+
+    with (path / 'meta.json').open(encoding='utf8') as f:
+        meta = json.load(f)
+
+    def load_array(name):
+        return np.load(path / f'{name}.npy', mmap_mode='r')
+
+    matrix = Sparse((load_array('data'), load_array('indices'), load_array('indptr')),
+                    shape=tuple(meta['shape']), copy=False)
+    opts = {'hash_size': meta['hash_size'],
+            'ngram_range': meta['ngram_range'],
+            'term_freqs': load_array('term_freqs'),
+            'doc_ids': DocIds(load_array('doc_ids_data'), load_array('doc_ids_offsets'))}
+    return matrix, opts
+
+
+def convert_tfidf_matrix(npz_path: Union[str, Path], save_dir: Union[str, Path]) -> None:
+    """Convert tfidf matrix from a **.npz** file into a directory of memory-mappable **.npy** files.
+
+    Args:
+        npz_path: a path to **.npz** file saved by :class:`HashingTfIdfVectorizer`
+        save_dir: a path to a directory for **.npy** files
+
+    Returns:
+        None
+
+    """
+    matrix, opts = load_tfidf_matrix(expand_path(npz_path))
+    save_tfidf_matrix(expand_path(save_dir), matrix, opts)
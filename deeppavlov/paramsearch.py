@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import argparse
+import multiprocessing as mp
 from copy import deepcopy
 from pathlib import Path
 import sys
@@ -24,9 +25,11 @@ from sklearn.model_selection import train_test_split
 from deeppavlov.core.commands.utils import parse_config
 from deeppavlov.core.common.file import save_json, find_config, read_json
 from deeppavlov.core.common.log import get_logger
-from deeppavlov.core.common.cross_validation import calc_cv_score
+from deeppavlov.core.common.cross_validation import calc_cv_score, change_savepath_for_model, \
+    delete_dir_for_saved_models
 from deeppavlov.core.commands.train import train_evaluate_model_from_config, get_iterator_from_config, read_data_by_config
 from deeppavlov.core.common.params_search import ParamsSearch
+from deeppavlov.core.common.prefix_cache import FittedPrefixCache, data_fingerprint
 
 p = (Path(__file__) / ".." / "..").resolve()
 sys.path.append(str(p))
@@ -37,6 +40,15 @@ parser = argparse.ArgumentParser()
 parser.add_argument("config_path", help="path to a pipeline json config", type=str)
 parser.add_argument("--folds", help="number of folds", type=str, default=None)
 parser.add_argument("--search_type", help="search type: grid or random search", type=str, default='grid')
+parser.add_argument("--n_jobs", help="number of parameters combinations evaluated in parallel processes",
+                    type=int, default=1)
+parser.add_argument("--prefix_cache", help="directory to cache pipeline components fitted on the same data in, "
+                                           "components are fitted for every combination if not set",
+                    type=str, default=None)
+
+TEMP_DIR_FOR_PARAMSEARCH = 'paramsearch_tmp'
+
+_data = None
 
 
 def get_best_params(combinations, scores, param_names, target_metric):
@@ -47,6 +59,45 @@ def get_best_params(combinations, scores, param_names, target_metric):
     return best_params
 
 
+def evaluate_params(config, data, target_metric, n_folds=None, is_loo=False, cv_seed=None, prefix_cache=None):
+    """Returns a validation score of the model trained with the given config."""
+    if (n_folds is not None) | is_loo:
+        # CV for model evaluation
+        score_dict = calc_cv_score(config, data=data, n_folds=n_folds, is_loo=is_loo, random_state=cv_seed,
+                                   prefix_cache=prefix_cache)
+        return score_dict[next(iter(score_dict))]
+
+    # train/valid for model evaluation
+    iterator = get_iterator_from_config(config, data)
+    if prefix_cache is None:
+        return train_evaluate_model_from_config(config, iterator=iterator)['valid'][target_metric]
+
+    pending = prefix_cache.restore(config, data_fingerprint(data))
+    score = train_evaluate_model_from_config(config, iterator=iterator)['valid'][target_metric]
+    prefix_cache.store(config, pending)
+    return score
+
+
+def _init_worker(data):
+    global _data
+    _data = data
+
+
+def _evaluate_in_temp_dir(i, config, data, evaluate_kwargs):
+    # every combination saves its models into a separate temporary directory, so neither the prefix cache nor
+    # training overwrite files in model directories of the config
+    config, dirs_for_saved_models = change_savepath_for_model(config, f'{TEMP_DIR_FOR_PARAMSEARCH}/{i}')
+    try:
+        return evaluate_params(config, data, **evaluate_kwargs)
+    finally:
+        delete_dir_for_saved_models([d for d in dirs_for_saved_models if d.exists()])
+
+
+def _evaluate_in_worker(job):
+    i, config, evaluate_kwargs = job
+    return _evaluate_in_temp_dir(i, config, _data, evaluate_kwargs)
+
+
 def main():
     params_helper = ParamsSearch()
 
@@ -82,33 +133,47 @@ def main():
         param_names.append(param_name)
         param_values.append(param_value_search)
 
+    if (n_folds is None) and not is_loo and len(data['valid']) == 0:
+        # the same split is used for all combinations
+        data = data.copy()
+        data['train'], data['valid'] = train_test_split(data['train'], test_size=0.2)
+
+    prefix_cache = FittedPrefixCache(args.prefix_cache) if args.prefix_cache else None
+    evaluate_kwargs = {
+        'target_metric': target_metric,
+        'n_folds': n_folds,
+        'is_loo': is_loo,
+        # the same folds are used for all combinations
+        'cv_seed': np.random.randint(2 ** 31 - 1),
+        'prefix_cache': prefix_cache
+    }
+
     # find optimal params
     if args.search_type == 'grid':
         # generate params combnations for grid search
         combinations = list(product(*param_values))
 
-        # calculate cv scores
-        scores = []
+        configs = []
         for comb in combinations:
             config = deepcopy(config_init)
             for param_path, param_value in zip(param_paths, comb):
                 params_helper.insert_value_or_dict_into_config(config, param_path, param_value)
-            config = parse_config(config)
-
-            if (n_folds is not None) | is_loo:
-                # CV for model evaluation
-                score_dict = calc_cv_score(config, data=data, n_folds=n_folds, is_loo=is_loo)
-                score = score_dict[next(iter(score_dict))]
-            else:
-                # train/valid for model evaluation
-                data_to_evaluate = data.copy()
-                if len(data_to_evaluate['valid']) == 0:
-                    data_to_evaluate['train'], data_to_evaluate['valid'] = train_test_split(data_to_evaluate['train'],
-                                                                                            test_size=0.2)
-                iterator = get_iterator_from_config(config, data_to_evaluate)
-                score = train_evaluate_model_from_config(config, iterator=iterator)['valid'][target_metric]
-
-            scores.append(score)
+            configs.append(parse_config(config))
+
+        # calculate cv scores
+        if args.n_jobs > 1:
+            ctx = mp.get_context('spawn')
+            with ctx.Pool(args.n_jobs, initializer=_init_worker, initargs=(data,)) as pool:
+                scores = pool.map(_evaluate_in_worker, [(i, config, evaluate_kwargs)
+                                                        for i, config in enumerate(configs)], chunksize=1)
+        else:
+            scores = [_evaluate_in_temp_dir(i, deepcopy(config), data, evaluate_kwargs)
+                      for i, config in enumerate(configs)]
+        for config in configs:
+            _, dirs_for_saved_models = change_savepath_for_model(deepcopy(config), TEMP_DIR_FOR_PARAMSEARCH)
+            for d in dirs_for_saved_models:
+                if d.is_dir() and not any(d.iterdir()):
+                    d.rmdir()
 
         # get model with best score
         best_params_dict = get_best_params(combinations, scores, param_names, target_metric)
@@ -12,7 +12,7 @@
 import copy
 import json
 from pathlib import Path
-from collections import Counter
+from collections import Counter, defaultdict
 from typing import List, Tuple, Dict, Any
 from operator import itemgetter
 
@@ -37,6 +37,10 @@ class EcommerceSkillBleu(Skill):
     Retrieve the specification attributes with corresponding values
     in sorted order according to entropy.
 
+    Only items sharing at least one lemma with the query are scored,
+    they are found with an inverted index built on `fit` and `load`:
+    BLEU of all the other items is zero.
+
     Parameters:
         preprocess: text preprocessing component
         save_path: path to save a model
@@ -68,6 +72,7 @@ class EcommerceSkillBleu(Skill):
         self.min_entropy = min_entropy
         self.entropy_fields = entropy_fields
         self.ec_data: List = []
+        self._build_index()
         if kwargs.get('mode') != 'train':
             self.load()
 
@@ -88,6 +93,7 @@ class EcommerceSkillBleu(Skill):
             'feat_nlped': self.preprocess.spacy2dict(self.preprocess.analyze(item['Title']+'. '+item['Feature']))
         }) for item in data]
         log.info('Data are nlped')
+        self._build_index()
 
 
     def save(self, **kwargs) -> None:
@@ -106,6 +112,48 @@ class EcommerceSkillBleu(Skill):
                 raise FileNotFoundError
 
         log.info(f"Loaded items {len(self.ec_data)}")
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Build the lemma inverted index and price and attribute columns of catalog items"""
+        self.title_lemmas: List[List[str]] = [self.preprocess.lemmas(item['title_nlped']) for item in self.ec_data]
+        self.feat_lemmas: List[List[str]] = [self.preprocess.lemmas(item['feat_nlped']) for item in self.ec_data]
+
+        index = defaultdict(set)
+        for idx, (title, feat) in enumerate(zip(self.title_lemmas, self.feat_lemmas)):
+            for lemma in title + feat:
+                index[lemma].add(idx)
+        self.lemma_index: Dict[str, np.ndarray] = {lemma: np.array(sorted(ids), dtype=np.int32)
+                                                   for lemma, ids in index.items()}
+
+        self.title_lengths = np.array([len(item['Title']) for item in self.ec_data], dtype=np.int_)
+        self.prices = np.array([self._price(item) for item in self.ec_data], dtype=np.float64)
+        self.attr_columns: Dict[str, np.ndarray] = {}
+        for field in self.entropy_fields:
+            self._attr_column(field)
+
+    def _price(self, item: Dict[Any, Any]) -> float:
+        try:
+            return self.preprocess.price(item)
+        except (IndexError, ValueError):
+            log.warning(f"Wrong price format {item.get('ListPrice')} of the item {item.get('Title')}")
+            return 0
+
+    def _attr_column(self, key: str) -> np.ndarray:
+        """Lowercased values of the `key` attribute for all items, `None` for items without it"""
+        if key not in self.attr_columns:
+            self.attr_columns[key] = np.array([item[key].lower() if key in item else None
+                                               for item in self.ec_data], dtype=object)
+        return self.attr_columns[key]
+
+    def _candidates(self, lemmas: List[str]) -> np.ndarray:
+        """Ids of items containing at least one of the `lemmas`"""
+        if self.min_similarity <= 0:
+            return np.arange(len(self.ec_data))
+        ids = [self.lemma_index[lemma] for lemma in set(lemmas) if lemma in self.lemma_index]
+        if not ids:
+            return np.array([], dtype=np.int32)
+        return np.unique(np.concatenate(ids))
 
 
     def __call__(self, queries: List[str], history: List[Any], states: List[Dict[Any, Any]]) -> \
@@ -161,26 +209,31 @@ class EcommerceSkillBleu(Skill):
             if len(money_range) == 2:
                 state['Price'] = money_range
 
-            score_title = [bleu_advanced(self.preprocess.lemmas(item['title_nlped']),
-                                        self.preprocess.lemmas(self.preprocess.filter_nlp_title(query)),
-                                        weights = (1,), penalty = False) for item in self.ec_data]
+            query_title = self.preprocess.lemmas(self.preprocess.filter_nlp_title(query))
+            query_feat = self.preprocess.lemmas(self.preprocess.filter_nlp(query))
+            candidates = self._candidates(query_title + query_feat)
 
-            score_feat = [bleu_advanced(self.preprocess.lemmas(item['feat_nlped']),
-                                        self.preprocess.lemmas(self.preprocess.filter_nlp(query)),
-                                        weights = (0.3, 0.7), penalty = False) for idx, item in enumerate(self.ec_data)]
+            score_title = np.zeros(len(self.ec_data))
+            score_title[candidates] = [bleu_advanced(self.title_lemmas[idx], query_title,
+                                                     weights=(1,), penalty=False) for idx in candidates]
 
-            scores = np.mean([score_feat, score_title], axis=0).tolist()
+            score_feat = np.zeros(len(self.ec_data))
+            score_feat[candidates] = [bleu_advanced(self.feat_lemmas[idx], query_feat,
+                                                    weights=(0.3, 0.7), penalty=False) for idx in candidates]
 
-            scores_title = [(score, -len(self.ec_data[idx]['Title'])) for idx, score in enumerate(scores)]
+            scores = (score_feat + score_title) / 2
 
-            raw_scores_ar = np.array(scores_title, dtype=[('x', 'float_'), ('y', 'int_')])
+            scores_title = np.zeros(len(candidates), dtype=[('x', 'float_'), ('y', 'int_')])
+            scores_title['x'] = scores[candidates]
+            scores_title['y'] = -self.title_lengths[candidates]
 
-            results_args = np.argsort(raw_scores_ar, order=('x', 'y'))[::-1].tolist()
+            results_args = candidates[np.argsort(scores_title, order=('x', 'y'))[::-1]].tolist()
 
             results_args_sim = [idx for idx in results_args if scores[idx] >= self.min_similarity]
 
-            log.debug(f"Items before similarity filtering {len(results_args)} and after {len(results_args_sim)} with th={self.min_similarity} " +
-                      f"the best one has score {scores[results_args[0]]} with title {self.ec_data[results_args[0]]['Title']}")
+            if results_args:
+                log.debug(f"Items before similarity filtering {len(results_args)} and after {len(results_args_sim)} with th={self.min_similarity} " +
+                          f"the best one has score {scores[results_args[0]]} with title {self.ec_data[results_args[0]]['Title']}")
 
             results_args_sim = self._filter_state(state, results_args_sim)
 
@@ -190,7 +243,7 @@ class EcommerceSkillBleu(Skill):
 
             response.append(local_response)
 
-            confidence.append([(score_title[idx], score_feat[idx])
+            confidence.append([(float(score_title[idx]), float(score_feat[idx]))
                                for idx in results_args_sim[start:stop]])
 
             entropies.append(self._entropy_subquery(results_args_sim))
@@ -211,27 +264,24 @@ class EcommerceSkillBleu(Skill):
 
 
     def _filter_state(self, state: Dict[Any, Any], results_args_sim: List[int]) -> List[Any]:
+        results = np.array(results_args_sim, dtype=np.int_)
         for key, value in state.items():
             log.debug(f"Filtering for {key}:{value}")
 
             if key == 'Price':
                 price = value
-                log.debug(f"Items before price filtering {len(results_args_sim)} with price {price}")
-                results_args_sim = [idx for idx in results_args_sim
-                                    if self.preprocess.price(self.ec_data[idx]) >= price[0] and
-                                    self.preprocess.price(self.ec_data[idx]) <= price[1] and
-                                    self.preprocess.price(self.ec_data[idx]) != 0]
-                log.debug(f"Items after price filtering {len(results_args_sim)}")
+                log.debug(f"Items before price filtering {len(results)} with price {price}")
+                prices = self.prices[results]
+                results = results[(prices >= price[0]) & (prices <= price[1]) & (prices != 0)]
+                log.debug(f"Items after price filtering {len(results)}")
 
             elif key in ['query', 'start', 'stop', 'history']:
                 continue
 
             else:
-                results_args_sim = [idx for idx in results_args_sim
-                                    if key in self.ec_data[idx]
-                                    if self.ec_data[idx][key].lower() == value.lower()]
+                results = results[self._attr_column(key)[results] == value.lower()]
 
-        return results_args_sim
+        return results.tolist()
 
 
     def _entropy_subquery(self, results_args: List[int]) -> List[Tuple[float, str, List[Tuple[str, int]]]]:
@@ -246,13 +296,11 @@ class EcommerceSkillBleu(Skill):
 
         ent_fields: Dict = {}
 
-        for idx in results_args:
-            for field in self.entropy_fields:
-                if field in self.ec_data[idx]:
-                    if field not in ent_fields:
-                        ent_fields[field] = []
-
-                    ent_fields[field].append(self.ec_data[idx][field].lower())
+        for field in self.entropy_fields:
+            values = self._attr_column(field)[results_args]
+            values = values[values != None]
+            if len(values):
+                ent_fields[field] = values.tolist()
 
         entropies = []
         for key, value in ent_fields.items():
@@ -12,10 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List, Any, Optional, Union
+import sqlite3
+import threading
+from typing import List, Any, Optional, Union, Dict
+from urllib.parse import quote
 
 from deeppavlov.core.common.registry import register
 from deeppavlov.core.common.log import get_logger
+from deeppavlov.core.common.lru_cache import LRUCache
 from deeppavlov.core.models.component import Component
 from deeppavlov.dataset_iterators.sqlite_iterator import SQLiteDataIterator
 
@@ -30,15 +34,74 @@ class WikiSQLiteVocab(SQLiteDataIterator, Component):
         load_path: a path to local DB file
         join_docs: whether to join extracted docs with ' ' or not
         shuffle: whether to shuffle data or not
+        cache_size: a maximum number of documents kept in LRU cache, no caching if ``0``
+        read_only: whether to open the DB in read-only mode
+        wal: whether to switch the DB to write-ahead logging journal mode, ignored in read-only mode
+        mmap_size: a maximum number of bytes of the DB file to access with memory-mapped I/O
+        thread_connections: whether to open a separate DB connection for every thread querying the DB
 
     Attributes:
         join_docs: whether to join extracted docs with ' ' or not
+        cache: LRU cache of document contents or ``None``
 
     """
 
-    def __init__(self, load_path: str, join_docs: bool = True, shuffle: bool = False, **kwargs) -> None:
+    def __init__(self, load_path: str, join_docs: bool = True, shuffle: bool = False, cache_size: int = 0,
+                 read_only: bool = False, wal: bool = False, mmap_size: int = 0, thread_connections: bool = False,
+                 **kwargs) -> None:
+        self.read_only = read_only
+        self.wal = wal
+        self.mmap_size = mmap_size
+        self.thread_connections = thread_connections
+        self._local = threading.local()
         SQLiteDataIterator.__init__(self, load_path=load_path, shuffle=shuffle)
         self.join_docs = join_docs
+        self.cache = LRUCache(cache_size) if cache_size > 0 else None
+
+    def _open_connection(self, load_path: str) -> sqlite3.Connection:
+        if self.read_only:
+            connect = sqlite3.connect(f'file:{quote(load_path)}?mode=ro', uri=True, check_same_thread=False)
+        else:
+            connect = sqlite3.connect(load_path, check_same_thread=False)
+            if self.wal:
+                connect.execute('PRAGMA journal_mode=WAL')
+        if self.mmap_size:
+            connect.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        return connect
+
+    @property
+    def connect(self) -> sqlite3.Connection:
+        """A DB connection of the current thread if :attr:`thread_connections` is set, else a shared one."""
+        if not self.thread_connections:
+            return self._connect
+        connect = getattr(self._local, 'connect', None)
+        if connect is None:
+            connect = self._local.connect = self._open_connection(self.load_path)
+        return connect
+
+    @connect.setter
+    def connect(self, value: sqlite3.Connection) -> None:
+        self._connect = value
+        self._local.connect = value
+
+    def get_docs_content(self, doc_ids: List[Any]) -> List[Optional[str]]:
+        if self.cache is None:
+            return super().get_docs_content(doc_ids)
+
+        contents, missing = self.cache.get_many(doc_ids)
+        if missing:
+            fetched = dict(zip(missing, super().get_docs_content(missing)))
+            self.cache.update({doc_id: content for doc_id, content in fetched.items() if content is not None})
+            contents.update(fetched)
+        return [contents[doc_id] for doc_id in doc_ids]
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get hit rate and size of documents cache.
+
+        Returns:
+            cache stats or ``None`` if caching is disabled
+        """
+        return None if self.cache is None else self.cache.stats()
 
     def __call__(self, doc_ids: Optional[List[List[Any]]] = None, *args, **kwargs) -> List[Union[str, List[str]]]:
         """Get the contents of files, stacked by space or as they are.
@@ -54,8 +117,11 @@ class WikiSQLiteVocab(SQLiteDataIterator, Component):
             logger.warn('No doc_ids are provided in WikiSqliteVocab, return all docs')
             doc_ids = [self.get_doc_ids()]
 
+        # fetch documents of the whole batch at once
+        flat_contents = iter(self.get_docs_content([doc_id for ids in doc_ids for doc_id in ids]))
+
         for ids in doc_ids:
-            contents = [self.get_doc_content(doc_id) for doc_id in ids]
+            contents = [next(flat_contents) for _ in ids]
             if self.join_docs:
                 contents = ' '.join(contents)
             all_contents.append(contents)
@@ -0,0 +1,108 @@
+import time
+from threading import Lock
+
+import pytest
+
+from deeppavlov.core.common.chainer import Chainer
+
+
+class Events:
+    def __init__(self):
+        self.log = []
+        self._lock = Lock()
+
+    def add(self, event):
+        with self._lock:
+            self.log.append(event)
+
+    def index(self, event):
+        return self.log.index(event)
+
+
+class Step:
+    def __init__(self, name, fn, events, delay=0.):
+        self.name = name
+        self.fn = fn
+        self.events = events
+        self.delay = delay
+
+    def __call__(self, *args):
+        self.events.add(f'{self.name} start')
+        time.sleep(self.delay)
+        res = self.fn(*args)
+        self.events.add(f'{self.name} end')
+        return res
+
+
+def _chainer(n_threads, events, exclusive=False):
+    chainer = Chainer(in_x=['x'], out_params=['a', 'b', 'c', 'd'], n_threads=n_threads)
+    chainer.append(Step('a1', lambda x: [v + 1 for v in x], events, 0.02), ['x'], ['a'])
+    chainer.append(Step('b', lambda x: [v * 2 for v in x], events), ['x'], ['b'])
+    # reads the first version of `a`
+    chainer.append(Step('tmp', lambda a: [v * 10 for v in a], events, 0.05), ['a'], ['tmp'])
+    # overwrites `a` after it is read by the previous component
+    chainer.append(Step('a2', lambda b: [v - 3 for v in b], events), ['b'], ['a'])
+    chainer.append(Step('c', lambda tmp, a: [t + v for t, v in zip(tmp, a)], events), ['tmp', 'a'], ['c'])
+    # overwrites `a` with a value computed from itself
+    chainer.append(Step('a3', lambda a: [v * v for v in a], events, 0.01), ['a'], ['a'], parallel=not exclusive)
+    chainer.append(Step('d', lambda a, b: [v + w for v, w in zip(a, b)], events), ['a', 'b'], ['d'])
+    # is not needed for the outputs, so it is never called
+    chainer.append(Step('unused', lambda x: x, events), ['x'], ['unused'])
+    return chainer
+
+
+X = [1, 2, 3]
+EXPECTED = [
+    [(2 * x - 3) ** 2 for x in X],
+    [2 * x for x in X],
+    [10 * (x + 1) + 2 * x - 3 for x in X],
+    [(2 * x - 3) ** 2 + 2 * x for x in X]
+]
+
+
+@pytest.mark.parametrize('n_threads', [0, 1, 4])
+@pytest.mark.parametrize('exclusive', [False, True])
+def test_parallel_results_equal_sequential(n_threads, exclusive):
+    for _ in range(5):
+        events = Events()
+        chainer = _chainer(n_threads, events, exclusive)
+        assert chainer(X) == EXPECTED
+        assert chainer.compute(X, targets=['c']) == EXPECTED[2]
+        assert 'unused start' not in events.log
+        chainer.destroy()
+
+
+@pytest.mark.parametrize('n_threads', [1, 4])
+def test_write_after_read_order(n_threads):
+    events = Events()
+    chainer = _chainer(n_threads, events)
+    chainer(X)
+    # `a` is overwritten only after the component reading its previous version is finished
+    assert events.index('tmp end') < events.index('a2 start')
+    assert events.index('a1 end') < events.index('tmp start')
+    assert events.index('c end') < events.index('a3 start')
+    assert events.index('a3 end') < events.index('d start')
+    chainer.destroy()
+
+
+def test_independent_components_run_concurrently():
+    events = Events()
+    chainer = _chainer(4, events)
+    chainer(X)
+    # `b` does not depend on `a1` and starts before the slower `a1` is finished
+    assert events.index('b start') < events.index('a1 end')
+    chainer.destroy()
+
+
+def test_exclusive_component_runs_alone():
+    events = Events()
+    chainer = Chainer(in_x=['x'], out_params=['a', 'b', 'c'], n_threads=4)
+    chainer.append(Step('a', lambda x: x, events, 0.05), ['x'], ['a'])
+    chainer.append(Step('b', lambda x: x, events, 0.05), ['x'], ['b'], parallel=False)
+    chainer.append(Step('c', lambda x: x, events, 0.05), ['x'], ['c'])
+    assert chainer(X) == [X, X, X]
+
+    b_start, b_end = events.index('b start'), events.index('b end')
+    for name in ('a', 'c'):
+        assert events.index(f'{name} end') < b_start or events.index(f'{name} start') > b_end
+    chainer.destroy()
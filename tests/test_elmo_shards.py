@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from deeppavlov.dataset_iterators.elmo_file_paths_iterator import ELMoFilePathsIterator
+from deeppavlov.dataset_iterators.elmo_shards import EncodedShard, encode_shard, generate_batches
+
+LINES = [
+    'the cat sat on the mat',
+    'a dog',
+    'the dog sat on a log near the cat',
+    'unknown words are mapped to unk',
+    'cat',
+    'the mat is on the log and the dog is on the mat'
+]
+
+
+@pytest.fixture
+def shard(tmp_path: Path) -> Path:
+    shard_path = tmp_path / 'shard.txt'
+    shard_path.write_text('\n'.join(LINES) + '\n', encoding='utf8')
+    (tmp_path / 'vocab.txt').write_text('\n'.join('the cat sat on mat a dog log'.split()) + '\n', encoding='utf8')
+    return shard_path
+
+
+def _iterator(shard: Path, **kwargs) -> ELMoFilePathsIterator:
+    return ELMoFilePathsIterator({'train': [shard], 'valid': [], 'test': []}, load_path=shard.parent / 'vocab.txt',
+                                 shuffle=False, unroll_steps=3, n_gpus=1, max_word_length=10, **kwargs)
+
+
+@pytest.mark.parametrize('batch_size,unroll_steps', [(1, 1), (2, 3), (3, 4)])
+def test_encoded_batches_equal_line_batches(shard, batch_size, unroll_steps):
+    lines_iterator = _iterator(shard)
+    encoded_iterator = _iterator(shard, encoded_shards_dir=shard.parent / 'encoded')
+
+    # lists of a batch are reused for the next one, so they are copied to arrays on the fly
+    line_batches = [[np.array(item) for item in batch]
+                    for batch in lines_iterator._batch_generator(lines_iterator._line_generator([LINES]),
+                                                                 batch_size, unroll_steps)]
+    encoded_batches = list(encoded_iterator._encoded_batch_generator([shard], batch_size, unroll_steps,
+                                                                     shuffle=False))
+
+    assert len(encoded_batches) == len(line_batches) > 0
+    for line_batch, encoded_batch in zip(line_batches, encoded_batches):
+        for expected, actual in zip(line_batch, encoded_batch):
+            np.testing.assert_array_equal(expected, actual)
+
+
+def test_empty_shard(tmp_path):
+    def fail(words):
+        raise AssertionError('encoders must not be called for an empty shard')
+
+    encode_shard([], tmp_path / 'encoded', '<S>', '</S>', fail, fail)
+
+    assert EncodedShard.exists(tmp_path / 'encoded')
+    assert len(EncodedShard(tmp_path / 'encoded')) == 0
+    assert list(generate_batches([tmp_path / 'encoded'], batch_size=2, unroll_steps=2)) == []
@@ -0,0 +1,94 @@
+from typing import Iterator, List
+
+import numpy as np
+import pytest
+
+from deeppavlov.core.data.utils import zero_pad
+from deeppavlov.models.embedders.abstract_embedder import Embedder
+
+DIM = 4
+VOCAB = 'the cat sat on a mat dog log'.split()
+
+
+class StubEmbedder(Embedder):
+    def load(self) -> None:
+        rng = np.random.RandomState(13)
+        self.model = {w: rng.rand(DIM).astype(np.float32) for w in VOCAB}
+        self.dim = DIM
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.model
+
+    def _get_word_vector(self, w: str) -> np.ndarray:
+        return self.model[w]
+
+
+def _reference_encode(embedder: Embedder, tokens: List[str], mean: bool):
+    # per token encoding of the embedder before batches were embedded at once
+    embedded_tokens = []
+    for t in tokens:
+        try:
+            emb = embedder._get_word_vector(t)
+        except KeyError:
+            emb = np.zeros(embedder.dim, dtype=np.float32)
+        embedded_tokens.append(emb)
+    if mean:
+        filtered = [et for et in embedded_tokens if np.any(et)]
+        if filtered:
+            return np.mean(filtered, axis=0)
+        return np.zeros(embedder.dim, dtype=np.float32)
+    return embedded_tokens
+
+
+def _reference_call(embedder: Embedder, batch: List[List[str]], mean: bool, pad_zero: bool):
+    batch = [_reference_encode(embedder, sample, mean) for sample in batch]
+    if pad_zero:
+        batch = zero_pad(batch)
+    return batch
+
+
+def _assert_equal(result, expected):
+    assert len(result) == len(expected)
+    for sample, expected_sample in zip(result, expected):
+        if isinstance(expected_sample, list):
+            assert isinstance(sample, list)
+            assert len(sample) == len(expected_sample)
+        np.testing.assert_allclose(np.array(sample, dtype=np.float32), np.array(expected_sample, dtype=np.float32),
+                                   rtol=1e-6)
+
+
+BATCHES = [
+    [['the', 'cat', 'sat'], ['a', 'dog']],
+    # out of vocabulary tokens and repeated tokens
+    [['the', 'unknown', 'cat', 'the'], ['oov', 'words', 'only'], ['mat']],
+    # empty samples
+    [[], ['log', 'on', 'the', 'mat'], []],
+    # more distinct tokens than the cache size
+    [VOCAB + ['unknown'], list(reversed(VOCAB)), VOCAB[:3]]
+]
+
+
+@pytest.mark.parametrize('pad_zero', [False, True])
+@pytest.mark.parametrize('mean', [False, True])
+@pytest.mark.parametrize('cache_size', [100, 3])
+def test_batch_encoding_equals_per_token_encoding(pad_zero, mean, cache_size):
+    embedder = StubEmbedder(load_path='stub', pad_zero=pad_zero, mean=mean, cache_size=cache_size)
+    for batch in BATCHES + BATCHES:
+        _assert_equal(embedder(batch), _reference_call(embedder, batch, mean, pad_zero))
+    assert len(embedder.tok2emb) <= cache_size
+
+
+@pytest.mark.parametrize('pad_zero', [False, True])
+@pytest.mark.parametrize('mean', [False, True])
+def test_empty_batch(pad_zero, mean):
+    embedder = StubEmbedder(load_path='stub', pad_zero=pad_zero, mean=mean)
+    assert len(embedder([])) == 0
+    assert len(embedder([[]])) == 1
+
+
+def test_encode_single_sample():
+    embedder = StubEmbedder(load_path='stub', cache_size=2)
+    tokens = ['the', 'unknown', 'cat']
+    # TfidfWeightedEmbedder embeds samples one by one this way
+    _assert_equal(np.array(embedder([tokens]))[0], _reference_encode(embedder, tokens, False))
+    _assert_equal([embedder._encode(tokens, mean=True)], [_reference_encode(embedder, tokens, True)])
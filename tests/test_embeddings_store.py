@@ -0,0 +1,100 @@
+import pickle
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from deeppavlov.models.embedders.embeddings_store import EmbeddingsStore, convert, _hash
+from deeppavlov.models.embedders.glove_embedder import GloVeEmbedder
+
+DIM = 5
+TOKENS = ['the', 'cat', 'sat', 'on', 'mat', 'кот', 'дом'] + [f'w{i}' for i in range(100)]
+MISSING = ['dog', 'собака', '', 'w100', 'the cat']
+
+
+def _vectors():
+    rng = np.random.RandomState(7)
+    return {token: rng.uniform(-1, 1, DIM).astype(np.float32) for token in TOKENS}
+
+
+def _write_word2vec(path: Path, vectors: dict, header: bool) -> Path:
+    with path.open('w', encoding='utf8') as f:
+        if header:
+            f.write(f'{len(vectors)} {DIM}\n')
+        for token, vector in vectors.items():
+            f.write(token + ' ' + ' '.join(f'{v:.6f}' for v in vector) + '\n')
+    return path
+
+
+@pytest.fixture
+def glove_file(tmp_path: Path) -> Path:
+    return _write_word2vec(tmp_path / 'glove.txt', _vectors(), header=True)
+
+
+@pytest.mark.parametrize('header', [True, False])
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_converted_store_lookups(tmp_path, header, dtype):
+    vectors = _vectors()
+    src = _write_word2vec(tmp_path / 'vectors.txt', vectors, header)
+    convert(src, tmp_path / 'store', dtype=dtype)
+
+    assert EmbeddingsStore.exists(tmp_path / 'store')
+    store = EmbeddingsStore(tmp_path / 'store')
+    assert len(store) == len(TOKENS)
+    assert store.dim == DIM
+    assert store.vectors.dtype == np.dtype(dtype)
+    assert list(store) == TOKENS
+
+    atol = 1e-3 if dtype == 'float16' else 1e-6
+    for row, token in enumerate(TOKENS):
+        assert token in store
+        assert store.row(token) == row
+        np.testing.assert_allclose(store[token], vectors[token], atol=atol)
+    for token in MISSING:
+        assert token not in store
+        assert store.row(token) == -1
+        with pytest.raises(KeyError):
+            store[token]
+
+    batch = ['cat', 'dog', 'кот', 'cat', '']
+    result, found = store.get_vectors(batch)
+    assert result.dtype == np.float32
+    assert found.tolist() == [True, False, True, True, False]
+    np.testing.assert_allclose(result[[0, 2, 3]], [vectors['cat'], vectors['кот'], vectors['cat']], atol=atol)
+    assert not result[[1, 4]].any()
+
+    restored = pickle.loads(pickle.dumps(store))
+    assert restored.row('mat') == store.row('mat')
+
+
+def test_colliding_tokens_are_probed(tmp_path, glove_file):
+    convert(glove_file, tmp_path / 'store')
+    store = EmbeddingsStore(tmp_path / 'store')
+
+    slots = {}
+    for token in TOKENS:
+        slots.setdefault(_hash(token.encode('utf8')) & store._mask, []).append(token)
+    collisions = [tokens for tokens in slots.values() if len(tokens) > 1]
+    assert collisions, 'tokens are expected to collide in the hash table'
+    for tokens in collisions:
+        assert [store.row(token) for token in tokens] == [TOKENS.index(token) for token in tokens]
+
+    # a missing token starting its probe sequence at an occupied slot
+    missing = next(f'x{i}' for i in range(10000) if _hash(f'x{i}'.encode('utf8')) & store._mask in slots)
+    assert missing not in store
+
+
+def test_mmap_glove_embedder_equals_text_embedder(tmp_path, glove_file):
+    convert(glove_file, tmp_path / 'store')
+    text_embedder = GloVeEmbedder(load_path=glove_file)
+    mmap_embedder = GloVeEmbedder(load_path=tmp_path / 'store', mmap=True)
+    assert mmap_embedder.dim == text_embedder.dim == DIM
+    assert list(mmap_embedder) == list(text_embedder)
+
+    batch = [['the', 'cat', 'dog'], ['кот', 'w42'], [], ['собака']]
+    for mean in (False, True):
+        expected = text_embedder(batch, mean=mean)
+        result = mmap_embedder(batch, mean=mean)
+        assert len(result) == len(expected)
+        for sample, expected_sample in zip(result, expected):
+            np.testing.assert_allclose(np.array(sample), np.array(expected_sample), atol=1e-6)
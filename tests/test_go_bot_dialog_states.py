@@ -0,0 +1,104 @@
+import numpy as np
+
+from deeppavlov.core.agent.dialog_store import MemoryDialogStore
+from deeppavlov.models.go_bot.network import GoalOrientedBot
+
+N_ACTIONS = 3
+HIDDEN_SIZE = 2
+
+
+class _Tracker:
+    def __init__(self):
+        self.utterances = []
+
+    def reset_state(self):
+        self.utterances = []
+
+    def get_state(self):
+        return {}
+
+
+def _bot(max_dialog_states=None) -> GoalOrientedBot:
+    # the network is replaced by a stub whose rnn state counts utterances of a dialogue
+    bot = GoalOrientedBot.__new__(GoalOrientedBot)
+    bot.n_actions = N_ACTIONS
+    bot.hidden_size = HIDDEN_SIZE
+    bot.api_call_id = None
+    bot.debug = False
+    bot.tracker = _Tracker()
+    bot.db_result = None
+    bot.prev_action = np.zeros(N_ACTIONS, dtype=np.float32)
+    bot.state_c = np.zeros([1, HIDDEN_SIZE], dtype=np.float32)
+    bot.state_h = np.zeros([1, HIDDEN_SIZE], dtype=np.float32)
+    bot.dialog_states = MemoryDialogStore(max_size=max_dialog_states, default_factory=bot.new_dialog_state)
+
+    def encode_context(context, db_result=None):
+        bot.tracker.utterances.append(context)
+        return np.zeros(1), None, None
+
+    def network_batch_call(features, emb_contexts, keys, action_masks, state_c, state_h):
+        probs = np.eye(N_ACTIONS)[state_c[:, 0].astype(int) % N_ACTIONS]
+        return probs, state_c + 1, state_h
+
+    bot._encode_context = encode_context
+    bot.calc_action_mask = lambda previous_action: np.ones(N_ACTIONS)
+    bot.network_batch_call = network_batch_call
+    bot._decode_response = lambda action_id: f'action {action_id}'
+    return bot
+
+
+def _turns(bot: GoalOrientedBot, user_id) -> int:
+    return int(bot.dialog_states[user_id].state_c[0, 0])
+
+
+def test_interleaved_users_keep_independent_states():
+    bot = _bot()
+    assert bot(['hi', 'hello', 'how are you'], user_ids=['u1', 'u2', 'u1']) == ['action 0', 'action 0', 'action 1']
+    assert bot(['bye'], user_ids=['u2']) == ['action 1']
+    assert bot(['and you'], user_ids=['u1']) == ['action 2']
+
+    assert _turns(bot, 'u1') == 3
+    assert _turns(bot, 'u2') == 2
+    assert bot.dialog_states['u1'].tracker.utterances == ['hi', 'how are you', 'and you']
+    assert bot.dialog_states['u2'].tracker.utterances == ['hello', 'bye']
+    # the dialogue without user ids is not affected
+    assert bot.tracker.utterances == []
+
+
+def test_reset_clears_only_given_user():
+    bot = _bot()
+    bot(['hi', 'hello'], user_ids=['u1', 'u2'])
+    bot.reset('u1')
+
+    assert 'u1' not in bot.dialog_states
+    assert _turns(bot, 'u2') == 1
+    assert bot(['hi again'], user_ids=['u1']) == ['action 0']
+    assert _turns(bot, 'u1') == 1
+
+
+def test_states_of_least_recently_active_users_are_evicted():
+    bot = _bot(max_dialog_states=2)
+    bot(['hi', 'hello'], user_ids=['u1', 'u2'])
+    bot(['how are you'], user_ids=['u1'])
+    bot(['hey'], user_ids=['u3'])
+
+    assert sorted(bot.dialog_states) == ['u1', 'u3']
+
+
+def test_whole_dialogue_inference_keeps_user_states():
+    bot = _bot()
+    bot(['hi', 'hello'], user_ids=['u1', 'u2'])
+    # a whole dialogue is inferred from the reset current dialogue
+    assert bot([[{'text': 'hey'}, {'text': 'bye'}]]) == [['action 0', 'action 1']]
+
+    assert _turns(bot, 'u1') == 1
+    assert bot(['how are you'], user_ids=['u1']) == ['action 1']
+    assert _turns(bot, 'u2') == 1
+
+
+def test_reset_all_clears_every_user():
+    bot = _bot()
+    bot(['hi', 'hello'], user_ids=['u1', 'u2'])
+    bot.reset_all()
+
+    assert len(bot.dialog_states) == 0
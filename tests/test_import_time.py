@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+root_path = Path(__file__).resolve().parents[1]
+
+# modules which are needed only by some of the CLI modes or by the model building
+HEAVY_MODULES = [
+    'tensorflow',
+    'keras',
+    'flask',
+    'telegram',
+    'requests',
+    'deeppavlov.core.commands.train',
+    'deeppavlov.core.commands.infer',
+    'deeppavlov.download',
+    'utils.server_utils.server',
+    'utils.alexa.server',
+    'utils.ms_bot_framework_utils.server',
+    'utils.telegram_utils.telegram_ui',
+    'utils.pip_wrapper'
+]
+
+# generous bound which catches eager imports of heavy frameworks, not small slowdowns
+MAX_IMPORT_TIME_SECS = 2
+
+
+def _import_in_subprocess(module: str) -> dict:
+    code = ('import json, sys, time\n'
+            'start = time.perf_counter()\n'
+            f'import {module}\n'
+            'print(json.dumps({"time": time.perf_counter() - start, "modules": list(sys.modules)}))')
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=str(root_path))
+    return json.loads(output.decode('utf8').strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', ['deeppavlov', 'deeppavlov.deep'])
+def test_import_is_lazy(module):
+    result = _import_in_subprocess(module)
+    loaded = sorted(set(HEAVY_MODULES) & set(result['modules']))
+    assert not loaded, f'importing {module} loads {loaded}'
+    assert result['time'] < MAX_IMPORT_TIME_SECS, f'importing {module} takes {result["time"]:.2f} seconds'
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from deeppavlov.core.common.metrics_registry import get_metric_accumulator
+from deeppavlov.metrics.accuracy import accuracy, round_accuracy, per_item_dialog_accuracy
+from deeppavlov.metrics.bleu import bleu, google_bleu, per_item_bleu, per_item_dialog_bleu
+from deeppavlov.metrics.fmeasure import round_f1, round_f1_macro, round_f1_weighted
+from deeppavlov.metrics.recall_at_k import r_at_1, r_at_2, r_at_5
+from deeppavlov.metrics.squad_metrics import exact_match, squad_f1
+
+rng = np.random.RandomState(42)
+words = 'the a cat dog sat on mat log'.split()
+
+
+def _sentence(min_len=1):
+    return ' '.join(rng.choice(words, rng.randint(min_len, 8)))
+
+
+def _perturbed(sentence):
+    tokens = sentence.split()
+    tokens[rng.randint(len(tokens))] = rng.choice(words)
+    return ' '.join(tokens[:rng.randint(len(tokens) // 2, len(tokens)) + 1])
+
+
+N = 23
+
+labels = rng.randint(0, 3, N).tolist()
+binary_labels = rng.randint(0, 2, N).tolist()
+sentences = [_sentence(4) for _ in range(N)]
+
+CASES = {
+    'accuracy': [
+        (accuracy, labels, rng.randint(0, 3, N).tolist()),
+        (round_accuracy, binary_labels, rng.rand(N).tolist()),
+        (per_item_dialog_accuracy, [[{'text': s}] for s in sentences],
+         [[s if rng.rand() > 0.5 else _sentence()] for s in sentences])
+    ],
+    'f1': [
+        (round_f1, binary_labels, rng.rand(N).tolist()),
+        (round_f1_macro, labels, rng.randint(0, 3, N).tolist()),
+        (round_f1_weighted, labels, rng.randint(0, 3, N).tolist())
+    ],
+    'recall_at_k': [
+        (r_at_1, labels, rng.rand(N, 10).tolist()),
+        (r_at_2, labels, rng.rand(N, 10).tolist()),
+        (r_at_5, labels, rng.rand(N, 10).tolist())
+    ],
+    'squad': [
+        (exact_match, [[s, _sentence()] for s in sentences],
+         [s if rng.rand() > 0.5 else _sentence() for s in sentences]),
+        (squad_f1, [[s, _sentence()] for s in sentences], [_sentence() for _ in sentences])
+    ],
+    'bleu': [
+        (bleu, sentences, [_perturbed(s) for s in sentences]),
+        (google_bleu, sentences, [_perturbed(s) for s in sentences]),
+        (per_item_bleu, sentences, [[_perturbed(s)] for s in sentences]),
+        (per_item_dialog_bleu, [[{'text': s}] for s in sentences], [_perturbed(s) for s in sentences]),
+        # hypotheses of two tokens have no matching 3-grams and 4-grams
+        (bleu, sentences, [' '.join(s.split()[:2]) for s in sentences]),
+        (per_item_bleu, sentences, [[' '.join(s.split()[:2])] for s in sentences])
+    ]
+}
+
+
+@pytest.mark.parametrize('family', sorted(CASES))
+def test_accumulator_equals_metric_on_whole_data(family):
+    for metric_fn, y_true, y_predicted in CASES[family]:
+        accumulator = get_metric_accumulator(metric_fn)
+        assert accumulator is not None, metric_fn.__name__
+        for start in range(0, N, 5):
+            accumulator.update(y_true[start:start + 5], y_predicted[start:start + 5])
+        assert accumulator.result() == pytest.approx(metric_fn(y_true, y_predicted)), metric_fn.__name__
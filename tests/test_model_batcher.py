@@ -0,0 +1,95 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+
+import pytest
+
+from utils.server_utils.batcher import ModelBatcher
+
+
+class RecordingModel:
+    """Returns predictions computed from both arguments and records sizes of inferred batches."""
+    def __init__(self):
+        self.batch_sizes = []
+        self.release = Event()
+        self._lock = Lock()
+
+    def __call__(self, model_args):
+        # the first batch is held until all requests are queued
+        self.release.wait()
+        xs, ys = model_args
+        with self._lock:
+            self.batch_sizes.append(len(xs))
+        return [f'{x}-{y}' for x, y in zip(xs, ys)]
+
+
+def _submit_concurrently(batcher, requests):
+    results = [None] * len(requests)
+
+    def submit(i):
+        results[i] = batcher(requests[i])
+
+    threads = [Thread(target=submit, args=(i,)) for i in range(len(requests))]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def _requests():
+    # requests of one and two samples
+    return [[[f'x{i}'] * (1 + i % 2), [f'y{i}'] * (1 + i % 2)] for i in range(12)]
+
+
+@pytest.mark.parametrize('max_batch_size', [1, 4, 5, 64])
+def test_concurrent_requests_are_coalesced(max_batch_size):
+    model = RecordingModel()
+    batcher = ModelBatcher(model, batch_timeout=0.2, max_batch_size=max_batch_size)
+    batcher.start()
+
+    requests = _requests()
+    threads, results = _submit_concurrently(batcher, requests)
+    # every queued request is counted as unfinished until the end
+    while batcher._queue.unfinished_tasks < len(requests):
+        time.sleep(0.01)
+    model.release.set()
+    for thread in threads:
+        thread.join()
+
+    for i, result in enumerate(results):
+        assert result == [f'x{i}-y{i}'] * (1 + i % 2)
+
+    total = sum(len(request[0]) for request in requests)
+    assert sum(model.batch_sizes) == total
+    # a request of two samples is never split, so a batch can exceed the limit only for such a request
+    assert all(size <= max(max_batch_size, 2) for size in model.batch_sizes)
+    if max_batch_size > 2:
+        assert max(model.batch_sizes) > 2
+        assert len(model.batch_sizes) < len(requests)
+    assert sum(batcher.stats()['batch_sizes'].values()) == len(model.batch_sizes)
+
+
+def test_future_predictions_are_scattered():
+    executor = ThreadPoolExecutor(1)
+    model = RecordingModel()
+    model.release.set()
+    batcher = ModelBatcher(lambda model_args: executor.submit(model, model_args), batch_timeout=0.05,
+                           max_batch_size=8)
+    batcher.start()
+
+    requests = _requests()
+    threads, results = _submit_concurrently(batcher, requests)
+    for thread in threads:
+        thread.join()
+    for i, result in enumerate(results):
+        assert result == [f'x{i}-y{i}'] * (1 + i % 2)
+    executor.shutdown()
+
+
+def test_errors_are_raised_to_every_caller():
+    def infer(model_args):
+        raise ValueError('broken model')
+
+    batcher = ModelBatcher(infer, batch_timeout=0.05)
+    batcher.start()
+    with pytest.raises(ValueError):
+        batcher([['x'], ['y']])
@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from deeppavlov.core.common.prefix_cache import FittedPrefixCache, RESTORED_KEY, _saved_files
+
+
+def _touch(path: Path, text: str = '') -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def _names(paths):
+    return sorted(p.name for p in paths)
+
+
+def test_file_with_suffix_is_matched_exactly(tmp_path):
+    _touch(tmp_path / 'vocab.dict')
+    _touch(tmp_path / 'vocab.dict.bak')
+    _touch(tmp_path / 'vocab.json')
+    assert _names(_saved_files(tmp_path / 'vocab.dict')) == ['vocab.dict']
+
+
+@pytest.mark.parametrize('stem', ['model', 'model.ckpt'])
+def test_checkpoint_files_are_matched(tmp_path, stem):
+    for suffix in ['.index', '.meta', '.data-00000-of-00001']:
+        _touch(tmp_path / (stem + suffix))
+    # files of other components in the same directory
+    for name in ['model.json', 'model.cfg', 'model_opt.json', 'model.h5', 'checkpoint', 'models.index']:
+        _touch(tmp_path / name)
+    assert _names(_saved_files(tmp_path / stem)) == sorted(stem + suffix for suffix in
+                                                           ['.index', '.meta', '.data-00000-of-00001'])
+
+
+def test_directory_is_matched(tmp_path):
+    _touch(tmp_path / 'tfidf' / 'data.npy')
+    _touch(tmp_path / 'tfidf.json')
+    assert _names(_saved_files(tmp_path / 'tfidf')) == ['tfidf']
+
+
+def test_only_saved_files_are_restored(tmp_path):
+    cache = FittedPrefixCache(tmp_path / 'cache')
+    config = {'chainer': {'pipe': [{'class_name': 'vocab', 'fit_on': ['x'],
+                                    'save_path': str(tmp_path / 'first' / 'vocab.dict')}]}}
+    _touch(tmp_path / 'first' / 'vocab.dict', 'fitted')
+    _touch(tmp_path / 'first' / 'vocab.json', 'other component')
+
+    pending = cache.restore(config, 'data')
+    assert pending
+    cache.store(config, pending)
+
+    config['chainer']['pipe'][0]['save_path'] = str(tmp_path / 'second' / 'vocab.dict')
+    _touch(tmp_path / 'second' / 'vocab.json', 'second component')
+    assert cache.restore(config, 'data') == []
+
+    assert (tmp_path / 'second' / 'vocab.dict').read_text() == 'fitted'
+    assert (tmp_path / 'second' / 'vocab.json').read_text() == 'second component'
+    assert config['chainer']['pipe'][0][RESTORED_KEY]
+    assert 'fit_on' not in config['chainer']['pipe'][0]
@@ -0,0 +1,54 @@
+import os
+import time
+
+import pytest
+
+from deeppavlov.core.models.component import Component
+from utils.server_utils.worker_pool import ModelWorkerPool
+
+
+class Echo(Component):
+    """Returns its input, the worker process exits on the ``'die'`` input."""
+    def __init__(self, **kwargs):
+        pass
+
+    def __call__(self, batch):
+        if 'die' in batch:
+            os._exit(1)
+        return [f'{os.getpid()}:{x}' for x in batch]
+
+
+CONFIG = {
+    'chainer': {
+        'in': ['x'],
+        'out': ['y'],
+        'pipe': [{'class_name': f'{Echo.__module__}:Echo', 'in': ['x'], 'out': ['y']}]
+    }
+}
+
+
+@pytest.fixture
+def pool():
+    return ModelWorkerPool(CONFIG, n_workers=2, max_pending=4, timeout=5)
+
+
+def test_dead_worker_futures_fail_under_steady_traffic(pool):
+    lost = pool.submit([['die']])
+
+    # the other worker keeps answering, so the results queue is never idle for a whole check interval
+    deadline = time.monotonic() + 10
+    answers = set()
+    while not lost.done() and time.monotonic() < deadline:
+        answers.add(pool.submit([['ok']]).result(timeout=5)[0][0].split(':')[0])
+
+    assert lost.done()
+    with pytest.raises(RuntimeError):
+        lost.result()
+    assert len(answers) == 1
+
+    stats = pool.stats()
+    assert stats['alive'] == 1
+    assert stats['pending'] == [0, 0]
+    # slots of the failed requests are released
+    futures = [pool.submit([['ok']]) for _ in range(8)]
+    assert all(future.result(timeout=5)[0][0].endswith(':ok') for future in futures)
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from threading import Timer, Thread
+from concurrent.futures import ThreadPoolExecutor
+from threading import Timer, Thread, Lock
 from datetime import timedelta, datetime
 from queue import Queue
 from typing import Optional, Dict
@@ -22,6 +23,8 @@ from OpenSSL.crypto import X509
 
 from utils.alexa.conversation import Conversation
 from utils.alexa.ssl_tools import verify_cert, verify_signature
+from utils.server_utils.batcher import ModelBatcher
+from utils.server_utils.expiry_wheel import ExpiryWheel
 from deeppavlov.core.common.log import get_logger
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 
@@ -36,37 +39,53 @@ ValidatedCert = namedtuple('ValidatedCert', ['cert', 'expiration_timestamp'])
 class Bot(Thread):
     """Contains agent (if not multi-instanced), conversations, validates Alexa requests and routes them to conversations.
 
+    Requests are handled concurrently by a pool of worker threads, which verify certificates and signatures.
+    Utterances of all conversations are inferred by the instance level agent in shared batches.
+    Conversations are deleted after ``conversation_lifetime`` seconds of inactivity by a single expiry wheel thread.
+
     Args:
         agent_generator: Callback which generates DefaultAgent instance with alexa skill.
         config: Alexa skill configuration settings.
-        input_queue: Queue for incoming requests from Alexa.
-        output_queue: Queue for outcoming responses to Alexa.
+        input_queue: Queue for incoming requests from Alexa, every request has a ``response_future``
+            which is resolved with a response to Alexa.
 
     Attributes:
         config: Alexa skill configuration settings.
         conversations: Dict with current conversations, key - Alexa user ID, value - Conversation object.
         input_queue: Queue for incoming requests from Alexa.
-        output_queue: Queue for outcoming responses to Alexa.
         valid_certificates: Dict where key - signature chain url, value - ValidatedCert instance.
         agent: Alexa skill agent if not multi-instance mode.
         agent_generator: Callback which generates DefaultAgent instance with alexa skill.
+        batcher: Batcher of agent calls if not multi-instance mode.
+        pool: Pool of threads which handle requests.
+        expiry_wheel: Timer of conversations self-destruct.
         timer: Timer which triggers periodical certificates with expired validation cleanup.
     """
-    def __init__(self, agent_generator: callable, config: dict, input_queue: Queue, output_queue: Queue) -> None:
+    def __init__(self, agent_generator: callable, config: dict, input_queue: Queue) -> None:
         super(Bot, self).__init__()
         self.config = config
         self.conversations: Dict[str, Conversation] = {}
         self.input_queue = input_queue
-        self.output_queue = output_queue
+        self._conversations_lock = Lock()
 
         self.valid_certificates: Dict[str, ValidatedCert] = {}
 
         self.agent: Optional[DefaultAgent] = None
         self.agent_generator = agent_generator
+        self.batcher: Optional[ModelBatcher] = None
 
         if not self.config['multi_instance']:
             self.agent = self._init_agent()
             log.info('New bot instance level agent initiated')
+            self.batcher = ModelBatcher(lambda model_args: self.agent(*model_args),
+                                        batch_timeout=self.config.get('batch_timeout', 0.01),
+                                        max_batch_size=self.config.get('max_batch_size', 64))
+            self.batcher.start()
+
+        self.pool = ThreadPoolExecutor(self.config.get('request_workers', 16))
+
+        self.expiry_wheel = ExpiryWheel(self._del_conversation)
+        self.expiry_wheel.start()
 
         self.timer = Timer(REFRESH_VALID_CERTS_PERIOD_SECS, self._refresh_valid_certs)
         self.timer.start()
@@ -75,8 +94,16 @@ class Bot(Thread):
         """Thread run method implementation."""
         while True:
             request = self.input_queue.get()
+            self.pool.submit(self._process_request, request)
+
+    def _process_request(self, request: dict) -> None:
+        """Handles request in a pool thread and resolves its response future."""
+        try:
             response = self._handle_request(request)
-            self.output_queue.put(response)
+        except Exception:
+            log.exception('Alexa request handling failed')
+            response = {'error': 'error during request handling'}
+        request['response_future'].set_result(response)
 
     def _del_conversation(self, conversation_key: str) -> None:
         """Deletes Conversation instance.
@@ -84,8 +111,10 @@ class Bot(Thread):
         Args:
             conversation_key: Conversation key.
         """
-        if conversation_key in self.conversations.keys():
-            del self.conversations[conversation_key]
+        self.expiry_wheel.discard(conversation_key)
+        with self._conversations_lock:
+            conversation = self.conversations.pop(conversation_key, None)
+        if conversation is not None:
             log.info(f'Deleted conversation, key: {conversation_key}')
 
     def _init_agent(self) -> DefaultAgent:
@@ -102,14 +131,14 @@ class Bot(Thread):
 
         expired_certificates = []
 
-        for valid_cert_url, valid_cert in self.valid_certificates.items():
+        for valid_cert_url, valid_cert in list(self.valid_certificates.items()):
             valid_cert: ValidatedCert = valid_cert
             cert_expiration_time: datetime = valid_cert.expiration_timestamp
             if datetime.utcnow() > cert_expiration_time:
                 expired_certificates.append(valid_cert_url)
 
         for expired_cert_url in expired_certificates:
-            del self.valid_certificates[expired_cert_url]
+            self.valid_certificates.pop(expired_cert_url, None)
             log.info(f'Validation period of {expired_cert_url} certificate expired')
 
     def _verify_request(self, signature_chain_url: str, signature: str, request_body: bytes) -> bool:
@@ -173,22 +202,33 @@ class Bot(Thread):
 
         conversation_key = alexa_request['session']['user']['userId']
 
-        if conversation_key not in self.conversations.keys():
-            if self.config['multi_instance']:
+        conv_agent = None
+        if self.config['multi_instance']:
+            with self._conversations_lock:
+                new_conversation = conversation_key not in self.conversations.keys()
+            # the agent is built outside of the lock so that requests of other conversations are not blocked
+            if new_conversation:
                 conv_agent = self._init_agent()
                 log.info('New conversation instance level agent initiated')
-            else:
-                conv_agent = self.agent
 
-            self.conversations[conversation_key] = \
-                Conversation(config=self.config,
-                             agent=conv_agent,
-                             conversation_key=conversation_key,
-                             self_destruct_callback=lambda: self._del_conversation(conversation_key))
+        with self._conversations_lock:
+            if conversation_key not in self.conversations.keys():
+                if conv_agent is None:
+                    # the conversation has expired since the check above
+                    conv_agent = self._init_agent() if self.config['multi_instance'] else self.agent
+
+                self.conversations[conversation_key] = \
+                    Conversation(config=self.config,
+                                 agent=conv_agent,
+                                 conversation_key=conversation_key,
+                                 self_destruct_callback=lambda: self._del_conversation(conversation_key),
+                                 batcher=self.batcher)
+
+                log.info(f'Created new conversation, key: {conversation_key}')
 
-            log.info(f'Created new conversation, key: {conversation_key}')
+            conversation = self.conversations[conversation_key]
+            self.expiry_wheel.touch(conversation_key, self.config['conversation_lifetime'])
 
-        conversation = self.conversations[conversation_key]
         response = conversation.handle_request(alexa_request)
 
         return response
@@ -12,13 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from threading import Timer
+from threading import Lock
 from copy import deepcopy
 from typing import Optional
 
 from deeppavlov.agents.default_agent.default_agent import DefaultAgent
 from deeppavlov.core.agent.rich_content import RichMessage
 from deeppavlov.core.common.log import get_logger
+from utils.server_utils.batcher import ModelBatcher
 
 log = get_logger(__name__)
 
@@ -31,24 +32,26 @@ class Conversation:
         agent: DeepPavlov Agent instance.
         conversation_key: Alexa conversation ID.
         self_destruct_callback: Conversation instance deletion callback function.
+        batcher: Batcher of agent calls shared by conversations, the agent is called directly if not given.
 
     Attributes:
         config: Alexa skill configuration settings.
         agent: Alexa skill agent.
         key: Alexa conversation ID.
         stateful: Stateful mode flag.
-        timer: Conversation self-destruct timer.
+        batcher: Batcher of agent calls shared by conversations.
         handled_requests: Mapping of Alexa requests types to requests handlers.
         response_template: Alexa response template.
         """
     def __init__(self, config: dict, agent: DefaultAgent, conversation_key: str,
-                 self_destruct_callback: callable) -> None:
+                 self_destruct_callback: callable, batcher: Optional[ModelBatcher] = None) -> None:
         self.config = config
         self.agent = agent
         self.key = conversation_key
         self.self_destruct_callback = self_destruct_callback
         self.stateful: bool = self.config['stateful']
-        self.timer: Optional[Timer] = None
+        self.batcher = batcher
+        self._lock = Lock()
 
         self.handled_requests = {
             'LaunchRequest': self._handle_launch,
@@ -64,18 +67,6 @@ class Conversation:
             }
         }
 
-        self._start_timer()
-
-    def _start_timer(self) -> None:
-        """Initiates self-destruct timer."""
-        self.timer = Timer(self.config['conversation_lifetime'], self.self_destruct_callback)
-        self.timer.start()
-
-    def _rearm_self_destruct(self) -> None:
-        """Rearms self-destruct timer."""
-        self.timer.cancel()
-        self._start_timer()
-
     def handle_request(self, request: dict) -> dict:
         """Routes Alexa requests to appropriate handlers.
 
@@ -88,13 +79,12 @@ class Conversation:
         request_id = request['request']['requestId']
         log.debug(f'Received request. Type: {request_type}, id: {request_id}')
 
-        if request_type in self.handled_requests.keys():
-            response: dict = self.handled_requests[request_type](request)
-        else:
-            response: dict = self.handled_requests['_unsupported'](request)
-            log.warning(f'Unsupported request type: {request_type}, request id: {request_id}')
-
-        self._rearm_self_destruct()
+        with self._lock:
+            if request_type in self.handled_requests.keys():
+                response: dict = self.handled_requests[request_type](request)
+            else:
+                response: dict = self.handled_requests['_unsupported'](request)
+                log.warning(f'Unsupported request type: {request_type}, request id: {request_id}')
 
         return response
 
@@ -111,7 +101,10 @@ class Conversation:
         else:
             utterance = [[utterance]]
 
-        agent_response: list = self.agent(*utterance)
+        if self.batcher is not None:
+            agent_response: list = self.batcher(utterance)
+        else:
+            agent_response: list = self.agent(*utterance)
 
         return agent_response
 
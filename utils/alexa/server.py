@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import ssl
+from concurrent.futures import Future
 from datetime import timedelta
 from pathlib import Path
 from queue import Queue
@@ -122,9 +123,8 @@ def run_alexa_server(agent_generator: callable, multi_instance: bool = False,
         ssl_context = None
 
     input_q = Queue()
-    output_q = Queue()
 
-    bot = Bot(agent_generator, alexa_server_params, input_q, output_q)
+    bot = Bot(agent_generator, alexa_server_params, input_q)
     bot.start()
 
     endpoint_description = {
@@ -248,15 +248,17 @@ def run_alexa_server(agent_generator: callable, multi_instance: bool = False,
         signature: str = request.headers.get('Signature')
         alexa_request: dict = request.get_json()
 
+        response_future = Future()
         request_dict = {
             'request_body': request_body,
             'signature_chain_url': signature_chain_url,
             'signature': signature,
-            'alexa_request': alexa_request
+            'alexa_request': alexa_request,
+            'response_future': response_future
         }
 
         bot.input_queue.put(request_dict)
-        response: dict = bot.output_queue.get()
+        response: dict = response_future.result()
         response_code = 400 if 'error' in response.keys() else 200
 
         return jsonify(response), response_code
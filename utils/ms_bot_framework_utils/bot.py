@@ -1,6 +1,7 @@
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from queue import Queue
-from threading import Thread
+from threading import Thread, Lock
 from collections import namedtuple
 
 import requests
@@ -8,6 +9,8 @@ from requests.exceptions import HTTPError
 
 from .conversation import Conversation
 from deeppavlov.core.common.log import get_logger
+from utils.server_utils.batcher import ModelBatcher
+from utils.server_utils.expiry_wheel import ExpiryWheel
 
 log = get_logger(__name__)
 
@@ -23,13 +26,26 @@ class Bot(Thread):
         self.access_info = {}
         self.http_sessions = {}
         self.input_queue = input_queue
+        self._conversations_lock = Lock()
 
         self.agent = None
         self.agent_generator = agent_generator
+        self.batcher = None
 
         if not self.config['multi_instance']:
             self.agent = self._init_agent()
             log.info('New bot instance level agent initiated')
+            # utterances of all conversations are inferred in shared batches
+            self.batcher = ModelBatcher(lambda model_args: self.agent(*model_args),
+                                        batch_timeout=self.config.get('batch_timeout', 0.01),
+                                        max_batch_size=self.config.get('max_batch_size', 64))
+            self.batcher.start()
+
+        # activities are handled and responses are sent concurrently by a pool of threads
+        self.pool = ThreadPoolExecutor(self.config.get('request_workers', 16))
+
+        self.expiry_wheel = ExpiryWheel(self.del_conversation)
+        self.expiry_wheel.start()
 
         polling_interval = self.config['auth_polling_interval']
         self.timer = threading.Timer(polling_interval, self._update_access_info)
@@ -39,11 +55,20 @@ class Bot(Thread):
     def run(self):
         while True:
             activity = self.input_queue.get()
+            self.pool.submit(self._process_activity, activity)
+
+    def _process_activity(self, activity: dict):
+        try:
             self._handle_activity(activity)
+        except Exception:
+            log.exception('Microsoft Bot Framework activity handling failed')
 
     def del_conversation(self, conversation_key: ConvKey):
-        del self.conversations[conversation_key]
-        log.info(f'Deleted conversation, key: {str(conversation_key)}')
+        self.expiry_wheel.discard(conversation_key)
+        with self._conversations_lock:
+            conversation = self.conversations.pop(conversation_key, None)
+        if conversation is not None:
+            log.info(f'Deleted conversation, key: {str(conversation_key)}')
 
     def _init_agent(self):
         # TODO: Decide about multi-instance mode necessity.
@@ -80,19 +105,29 @@ class Bot(Thread):
     def _handle_activity(self, activity: dict):
         conversation_key = ConvKey(activity['channelId'], activity['conversation']['id'])
 
-        if conversation_key not in self.conversations.keys():
-            if self.config['multi_instance']:
+        conv_agent = None
+        if self.config['multi_instance']:
+            with self._conversations_lock:
+                new_conversation = conversation_key not in self.conversations.keys()
+            # the agent is built outside of the lock so that requests of other conversations are not blocked
+            if new_conversation:
                 conv_agent = self._init_agent()
                 log.info('New conversation instance level agent initiated')
-            else:
-                conv_agent = self.agent
 
-            self.conversations[conversation_key] = Conversation(bot=self,
-                                                                agent=conv_agent,
-                                                                activity=activity,
-                                                                conversation_key=conversation_key)
+        with self._conversations_lock:
+            if conversation_key not in self.conversations.keys():
+                if conv_agent is None:
+                    # the conversation has expired since the check above
+                    conv_agent = self._init_agent() if self.config['multi_instance'] else self.agent
+
+                self.conversations[conversation_key] = Conversation(bot=self,
+                                                                    agent=conv_agent,
+                                                                    activity=activity,
+                                                                    conversation_key=conversation_key)
+
+                log.info(f'Created new conversation, key: {str(conversation_key)}')
 
-            log.info(f'Created new conversation, key: {str(conversation_key)}')
+            conversation = self.conversations[conversation_key]
+            self.expiry_wheel.touch(conversation_key, self.config['conversation_lifetime'])
 
-        conversation = self.conversations[conversation_key]
         conversation.handle_activity(activity)
@@ -1,4 +1,4 @@
-import threading
+from threading import Lock
 from urllib.parse import urljoin
 
 import requests
@@ -23,10 +23,7 @@ class Conversation:
 
         self.out_gateway = OutGateway(self)
         self.stateful = self.bot.config['stateful']
-
-        self.conversation_lifetime = self.bot.config['conversation_lifetime']
-        self.timer = None
-        self._start_timer()
+        self._lock = Lock()
 
         if self.channel_id not in self.bot.http_sessions.keys() or not self.bot.http_sessions['self.channel_id']:
             self.bot.http_sessions['self.channel_id'] = requests.Session()
@@ -37,28 +34,16 @@ class Conversation:
             'message': self._handle_message
         }
 
-    def _start_timer(self):
-        self.timer = threading.Timer(self.conversation_lifetime, self._self_destruct)
-        self.timer.start()
-
-    def _rearm_self_destruct(self):
-        self.timer.cancel()
-        self._start_timer()
-
-    def _self_destruct(self):
-        self.bot.del_conversation(self.key)
-
     def handle_activity(self, activity: dict):
         activity_type = activity['type']
         activity_id = activity['id']
         log.debug(f'Received activity. Type: {activity_type}, id: {activity_id}')
 
-        if activity_type in self.handled_activities.keys():
-            self.handled_activities[activity_type](activity)
-        else:
-            log.warning(f'Unsupported activity type: {activity_type}, activity id: {activity_id}')
-
-        self._rearm_self_destruct()
+        with self._lock:
+            if activity_type in self.handled_activities.keys():
+                self.handled_activities[activity_type](activity)
+            else:
+                log.warning(f'Unsupported activity type: {activity_type}, activity id: {activity_id}')
 
     def _act(self, utterance: str):
         if self.stateful:
@@ -66,7 +51,10 @@ class Conversation:
         else:
             utterance = [[utterance]]
 
-        prediction = self.agent(*utterance)
+        if self.bot.batcher is not None:
+            prediction = self.bot.batcher(utterance)
+        else:
+            prediction = self.agent(*utterance)
 
         return prediction
 
@@ -0,0 +1,159 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import Counter
+from concurrent.futures import Future
+from queue import Queue, Empty
+from threading import Thread, Event, Lock
+from typing import Callable, List, Optional
+
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+
+class _BatchItem:
+    """Single request waiting in the batcher queue."""
+    def __init__(self, model_args: List[list]) -> None:
+        self.model_args = model_args
+        self.batch_size = len(model_args[0])
+        self.done = Event()
+        self.result: Optional[list] = None
+        self.error: Optional[Exception] = None
+
+
+class ModelBatcher(Thread):
+    """Gathers concurrent inference requests into shared model calls.
+
+    Requests arriving within ``batch_timeout`` seconds after the first one are merged into one batch
+    of at most ``max_batch_size`` samples, the batch is inferred with a single call of ``infer`` and
+    the results are split back between the requests.
+
+    Args:
+        infer: callable which takes a list of batched model arguments and returns a list of predictions,
+            one per sample, or a future of such list. Futures let the batcher collect the next batch
+            while the previous one is still being inferred
+        batch_timeout: maximum time in seconds to wait for more requests after the first one in a batch
+        max_batch_size: maximum number of samples in one model call
+
+    Attributes:
+        queue_depths: histogram of request queue sizes observed at the start of every batch
+        batch_sizes: histogram of sample counts of inferred batches
+    """
+    def __init__(self, infer: Callable[[List[list]], list], batch_timeout: float = 0.01,
+                 max_batch_size: int = 64) -> None:
+        super().__init__(daemon=True)
+        self.infer = infer
+        self.batch_timeout = batch_timeout
+        self.max_batch_size = max_batch_size
+
+        self._queue: Queue = Queue()
+        self._carried: Optional[_BatchItem] = None
+
+        self._stats_lock = Lock()
+        self.queue_depths = Counter()
+        self.batch_sizes = Counter()
+
+    def __call__(self, model_args: List[list]) -> list:
+        """Puts request into the queue and blocks until its predictions are ready."""
+        item = _BatchItem(model_args)
+        self._queue.put(item)
+        item.done.wait()
+        if item.error is not None:
+            raise item.error
+        return item.result
+
+    def run(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            self._process_batch(batch)
+
+    def stats(self) -> dict:
+        """Returns queue depth and batch size histograms."""
+        with self._stats_lock:
+            return {
+                'queue_depth': self._queue.qsize(),
+                'queue_depths': dict(sorted(self.queue_depths.items())),
+                'batch_sizes': dict(sorted(self.batch_sizes.items()))
+            }
+
+    def _collect_batch(self) -> List[_BatchItem]:
+        if self._carried is not None:
+            first, self._carried = self._carried, None
+        else:
+            first = self._queue.get()
+
+        with self._stats_lock:
+            self.queue_depths[self._queue.qsize()] += 1
+
+        batch = [first]
+        size = first.batch_size
+        deadline = time.monotonic() + self.batch_timeout
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except Empty:
+                break
+            if size + item.batch_size > self.max_batch_size:
+                self._carried = item
+                break
+            batch.append(item)
+            size += item.batch_size
+        return batch
+
+    def _process_batch(self, batch: List[_BatchItem]) -> None:
+        n_args = len(batch[0].model_args)
+        model_args = [[value for item in batch for value in item.model_args[i]] for i in range(n_args)]
+        batch_size = len(model_args[0])
+
+        with self._stats_lock:
+            self.batch_sizes[batch_size] += 1
+
+        try:
+            predictions = self.infer(model_args)
+        except Exception as e:
+            self._scatter(batch, error=e)
+            return
+
+        if isinstance(predictions, Future):
+            predictions.add_done_callback(lambda future: self._scatter_future(batch, future))
+        else:
+            self._scatter(batch, predictions)
+
+    def _scatter_future(self, batch: List[_BatchItem], future: Future) -> None:
+        error = future.exception()
+        if error is None:
+            self._scatter(batch, future.result())
+        else:
+            self._scatter(batch, error=error)
+
+    @staticmethod
+    def _scatter(batch: List[_BatchItem], predictions: Optional[list] = None,
+                 error: Optional[Exception] = None) -> None:
+        if error is not None:
+            log.error(f'batched inference failed: {error!r}')
+            for item in batch:
+                item.error = error
+                item.done.set()
+            return
+
+        offset = 0
+        for item in batch:
+            item.result = predictions[offset:offset + item.batch_size]
+            offset += item.batch_size
+            item.done.set()
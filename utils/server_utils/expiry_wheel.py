@@ -0,0 +1,86 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from collections import defaultdict
+from threading import Thread, Lock
+from typing import Callable, Dict, Hashable, Set
+
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+
+class ExpiryWheel(Thread):
+    """Single thread which expires keys that were not touched for their lifetime.
+
+    Keys are put into slots of ``resolution`` seconds by their deadlines and the thread checks only the slots
+    which have passed, so touching a key is O(1) and the number of timer threads does not grow with the number
+    of keys. Keys expire up to ``resolution`` seconds later than their deadlines.
+
+    Args:
+        callback: function called with a key when it expires
+        resolution: slot length in seconds
+    """
+    def __init__(self, callback: Callable[[Hashable], None], resolution: float = 1.) -> None:
+        super().__init__(daemon=True)
+        self.callback = callback
+        self.resolution = resolution
+
+        self._lock = Lock()
+        self._deadlines: Dict[Hashable, float] = {}
+        self._slots: Dict[int, Set[Hashable]] = defaultdict(set)
+        self._next_slot = self._slot(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def _slot(self, timestamp: float) -> int:
+        return int(timestamp // self.resolution)
+
+    def touch(self, key: Hashable, lifetime: float) -> None:
+        """Sets expiration time of the ``key`` to ``lifetime`` seconds from now."""
+        deadline = time.monotonic() + lifetime
+        with self._lock:
+            self._deadlines[key] = deadline
+            self._slots[self._slot(deadline)].add(key)
+
+    def discard(self, key: Hashable) -> None:
+        """Removes the ``key`` without calling the callback."""
+        with self._lock:
+            self._deadlines.pop(key, None)
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.resolution)
+            for key in self._pop_expired():
+                try:
+                    self.callback(key)
+                except Exception:
+                    log.exception(f'expiration callback failed for {key}')
+
+    def _pop_expired(self) -> list:
+        expired = []
+        current_slot = self._slot(time.monotonic())
+        with self._lock:
+            # only slots which have completely passed contain expired keys
+            for slot in range(self._next_slot, current_slot):
+                for key in self._slots.pop(slot, ()):
+                    deadline = self._deadlines.get(key)
+                    # keys touched again after being put into the slot are in later slots as well
+                    if deadline is not None and self._slot(deadline) == slot:
+                        del self._deadlines[key]
+                        expired.append(key)
+            self._next_slot = max(self._next_slot, current_slot)
+        return expired
@@ -13,8 +13,9 @@
 # limitations under the License.
 
 import ssl
+from concurrent.futures import Future, TimeoutError
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, List, Tuple, Optional, Union
 
 from flasgger import Swagger, swag_from
 from flask import Flask, request, jsonify, redirect, Response
@@ -28,6 +29,8 @@ from deeppavlov.core.common.log import get_logger
 from deeppavlov.core.common.paths import get_settings_path
 from deeppavlov.core.agent.dialog_logger import DialogLogger
 from deeppavlov.core.data.utils import check_nested_dict_keys, jsonify_data
+from utils.server_utils.batcher import ModelBatcher
+from utils.server_utils.worker_pool import ModelWorkerPool, PoolOverloadedError, get_predictions
 
 SERVER_CONFIG_FILENAME = 'server_config.json'
 
@@ -57,7 +60,9 @@ def get_server_params(server_config_path, model_config):
     return server_params
 
 
-def interact(model: Chainer, params_names: List[str]) -> Tuple[Response, int]:
+def interact(model: Union[Chainer, ModelWorkerPool], params_names: List[str],
+             infer: Optional[Callable[[List[list]], Union[list, Future]]] = None,
+             timeout: Optional[float] = None) -> Tuple[Response, int]:
     if not request.is_json:
         log.error("request Content-Type header is not application/json")
         return jsonify({
@@ -91,16 +96,26 @@ def interact(model: Chainer, params_names: List[str]) -> Tuple[Response, int]:
     # in case when some parameters were not described in model_args
     model_args += [[None] * batch_size for _ in range(len(model.in_x) - len(model_args))]
 
-    prediction = model(*model_args)
-    if len(model.out_params) == 1:
-        prediction = [prediction]
-    prediction = list(zip(*prediction))
+    try:
+        if infer is None:
+            prediction = get_predictions(model, model_args)
+        else:
+            prediction = infer(model_args)
+        if isinstance(prediction, Future):
+            prediction = prediction.result(timeout=timeout)
+    except PoolOverloadedError as e:
+        log.warning(e)
+        return jsonify({'error': str(e)}), 503
+    except TimeoutError:
+        log.error(f'model did not respond in {timeout} seconds')
+        return jsonify({'error': f'model did not respond in {timeout} seconds'}), 504
+
     result = jsonify_data(prediction)
     dialog_logger.log_out(result)
     return jsonify(result), 200
 
 
-def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, port=None):
+def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, port=None, profile=False):
     server_config_path = get_settings_path() / SERVER_CONFIG_FILENAME
     server_params = get_server_params(server_config_path, model_config)
 
@@ -110,6 +125,7 @@ def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
     model_args_names = server_params['model_args_names']
 
     https = https or server_params['https']
+    profile = profile or server_params.get('profile', False)
 
     if https:
         ssh_key_path = Path(ssl_key or server_params['https_key_path']).resolve()
@@ -131,7 +147,29 @@ def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
     else:
         ssl_context = None
 
-    model = build_model(model_config)
+    pool = None
+    if server_params.get('workers'):
+        pool = ModelWorkerPool(model_config, server_params['workers'], server_params['max_pending_per_worker'],
+                               server_params['overload_timeout'])
+        model = pool
+        infer = pool.submit
+        log.info(f'Model is served by {server_params["workers"]} worker processes')
+        if profile:
+            log.warning('Profiling is not supported for models served by worker processes')
+    else:
+        model = build_model(model_config)
+        if profile:
+            model.enable_profiling()
+        infer = None
+
+    batcher = None
+    if server_params.get('batching'):
+        batcher = ModelBatcher(infer or (lambda model_args: get_predictions(model, model_args)),
+                               batch_timeout=server_params['batch_timeout'],
+                               max_batch_size=server_params['max_batch_size'])
+        batcher.start()
+        log.info(f'Requests batching is enabled: batch_timeout={batcher.batch_timeout}, '
+                 f'max_batch_size={batcher.max_batch_size}')
 
     @app.route('/')
     def index():
@@ -157,6 +195,18 @@ def start_model_server(model_config, https=False, ssl_key=None, ssl_cert=None, p
     @app.route(model_endpoint, methods=['POST'])
     @swag_from(endpoint_description)
     def answer():
-        return interact(model, model_args_names)
-
-    app.run(host=host, port=port, threaded=False, ssl_context=ssl_context)
+        return interact(model, model_args_names, batcher or infer, server_params.get('request_timeout'))
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        result = {}
+        if batcher is not None:
+            result['batching'] = batcher.stats()
+        if pool is not None:
+            result['workers'] = pool.stats()
+        elif model.profiler is not None:
+            result['profile'] = model.profiler.summary()
+        return jsonify(result), 200
+
+    threaded = batcher is not None or pool is not None
+    app.run(host=host, port=port, threaded=threaded, ssl_context=ssl_context)
@@ -0,0 +1,190 @@
+# Copyright 2017 Neural Networks and Deep Learning lab, MIPT
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import multiprocessing as mp
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from queue import Empty
+from threading import Thread, Lock, BoundedSemaphore
+from typing import Dict, List, Optional, Tuple, Union
+
+from deeppavlov.core.commands.infer import build_model
+from deeppavlov.core.common.chainer import Chainer
+from deeppavlov.core.common.log import get_logger
+
+log = get_logger(__name__)
+
+_READY = 'ready'
+# seconds between checks whether worker processes are alive
+WORKERS_CHECK_INTERVAL = 1
+
+
+class PoolOverloadedError(Exception):
+    """Raised when every worker of a :class:`ModelWorkerPool` already has ``max_pending`` requests."""
+
+
+def get_predictions(model: Chainer, model_args: List[list]) -> list:
+    """Infers a batch and returns a list of per-sample predictions."""
+    prediction = model(*model_args)
+    if len(model.out_params) == 1:
+        prediction = [prediction]
+    return list(zip(*prediction))
+
+
+def _worker_loop(model_config: Union[str, Path, dict], worker_id: int, tasks: mp.Queue, results: mp.Queue) -> None:
+    model = build_model(model_config)
+    results.put((_READY, worker_id, (model.in_x, model.out_params)))
+    while True:
+        task_id, model_args = tasks.get()
+        try:
+            results.put((task_id, get_predictions(model, model_args), None))
+        except Exception as e:
+            log.exception(f'inference failed in model worker {worker_id}')
+            results.put((task_id, None, f'{type(e).__name__}: {e}'))
+
+
+class ModelWorkerPool:
+    """Pool of worker processes each holding its own replica of the model built from the same config.
+
+    Every request is routed to the worker with the least number of unfinished requests. When all the
+    workers already have ``max_pending`` requests, new requests wait for a free slot for up to
+    ``timeout`` seconds and are rejected with :class:`PoolOverloadedError` afterwards.
+
+    Args:
+        model_config: model config or path to it
+        n_workers: number of worker processes
+        max_pending: maximum number of unfinished requests per worker
+        timeout: maximum time in seconds to wait for a free slot, ``None`` to wait forever
+
+    Attributes:
+        in_x: names of model inputs
+        out_params: names of model outputs
+    """
+    def __init__(self, model_config: Union[str, Path, dict], n_workers: int, max_pending: int = 16,
+                 timeout: Optional[float] = 0) -> None:
+        self.timeout = timeout
+
+        ctx = mp.get_context('spawn')
+        self._results = ctx.Queue()
+        self._tasks = [ctx.Queue() for _ in range(n_workers)]
+        self._processes = [ctx.Process(target=_worker_loop, args=(model_config, i, tasks, self._results),
+                                       daemon=True)
+                           for i, tasks in enumerate(self._tasks)]
+        for process in self._processes:
+            process.start()
+
+        self._lock = Lock()
+        self._slots = BoundedSemaphore(n_workers * max_pending)
+        self._task_ids = itertools.count()
+        self._pending: Dict[int, Tuple[Future, int]] = {}
+        self._load = [0] * n_workers
+        self._alive = [True] * n_workers
+
+        self.in_x: List[str] = []
+        self.out_params: List[str] = []
+        self._wait_ready()
+
+        self._collector = Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+
+    def _wait_ready(self) -> None:
+        ready = 0
+        while ready < len(self._processes):
+            try:
+                task_id, worker_id, (self.in_x, self.out_params) = self._results.get(timeout=1)
+            except Empty:
+                dead = [i for i, process in enumerate(self._processes) if not process.is_alive()]
+                if dead:
+                    raise RuntimeError(f'model workers {dead} exited before the model was built')
+                continue
+            ready += 1
+            log.info(f'model worker {worker_id} is ready')
+
+    def submit(self, model_args: List[list]) -> Future:
+        """Sends a batch to the least loaded worker.
+
+        Returns:
+            future which is resolved with a list of per-sample predictions
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolOverloadedError('all model workers are busy')
+
+        future = Future()
+        with self._lock:
+            alive = [i for i, is_alive in enumerate(self._alive) if is_alive]
+            if not alive:
+                self._slots.release()
+                raise RuntimeError('no alive model workers left')
+            worker_id = min(alive, key=self._load.__getitem__)
+            task_id = next(self._task_ids)
+            self._pending[task_id] = (future, worker_id)
+            self._load[worker_id] += 1
+        self._tasks[worker_id].put((task_id, model_args))
+        return future
+
+    def stats(self) -> dict:
+        """Returns numbers of unfinished requests per worker."""
+        with self._lock:
+            return {
+                'workers': len(self._processes),
+                'alive': sum(self._alive),
+                'pending': list(self._load)
+            }
+
+    def _collect_results(self) -> None:
+        last_check = time.monotonic()
+        while True:
+            try:
+                result = self._results.get(timeout=WORKERS_CHECK_INTERVAL)
+            except Empty:
+                result = None
+
+            # workers are checked on a timer, because under steady traffic the results queue is never empty
+            if time.monotonic() - last_check >= WORKERS_CHECK_INTERVAL:
+                self._check_workers()
+                last_check = time.monotonic()
+            if result is None:
+                continue
+
+            task_id, prediction, error = result
+            with self._lock:
+                task = self._pending.pop(task_id, None)
+                if task is not None:
+                    self._load[task[1]] -= 1
+            if task is None:
+                # the task was already failed by _check_workers when its worker was declared dead
+                continue
+            future, _ = task
+            self._slots.release()
+
+            if error is None:
+                future.set_result(prediction)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    def _check_workers(self) -> None:
+        for worker_id, process in enumerate(self._processes):
+            if not self._alive[worker_id] or process.is_alive():
+                continue
+            log.error(f'model worker {worker_id} exited with code {process.exitcode}')
+            with self._lock:
+                self._alive[worker_id] = False
+                lost = [task_id for task_id, (_, w) in self._pending.items() if w == worker_id]
+                futures = [self._pending.pop(task_id)[0] for task_id in lost]
+                self._load[worker_id] = 0
+            for future in futures:
+                self._slots.release()
+                future.set_exception(RuntimeError(f'model worker {worker_id} exited'))